@@ -5,6 +5,7 @@ Main entry point for the LLM middleware application
 import os
 from dotenv import load_dotenv
 from middleware import LLMMiddleware
+from monitoring.prometheus import start_metrics_server
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +13,12 @@ load_dotenv()
 # Create middleware instance
 middleware = LLMMiddleware()
 
+# Expose Prometheus metrics when a port is configured
+if os.getenv("METRICS_PORT"):
+    start_metrics_server(
+        int(os.getenv("METRICS_PORT")), host=os.getenv("METRICS_HOST", "127.0.0.1")
+    )
+
 
 def process_prompt(prompt, **kwargs):
     """Process a prompt using the middleware"""
@@ -15,6 +15,7 @@ from resilience.circuit_breaker import create_circuit_breaker
 from resilience.fallbacks import rule_based_fallback, call_llm_with_fallbacks
 from monitoring.performance import monitor_performance
 from monitoring.stats import StatsTracker
+from monitoring.prometheus import REGISTRY
 from circuitbreaker import CircuitBreakerError
 
 
@@ -27,6 +28,14 @@ class LLMMiddleware:
         self.logger = setup_logger()
         # Initialize stats tracker for request analysis
         self.stats_tracker = StatsTracker()
+        self.circuit_rejections = REGISTRY.counter(
+            "llm_circuit_rejections_total",
+            "Requests answered by the rule-based fallback because the circuit was open",
+        )
+        self.request_errors = REGISTRY.counter(
+            "llm_request_errors_total",
+            "Requests that failed in the middleware itself",
+        )
 
     @create_circuit_breaker(failure_threshold=3, recovery_timeout=30)
     def protected_llm_call(self, request: LLMRequest) -> LLMResponse:
@@ -106,6 +115,7 @@ class LLMMiddleware:
                 # Use the circuit breaker protected method
                 response = self.protected_llm_call(request)
             except CircuitBreakerError:
+                self.circuit_rejections.inc()
                 self.logger.warning(
                     "Circuit breaker open, using rule-based fallback",
                     extra={"request_id": request_id},
@@ -129,6 +139,7 @@ class LLMMiddleware:
             return response.dict()
 
         except Exception as e:
+            self.request_errors.inc()
             self.logger.error(
                 f"Error processing request: {str(e)}", extra={"request_id": request_id}
             )
@@ -5,6 +5,7 @@ Monitoring package exports
 from .anomaly import detect_anomalies, update_metrics_history
 from .performance import monitor_performance, calculate_token_cost
 from .stats import StatsTracker
+from .prometheus import REGISTRY, MetricsRegistry, start_metrics_server
 
 __all__ = [
     "detect_anomalies",
@@ -12,4 +13,7 @@ __all__ = [
     "monitor_performance",
     "calculate_token_cost",
     "StatsTracker",
+    "REGISTRY",
+    "MetricsRegistry",
+    "start_metrics_server",
 ]
@@ -4,23 +4,46 @@ Usage statistics tracking for LLM requests
 
 import logging
 import statistics
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from models.request import LLMRequest
 from models.response import LLMResponse
 from models.metrics import PerformanceMetrics
 from utils.text_utils import sanitize_text
+from monitoring.prometheus import REGISTRY, MetricsRegistry
 
 
 class StatsTracker:
     """Class for tracking and analyzing LLM usage statistics"""
 
-    def __init__(self, max_recent_requests: int = 50):
+    def __init__(
+        self, max_recent_requests: int = 50, registry: Optional[MetricsRegistry] = None
+    ):
         self.logger = logging.getLogger("llm_app")
         self.recent_requests: List[Dict[str, Any]] = []
         self.max_recent_requests = max_recent_requests
 
+        # Lifetime totals for Prometheus; recent_requests only covers the last few
+        registry = registry or REGISTRY
+        self.requests_total = registry.counter(
+            "llm_requests_total",
+            "LLM requests served, by model and fallback level",
+            ("model", "fallback_level"),
+        )
+        self.latency_seconds = registry.histogram(
+            "llm_request_latency_seconds", "LLM response latency", ("model",)
+        )
+        self.tokens_total = registry.counter(
+            "llm_tokens_total", "Tokens used, by model", ("model",)
+        )
+        self.cost_total = registry.counter(
+            "llm_estimated_cost_dollars_total", "Estimated token cost, by model", ("model",)
+        )
+        self.anomalies_total = registry.counter(
+            "llm_anomalies_total", "Requests with an anomaly score above 0.7", ("model",)
+        )
+
     def store_request(
         self, request: LLMRequest, response: LLMResponse, metrics: PerformanceMetrics
     ) -> None:
@@ -43,6 +66,14 @@ class StatsTracker:
 
         self.recent_requests.append(request_data)
 
+        model = response.model_used
+        self.requests_total.labels(model, response.fallback_level).inc()
+        self.latency_seconds.labels(model).observe(response.latency_ms / 1000)
+        self.tokens_total.labels(model).inc(response.tokens_used)
+        self.cost_total.labels(model).inc(metrics.estimated_cost)
+        if metrics.anomaly_score > 0.7:
+            self.anomalies_total.labels(model).inc()
+
         # Keep only the most recent requests
         if len(self.recent_requests) > self.max_recent_requests:
             self.recent_requests.pop(0)
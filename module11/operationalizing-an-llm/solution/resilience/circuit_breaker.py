@@ -7,7 +7,33 @@ import logging
 from functools import wraps
 from typing import Callable, Any
 
-from circuitbreaker import circuit, CircuitBreakerError
+from circuitbreaker import circuit, CircuitBreakerError, CircuitBreakerMonitor
+
+from monitoring.prometheus import REGISTRY
+
+# Exported as a number so dashboards can graph and alert on it
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+circuit_state = REGISTRY.gauge(
+    "llm_circuit_state",
+    "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ("circuit",),
+)
+circuit_failures = REGISTRY.gauge(
+    "llm_circuit_failure_count",
+    "Consecutive failures counted by the circuit breaker",
+    ("circuit",),
+)
+
+
+def collect_circuit_metrics() -> None:
+    """Copy the state of every circuit breaker into gauges (run at scrape time)"""
+    for breaker in CircuitBreakerMonitor.get_circuits():
+        circuit_state.labels(breaker.name).set(CIRCUIT_STATE_VALUES[breaker.state])
+        circuit_failures.labels(breaker.name).set(breaker.failure_count)
+
+
+REGISTRY.add_collector(collect_circuit_metrics)
 
 
 def create_circuit_breaker(failure_threshold: int = 3, recovery_timeout: int = 30):
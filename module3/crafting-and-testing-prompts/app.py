@@ -59,21 +59,19 @@ st.session_state.current_page = list(pages.keys())[
 st.sidebar.title("Model Status")
 model_status = st.sidebar.empty()
 
-# Check Ollama connection
-try:
-    import requests
-
-    response = requests.get("http://localhost:11434/api/tags")
-    if response.status_code == 200:
-        models = [model["name"] for model in response.json().get("models", [])]
-        if models:
-            model_status.success(f"Connected to Ollama with {len(models)} models")
-        else:
-            model_status.warning("Connected to Ollama but no models found")
-    else:
-        model_status.error("Ollama server returned an error")
-except Exception as e:
-    model_status.error(f"Could not connect to Ollama: {str(e)}")
+# Check Ollama connection using the shared, background-refreshed model registry
+from services.model_registry import get_model_registry
+
+model_registry = get_model_registry("http://localhost:11434")
+models = model_registry.get_models()
+if not model_registry.is_loaded():
+    model_status.info("Checking Ollama connection...")
+elif not model_registry.available:
+    model_status.error("Could not connect to Ollama")
+elif models:
+    model_status.success(f"Connected to Ollama with {len(models)} models")
+else:
+    model_status.warning("Connected to Ollama but no models found")
 
 # Educational sidebar
 st.sidebar.title("About Prompt Engineering")
@@ -0,0 +1,164 @@
+import requests
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger("ModelRegistry")
+
+
+def normalize_model_name(name: str) -> str:
+    """Normalize a model name so that e.g. gemma:3-4b and gemma3:4b compare equal."""
+    return name.replace("-", "").replace(":", "")
+
+
+def base_model_name(name: str) -> str:
+    """Return the base model name (e.g. "gemma" for "gemma:3-4b")."""
+    return name.split(":")[0] if ":" in name else name
+
+
+class ModelRegistry:
+    """Process-wide, TTL-cached view of the models installed in Ollama.
+
+    Streamlit re-creates services on every rerun, so the list of models from
+    ``/api/tags`` is fetched on a background thread and shared between all
+    ``OllamaService`` instances for the same server. Lookup tables for the
+    fuzzy model matching are built once per refresh.
+    """
+
+    def __init__(self, base_url: str, ttl: float = 60.0, timeout: float = 5.0):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.available = False
+        self.last_refresh: Optional[float] = None
+        self._models: List[str] = []
+        self._model_set: Set[str] = set()
+        self._by_normalized: Dict[str, int] = {}
+        self._by_base: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def is_stale(self) -> bool:
+        """Check whether the cached model list has expired."""
+        return self.last_refresh is None or time.time() - self.last_refresh > self.ttl
+
+    def refresh(self) -> bool:
+        """Fetch the model list from Ollama now and return availability."""
+        try:
+            logger.info(f"Checking Ollama availability at {self.base_url}/api/tags")
+            response = requests.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            available = response.status_code == 200
+            if available:
+                models = [
+                    model.get("name", "") for model in response.json().get("models", [])
+                ]
+                logger.info(f"Available Ollama models: {models}")
+            else:
+                logger.warning(
+                    f"Ollama API returned status code: {response.status_code}"
+                )
+                models = []
+        except Exception as e:
+            logger.error(f"Error checking Ollama availability: {str(e)}")
+            available = False
+            models = []
+
+        # Position of the first model with each normalized and base name
+        by_normalized: Dict[str, int] = {}
+        by_base: Dict[str, int] = {}
+        for index, model in enumerate(models):
+            by_normalized.setdefault(normalize_model_name(model), index)
+            by_base.setdefault(base_model_name(model), index)
+
+        with self._lock:
+            self.available = available
+            self._models = models
+            self._model_set = set(models)
+            self._by_normalized = by_normalized
+            self._by_base = by_base
+            self.last_refresh = time.time()
+        self._loaded.set()
+        return available
+
+    def refresh_async(self, force: bool = False) -> None:
+        """Refresh the model list on a background thread if it is stale."""
+        with self._lock:
+            if not force and not self.is_stale():
+                return
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self.refresh, name="ollama-model-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first refresh has finished."""
+        return self._loaded.wait(timeout)
+
+    def is_loaded(self) -> bool:
+        """Check whether at least one refresh has completed."""
+        return self._loaded.is_set()
+
+    def get_models(self, wait: Optional[float] = None) -> List[str]:
+        """Return the cached model names, scheduling a refresh if they are stale.
+
+        If no refresh has completed yet, waits up to ``wait`` seconds for the
+        first one.
+        """
+        self.refresh_async()
+        if wait is not None:
+            self.wait_until_loaded(wait)
+        with self._lock:
+            return list(self._models)
+
+    def is_available(self, wait: Optional[float] = None) -> bool:
+        """Return whether Ollama answered the last refresh."""
+        self.refresh_async()
+        if wait is not None:
+            self.wait_until_loaded(wait)
+        return self.available
+
+    def find_matching_model(self, requested_model: str) -> Optional[str]:
+        """Resolve a requested model name against the installed models."""
+        with self._lock:
+            if not self._models:
+                return None
+
+            # Direct match
+            if requested_model in self._model_set:
+                return requested_model
+
+            # Installed models are scanned in order, and the first one that
+            # matches either with different formatting (gemma:3-4b vs
+            # gemma3:4b) or by base model ("gemma" of "gemma:3-4b") wins
+            normalized_index = self._by_normalized.get(
+                normalize_model_name(requested_model)
+            )
+            base_index = self._by_base.get(base_model_name(requested_model))
+            if normalized_index is None and base_index is None:
+                return None
+            if base_index is None or (
+                normalized_index is not None and normalized_index <= base_index
+            ):
+                return self._models[normalized_index]
+
+            model = self._models[base_index]
+            logger.info(f"Found matching base model: {model} for {requested_model}")
+            return model
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(base_url: str = "http://localhost:11434") -> ModelRegistry:
+    """Return the shared registry for an Ollama server, creating it if needed."""
+    with _registries_lock:
+        registry = _registries.get(base_url)
+        if registry is None:
+            registry = ModelRegistry(base_url)
+            _registries[base_url] = registry
+        return registry
@@ -1,8 +1,11 @@
+import os
 import requests
 import time
 import logging
 from typing import Dict, Any, Optional, List
 from .mock_llm_service import MockLLMService
+from .replay_llm_service import ReplayLLMService
+from .model_registry import get_model_registry
 
 # Configure logging
 logging.basicConfig(
@@ -14,84 +17,43 @@ logger = logging.getLogger("OllamaService")
 class OllamaService:
     """Service for interacting with Ollama API."""
 
+    # Seconds to wait for the first model discovery before a generate call
+    DISCOVERY_WAIT = 5
+
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
-        self.mock_service = MockLLMService()
-        self.is_available = self._check_availability()
+        # Serve recorded Ollama responses instead of canned text when configured
+        replay_file = os.getenv("PROMPTLAB_REPLAY_FILE")
+        self.mock_service = (
+            ReplayLLMService(replay_file) if replay_file else MockLLMService()
+        )
+        # Model discovery runs in the background and is shared across instances,
+        # so creating a service on every Streamlit rerun does not block
+        self.model_registry = get_model_registry(base_url)
+        self.model_registry.refresh_async()
+
+    @property
+    def is_available(self) -> bool:
+        """Whether Ollama answered the most recent model refresh."""
+        return self.model_registry.is_available(wait=self.DISCOVERY_WAIT)
+
+    def _check_availability(self) -> bool:
+        """Check if Ollama service is available."""
+        available = self.model_registry.refresh()
         # Log whether Ollama is available
-        if self.is_available:
+        if available:
             logger.info("Ollama service is available")
         else:
             logger.warning("Ollama service is not available, will use mock service")
-
-    def _check_availability(self) -> bool:
-        """Check if Ollama service is available."""
-        try:
-            logger.info(f"Checking Ollama availability at {self.base_url}/api/tags")
-            response = requests.get(
-                f"{self.base_url}/api/tags", timeout=5
-            )  # Increased timeout
-            available = response.status_code == 200
-            if available:
-                # Log the available models
-                models = [
-                    model.get("name") for model in response.json().get("models", [])
-                ]
-                logger.info(f"Available Ollama models: {models}")
-            else:
-                logger.warning(
-                    f"Ollama API returned status code: {response.status_code}"
-                )
-            return available
-        except Exception as e:
-            logger.error(f"Error checking Ollama availability: {str(e)}")
-            return False
+        return available
 
     def _get_available_models(self) -> List[str]:
         """Get list of available models from Ollama."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                return [
-                    model.get("name", "") for model in response.json().get("models", [])
-                ]
-            return []
-        except Exception as e:
-            logger.error(f"Error getting available models: {str(e)}")
-            return []
-
-    def _find_matching_model(
-        self, requested_model: str, available_models: List[str]
-    ) -> Optional[str]:
-        """Try to find a matching model from available models."""
-        if not available_models:
-            return None
-
-        # Direct match
-        if requested_model in available_models:
-            return requested_model
-
-        # Try with different formatting (handles gemma:3-4b vs gemma3:4b)
-        normalized_requested = requested_model.replace("-", "").replace(":", "")
-
-        for model in available_models:
-            normalized_model = model.replace("-", "").replace(":", "")
-            if normalized_requested == normalized_model:
-                return model
-
-            # Check if it's the same base model (e.g., "gemma" part of "gemma:3-4b")
-            requested_base = (
-                requested_model.split(":")[0]
-                if ":" in requested_model
-                else requested_model
-            )
-            model_base = model.split(":")[0] if ":" in model else model
-
-            if requested_base == model_base:
-                logger.info(f"Found matching base model: {model} for {requested_model}")
-                return model
+        return self.model_registry.get_models(wait=self.DISCOVERY_WAIT)
 
-        return None
+    def _find_matching_model(self, requested_model: str) -> Optional[str]:
+        """Try to find a matching model from the installed models."""
+        return self.model_registry.find_matching_model(requested_model)
 
     def generate(
         self,
@@ -110,8 +72,7 @@ class OllamaService:
         # If we're forcing real LLM but Ollama is not available, try to check again
         if not self.is_available and force_real_llm:
             logger.info("Forcing use of real LLM, rechecking Ollama availability")
-            self.is_available = self._check_availability()
-            if not self.is_available:
+            if not self._check_availability():
                 logger.error("Still unable to connect to Ollama after recheck")
                 if not force_real_llm:
                     logger.info("Falling back to mock service")
@@ -131,7 +92,7 @@ class OllamaService:
             logger.info(f"Models available for mapping: {available_models}")
 
             # Try to find a matching model by performing some normalization
-            model_name = self._find_matching_model(model, available_models)
+            model_name = self._find_matching_model(model)
 
             if not model_name and force_real_llm:
                 # If we couldn't find a match but forcing real LLM, use original name as a fallback
@@ -0,0 +1,465 @@
+"""Replay backend that serves recorded Ollama responses with modelled latency.
+
+The replay service can be used in two ways:
+
+* In-process, as a drop-in for ``MockLLMService`` (same ``generate`` signature).
+* As a local HTTP server that speaks the Ollama REST API (``/api/tags``,
+  ``/api/generate`` and ``/api/chat``, streaming NDJSON or not). Any
+  ``OllamaClient``/``OllamaService`` in the course can be pointed at it by
+  changing its ``base_url``.
+
+Recordings are JSON Lines files. Each line holds the request model and prompt
+plus the response text, and optionally the streamed chunks as they arrived:
+
+    {"model": "gemma3:4b", "prompt": "...", "response": "...", "chunks": ["..", ".."]}
+
+Recordings can be captured from a real Ollama server by running the server in
+record mode, which proxies every request upstream and appends it to the file:
+
+    python -m services.replay_llm_service --recordings rec.jsonl --record-from http://localhost:11434
+    python -m services.replay_llm_service --recordings rec.jsonl --port 11435 --ttft-ms 300 --itl-ms 25
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger("ReplayLLMService")
+
+_TOKEN_PATTERN = re.compile(r"\s*\S+")
+
+
+class LatencyModel:
+    """Samples time-to-first-token and inter-token latencies.
+
+    Both delays are drawn from log-normal distributions parameterised by their
+    median and a shape ``sigma`` (0 gives a constant delay), which matches the
+    long right tail seen in real LLM serving.
+    """
+
+    def __init__(
+        self,
+        ttft_ms: float = 250.0,
+        ttft_sigma: float = 0.3,
+        inter_token_ms: float = 20.0,
+        inter_token_sigma: float = 0.2,
+        speedup: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.ttft_ms = ttft_ms
+        self.ttft_sigma = ttft_sigma
+        self.inter_token_ms = inter_token_ms
+        self.inter_token_sigma = inter_token_sigma
+        self.speedup = speedup
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sample(self, median_ms: float, sigma: float) -> float:
+        if median_ms <= 0:
+            return 0.0
+        with self._lock:
+            value = (
+                self._random.lognormvariate(math.log(median_ms), sigma)
+                if sigma > 0
+                else median_ms
+            )
+        return value / 1000.0 / max(self.speedup, 1e-9)
+
+    def sample_ttft(self) -> float:
+        """Return a time-to-first-token delay in seconds."""
+        return self._sample(self.ttft_ms, self.ttft_sigma)
+
+    def sample_inter_token(self) -> float:
+        """Return an inter-token delay in seconds."""
+        return self._sample(self.inter_token_ms, self.inter_token_sigma)
+
+
+class ReplayLLMService:
+    """Serves recorded Ollama responses, optionally streamed token by token."""
+
+    def __init__(
+        self,
+        recordings_path: Optional[str] = None,
+        latency: Optional[LatencyModel] = None,
+        recordings: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.recordings_path = recordings_path
+        self.latency = latency or LatencyModel()
+        self._recordings: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_model: Dict[str, List[Dict[str, Any]]] = {}
+        # Round-robin position per candidate group, so requests for one prompt
+        # cycle through that prompt's recordings regardless of other traffic
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if recordings_path:
+            self.load(recordings_path)
+        for record in recordings or []:
+            self.add_recording(record)
+
+    @staticmethod
+    def _key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def load(self, path: str) -> int:
+        """Load recordings from a JSON Lines file and return how many were read."""
+        count = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self.add_recording(json.loads(line))
+                    count += 1
+        except FileNotFoundError:
+            logger.warning(f"Recordings file not found: {path}")
+        logger.info(f"Loaded {count} recorded responses from {path}")
+        return count
+
+    def add_recording(self, record: Dict[str, Any]) -> None:
+        """Index a single recording by (model, prompt) and by model."""
+        record = dict(record)
+        if not record.get("chunks"):
+            record["chunks"] = _TOKEN_PATTERN.findall(record.get("response", ""))
+        model = record.get("model", "")
+        with self._lock:
+            self._recordings.append(record)
+            self._by_key.setdefault(
+                self._key(model, record.get("prompt", "")), []
+            ).append(record)
+            self._by_model.setdefault(model, []).append(record)
+
+    def list_models(self) -> List[str]:
+        """Return the model names present in the recordings."""
+        with self._lock:
+            return sorted(name for name in self._by_model if name)
+
+    def _select(self, model: str, prompt: str) -> Dict[str, Any]:
+        """Pick the recording for a request.
+
+        Exact (model, prompt) matches win; otherwise recordings for the same
+        model, then any recording, are served round-robin so load tests cycle
+        through realistic response lengths.
+        """
+        key = self._key(model, prompt)
+        with self._lock:
+            if key in self._by_key:
+                group, candidates = key, self._by_key[key]
+            elif model in self._by_model:
+                group, candidates = f"model:{model}", self._by_model[model]
+            else:
+                group, candidates = "", self._recordings
+            if not candidates:
+                return {"model": model, "prompt": prompt, "response": "", "chunks": []}
+            cursor = self._cursors.get(group, 0)
+            self._cursors[group] = cursor + 1
+            return candidates[cursor % len(candidates)]
+
+    def stream(
+        self,
+        prompt: str,
+        model: str = "replay-model",
+        record: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict]:
+        """Yield Ollama-style ``/api/generate`` NDJSON chunks with modelled delays.
+
+        ``record`` replays a specific recording instead of selecting one.
+        """
+        if record is None:
+            record = self._select(model, prompt)
+        chunks = record["chunks"]
+        start = time.perf_counter()
+        first_token_at = None
+
+        for index, chunk in enumerate(chunks):
+            time.sleep(
+                self.latency.sample_ttft()
+                if index == 0
+                else self.latency.sample_inter_token()
+            )
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            yield {"model": model, "response": chunk, "done": False}
+
+        end = time.perf_counter()
+        first_token_at = first_token_at or end
+        yield {
+            "model": model,
+            "response": "",
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((end - start) * 1e9),
+            "prompt_eval_count": self._estimate_tokens(prompt),
+            "prompt_eval_duration": int((first_token_at - start) * 1e9),
+            "eval_count": len(chunks),
+            "eval_duration": int((end - first_token_at) * 1e9),
+        }
+
+    def generate(
+        self,
+        prompt: str,
+        model: str = "replay-model",
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> Dict[str, Any]:
+        """Generate a non-streaming response, matching ``MockLLMService.generate``."""
+        start_time = time.time()
+        response_text = "".join(
+            chunk["response"] for chunk in self.stream(prompt, model)
+        )
+
+        return {
+            "response": response_text,
+            "response_time": time.time() - start_time,
+            "estimated_prompt_tokens": self._estimate_tokens(prompt),
+            "estimated_completion_tokens": self._estimate_tokens(response_text),
+            "estimated_total_tokens": self._estimate_tokens(prompt)
+            + self._estimate_tokens(response_text),
+        }
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Estimate token count based on text length."""
+        # Rough estimate: ~4 characters per token for English text
+        return len(text) // 4
+
+
+def _chat_prompt(messages: List[Dict[str, Any]]) -> str:
+    """Flatten chat messages into the prompt string used as a recording key."""
+    return "\n".join(
+        f"{message.get('role', 'user')}: {message.get('content', '')}"
+        for message in messages
+    )
+
+
+class _ReplayRequestHandler(BaseHTTPRequestHandler):
+    """Implements the subset of the Ollama REST API used across the course."""
+
+    server: "ReplayOllamaServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            models = self.server.service.list_models() or ["replay-model"]
+            self._send_json({"models": [{"name": name, "model": name} for name in models]})
+        elif self.path in ("/", ""):
+            self._send_json({"status": "Ollama replay server is running"})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        if path not in ("/api/generate", "/api/chat"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        payload = self._read_json()
+        model = payload.get("model", "replay-model")
+        is_chat = path == "/api/chat"
+        prompt = (
+            _chat_prompt(payload.get("messages", []))
+            if is_chat
+            else payload.get("prompt", "")
+        )
+
+        record = None
+        if self.server.record_from:
+            try:
+                record = self._record_upstream(path, payload, model, prompt)
+            except requests.HTTPError as e:
+                # Pass the upstream error through, e.g. 404 for an unknown model
+                status = e.response.status_code
+                try:
+                    error = e.response.json()
+                except ValueError:
+                    error = {"error": e.response.text or str(e)}
+                self._send_json(error, status=status)
+                return
+            except requests.RequestException as e:
+                logger.error(f"Recording from upstream failed: {e}")
+                self._send_json({"error": f"upstream request failed: {e}"}, status=502)
+                return
+
+        # Ollama streams by default
+        if payload.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in self.server.service.stream(prompt, model, record):
+                self._write_chunk(_as_chat_chunk(chunk) if is_chat else chunk)
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        text = ""
+        final: Dict[str, Any] = {}
+        for chunk in self.server.service.stream(prompt, model, record):
+            text += chunk["response"]
+            final = chunk
+        final = dict(final, response=text)
+        self._send_json(_as_chat_chunk(final) if is_chat else final)
+
+    def _write_chunk(self, chunk: Dict[str, Any]) -> None:
+        data = (json.dumps(chunk) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _record_upstream(
+        self, path: str, payload: Dict[str, Any], model: str, prompt: str
+    ) -> Dict[str, Any]:
+        """Forward the request to a real Ollama server, save its response and return it.
+
+        Raises ``requests.RequestException`` if the upstream call fails.
+        """
+        upstream = dict(payload, stream=True)
+        chunks = []
+        with requests.post(
+            f"{self.server.record_from}{path}", json=upstream, stream=True, timeout=300
+        ) as response:
+            if not response.ok:
+                # Read the error body while the connection is still open
+                _ = response.content
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                piece = (
+                    data.get("message", {}).get("content", "")
+                    if path == "/api/chat"
+                    else data.get("response", "")
+                )
+                if piece:
+                    chunks.append(piece)
+
+        record = {
+            "model": model,
+            "prompt": prompt,
+            "response": "".join(chunks),
+            "chunks": chunks,
+        }
+        self.server.service.add_recording(record)
+        self.server.append_recording(record)
+        return record
+
+
+def _as_chat_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ``/api/generate`` chunk into the ``/api/chat`` shape."""
+    chat_chunk = {k: v for k, v in chunk.items() if k != "response"}
+    chat_chunk["message"] = {"role": "assistant", "content": chunk.get("response", "")}
+    return chat_chunk
+
+
+class ReplayOllamaServer(ThreadingHTTPServer):
+    """Threaded HTTP server exposing a ``ReplayLLMService`` as an Ollama endpoint."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: ReplayLLMService,
+        host: str = "127.0.0.1",
+        port: int = 11435,
+        record_from: Optional[str] = None,
+    ):
+        super().__init__((host, port), _ReplayRequestHandler)
+        self.service = service
+        self.record_from = record_from.rstrip("/") if record_from else None
+        self._write_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def append_recording(self, record: Dict[str, Any]) -> None:
+        """Append a captured response to the recordings file."""
+        if not self.service.recordings_path:
+            return
+        with self._write_lock:
+            with open(self.service.recordings_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def start_background(self) -> threading.Thread:
+        """Serve requests on a daemon thread and return it."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama replay server")
+    parser.add_argument("--recordings", required=True, help="JSON Lines recordings file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft-ms", type=float, default=250.0)
+    parser.add_argument("--ttft-sigma", type=float, default=0.3)
+    parser.add_argument("--itl-ms", type=float, default=20.0)
+    parser.add_argument("--itl-sigma", type=float, default=0.2)
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--record-from",
+        default=None,
+        help="Proxy to this Ollama URL and append its responses to the recordings",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    latency = LatencyModel(
+        ttft_ms=args.ttft_ms,
+        ttft_sigma=args.ttft_sigma,
+        inter_token_ms=args.itl_ms,
+        inter_token_sigma=args.itl_sigma,
+        speedup=args.speedup,
+        seed=args.seed,
+    )
+    # In record mode the upstream latency is already real, so don't add more
+    if args.record_from:
+        latency = LatencyModel(ttft_ms=0, inter_token_ms=0)
+
+    service = ReplayLLMService(args.recordings, latency=latency)
+    server = ReplayOllamaServer(
+        service, host=args.host, port=args.port, record_from=args.record_from
+    )
+    logger.info(f"Replay server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
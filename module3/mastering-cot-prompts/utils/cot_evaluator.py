@@ -2,9 +2,9 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List
 import re
-import matplotlib.pyplot as plt
-import io
 import base64
+from matplotlib.figure import Figure
+from utils.render_cache import get_render_cache
 
 
 class CoTEvaluator:
@@ -160,8 +160,6 @@ class CoTEvaluator:
 
     def plot_metrics(self, metrics: Dict) -> str:
         """Generate a plot of evaluation metrics and return as base64 encoded string."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-
         # Prepare data
         metrics_to_plot = {
             "Domain Relevance": metrics["domain_relevance_score"],
@@ -169,48 +167,44 @@ class CoTEvaluator:
             "Overall Score": metrics["overall_score"],
         }
 
-        # Create horizontal bar chart
-        bars = ax.barh(
-            list(metrics_to_plot.keys()),
-            list(metrics_to_plot.values()),
-            color=["#3498db", "#2ecc71", "#f39c12"],
-        )
+        def draw(fig: Figure) -> None:
+            ax = fig.subplots()
 
-        # Add values to end of bars
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(
-                width + 0.1,
-                bar.get_y() + bar.get_height() / 2,
-                f"{width:.1f}",
-                ha="left",
-                va="center",
+            # Create horizontal bar chart
+            bars = ax.barh(
+                list(metrics_to_plot.keys()),
+                list(metrics_to_plot.values()),
+                color=["#3498db", "#2ecc71", "#f39c12"],
             )
 
-        # Set limits and labels
-        ax.set_xlim(0, 10)
-        ax.set_xlabel("Score (0-10)")
-        ax.set_title("Evaluation Metrics")
+            # Add values to end of bars
+            for bar in bars:
+                width = bar.get_width()
+                ax.text(
+                    width + 0.1,
+                    bar.get_y() + bar.get_height() / 2,
+                    f"{width:.1f}",
+                    ha="left",
+                    va="center",
+                )
 
-        # Add a grid
-        ax.grid(True, linestyle="--", alpha=0.7)
+            # Set limits and labels
+            ax.set_xlim(0, 10)
+            ax.set_xlabel("Score (0-10)")
+            ax.set_title("Evaluation Metrics")
 
-        # Save the plot to a bytes buffer
-        buf = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
+            # Add a grid
+            ax.grid(True, linestyle="--", alpha=0.7)
 
-        # Convert to base64 string
-        img_str = base64.b64encode(buf.read()).decode("utf-8")
-        plt.close(fig)
+        image = get_render_cache().get_or_render(
+            "evaluation_metrics", metrics_to_plot, draw, figsize=(10, 6)
+        )
 
-        return img_str
+        # Convert to base64 string
+        return base64.b64encode(image).decode("utf-8")
 
     def compare_metrics(self, standard_metrics: Dict, cot_metrics: Dict) -> str:
         """Generate a comparison plot of standard vs CoT metrics and return as base64 encoded string."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-
         # Prepare data
         metrics = ["Word Count", "Reasoning Indicators"]
         standard_values = [
@@ -227,57 +221,58 @@ class CoTEvaluator:
         standard_values[0] = (standard_values[0] / max_word_count) * 10
         cot_values[0] = (cot_values[0] / max_word_count) * 10
 
-        # Set up positions
-        x = range(len(metrics))
-        width = 0.35
-
-        # Create grouped bar chart
-        rects1 = ax.bar(
-            [i - width / 2 for i in x],
-            standard_values,
-            width,
-            label="Standard",
-            color="#3498db",
-        )
-        rects2 = ax.bar(
-            [i + width / 2 for i in x],
-            cot_values,
-            width,
-            label="Chain-of-Thought",
-            color="#e74c3c",
-        )
+        def draw(fig: Figure) -> None:
+            ax = fig.subplots()
 
-        # Add labels and title
-        ax.set_ylabel("Score")
-        ax.set_title("Standard vs Chain-of-Thought Comparison")
-        ax.set_xticks(x)
-        ax.set_xticklabels(metrics)
-        ax.legend()
-
-        # Add value labels
-        def autolabel(rects):
-            for rect in rects:
-                height = rect.get_height()
-                ax.annotate(
-                    f"{height:.1f}",
-                    xy=(rect.get_x() + rect.get_width() / 2, height),
-                    xytext=(0, 3),
-                    textcoords="offset points",
-                    ha="center",
-                    va="bottom",
-                )
+            # Set up positions
+            x = range(len(metrics))
+            width = 0.35
+
+            # Create grouped bar chart
+            rects1 = ax.bar(
+                [i - width / 2 for i in x],
+                standard_values,
+                width,
+                label="Standard",
+                color="#3498db",
+            )
+            rects2 = ax.bar(
+                [i + width / 2 for i in x],
+                cot_values,
+                width,
+                label="Chain-of-Thought",
+                color="#e74c3c",
+            )
 
-        autolabel(rects1)
-        autolabel(rects2)
+            # Add labels and title
+            ax.set_ylabel("Score")
+            ax.set_title("Standard vs Chain-of-Thought Comparison")
+            ax.set_xticks(x)
+            ax.set_xticklabels(metrics)
+            ax.legend()
+
+            # Add value labels
+            def autolabel(rects):
+                for rect in rects:
+                    height = rect.get_height()
+                    ax.annotate(
+                        f"{height:.1f}",
+                        xy=(rect.get_x() + rect.get_width() / 2, height),
+                        xytext=(0, 3),
+                        textcoords="offset points",
+                        ha="center",
+                        va="bottom",
+                    )
 
-        # Save the plot to a bytes buffer
-        buf = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
+            autolabel(rects1)
+            autolabel(rects2)
 
-        # Convert to base64 string
-        img_str = base64.b64encode(buf.read()).decode("utf-8")
-        plt.close(fig)
+        image = get_render_cache().get_or_render(
+            "evaluation_comparison",
+            {"standard": standard_values, "cot": cot_values},
+            draw,
+            figsize=(10, 6),
+        )
 
-        return img_str
+        # Convert to base64 string
+        return base64.b64encode(image).decode("utf-8")
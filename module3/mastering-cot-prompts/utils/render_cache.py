@@ -0,0 +1,131 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class ChartRenderCache:
+    """Caches rendered chart images keyed by a hash of the chart's inputs.
+
+    Streamlit re-runs the whole script on every interaction, so charts whose
+    metrics have not changed would otherwise be rebuilt each time. Figures are
+    created with the object-oriented matplotlib API (not pyplot), rendered on
+    the calling thread, and released as soon as their bytes are saved.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        # One lock per chart being rendered, so concurrent sessions asking for
+        # the same chart wait for a single render instead of each drawing it
+        self._pending: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(chart_name: str, data: Dict, fmt: str = "png") -> str:
+        """Build a stable cache key from the chart name, its inputs and format."""
+        payload = json.dumps(
+            {"chart": chart_name, "data": data, "fmt": fmt},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_render(
+        self,
+        chart_name: str,
+        data: Dict,
+        draw: Callable[[Figure], None],
+        figsize=(10, 6),
+        fmt: str = "png",
+        tight_layout: bool = True,
+    ) -> bytes:
+        """Return cached image bytes, rendering the chart on a miss."""
+        key = self.make_key(chart_name, data, fmt)
+
+        with self._lock:
+            image = self._lookup(key)
+            if image is not None:
+                return image
+            render_lock = self._pending.setdefault(key, threading.Lock())
+
+        with render_lock:
+            with self._lock:
+                # Another session may have rendered it while this one waited
+                image = self._lookup(key)
+                if image is not None:
+                    return image
+                self.misses += 1
+
+            try:
+                image = self._render(draw, figsize, fmt, tight_layout)
+                with self._lock:
+                    self._entries[key] = image
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+        return image
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        """Return a cached image and count the hit (caller holds the lock)."""
+        image = self._entries.get(key)
+        if image is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return image
+
+    @staticmethod
+    def _render(
+        draw: Callable[[Figure], None], figsize, fmt: str, tight_layout: bool
+    ) -> bytes:
+        """Draw a figure and serialize it to PNG or SVG bytes."""
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        try:
+            draw(fig)
+            if tight_layout:
+                fig.tight_layout()
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt)
+            return buf.getvalue()
+        finally:
+            # Drop references so the figure and its artists can be collected
+            fig.clear()
+
+    def clear(self) -> None:
+        """Remove all cached images."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(image) for image in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_render_cache: Optional[ChartRenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> ChartRenderCache:
+    """Return the process-wide render cache, shared across Streamlit reruns."""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = ChartRenderCache()
+        return _render_cache
@@ -1,9 +1,8 @@
-import matplotlib.pyplot as plt
-import io
-import base64
 import streamlit as st
 import re
 from typing import Dict, List, Tuple
+from matplotlib.figure import Figure
+from utils.render_cache import get_render_cache
 
 
 def highlight_text(text: str, indicators: List[str]) -> str:
@@ -29,61 +28,62 @@ def create_comparison_chart(std_metrics: Dict, cot_metrics: Dict) -> None:
         ),
     }
 
-    # Create a DataFrame for plotting
-    labels = list(metrics.keys())
-    standard_values = [metrics[label][0] for label in labels]
-    cot_values = [metrics[label][1] for label in labels]
-
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    # Set up bar positions
-    x = range(len(labels))
-    width = 0.35
-
-    # Create grouped bar chart
-    rects1 = ax.bar(
-        [pos - width / 2 for pos in x],
-        standard_values,
-        width,
-        label="Standard",
-        color="#3498db",
-    )
-    rects2 = ax.bar(
-        [pos + width / 2 for pos in x],
-        cot_values,
-        width,
-        label="Chain-of-Thought",
-        color="#e74c3c",
-    )
+    def draw(fig: Figure) -> None:
+        ax = fig.subplots()
 
-    # Add labels and title
-    ax.set_ylabel("Count")
-    ax.set_title("Standard vs Chain-of-Thought Comparison")
-    ax.set_xticks(x)
-    ax.set_xticklabels(labels)
-    ax.legend()
-
-    # Add value labels
-    def autolabel(rects):
-        for rect in rects:
-            height = rect.get_height()
-            ax.annotate(
-                f"{height}",
-                xy=(rect.get_x() + rect.get_width() / 2, height),
-                xytext=(0, 3),
-                textcoords="offset points",
-                ha="center",
-                va="bottom",
-            )
+        labels = list(metrics.keys())
+        standard_values = [metrics[label][0] for label in labels]
+        cot_values = [metrics[label][1] for label in labels]
 
-    autolabel(rects1)
-    autolabel(rects2)
+        # Set up bar positions
+        x = range(len(labels))
+        width = 0.35
 
-    plt.tight_layout()
+        # Create grouped bar chart
+        rects1 = ax.bar(
+            [pos - width / 2 for pos in x],
+            standard_values,
+            width,
+            label="Standard",
+            color="#3498db",
+        )
+        rects2 = ax.bar(
+            [pos + width / 2 for pos in x],
+            cot_values,
+            width,
+            label="Chain-of-Thought",
+            color="#e74c3c",
+        )
+
+        # Add labels and title
+        ax.set_ylabel("Count")
+        ax.set_title("Standard vs Chain-of-Thought Comparison")
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels)
+        ax.legend()
+
+        # Add value labels
+        def autolabel(rects):
+            for rect in rects:
+                height = rect.get_height()
+                ax.annotate(
+                    f"{height}",
+                    xy=(rect.get_x() + rect.get_width() / 2, height),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha="center",
+                    va="bottom",
+                )
+
+        autolabel(rects1)
+        autolabel(rects2)
+
+    image = get_render_cache().get_or_render(
+        "comparison_chart", metrics, draw, figsize=(10, 6)
+    )
 
     # Display in Streamlit
-    st.pyplot(fig)
+    st.image(image, use_container_width=True)
 
 
 def create_radar_chart(metrics: Dict) -> None:
@@ -96,45 +96,52 @@ def create_radar_chart(metrics: Dict) -> None:
         metrics["overall_score"],
     ]
 
-    # Convert to radar format with closed loop
-    categories = categories + [categories[0]]
-    values = values + [values[0]]
+    def draw(fig: Figure) -> None:
+        # Convert to radar format with closed loop
+        closed_categories = categories + [categories[0]]
+        closed_values = values + [values[0]]
 
-    # Calculate angles for radar chart
-    angles = [
-        n / float(len(categories) - 1) * 2 * 3.14159 for n in range(len(categories))
-    ]
+        # Calculate angles for radar chart
+        angles = [
+            n / float(len(closed_categories) - 1) * 2 * 3.14159
+            for n in range(len(closed_categories))
+        ]
 
-    # Create figure and polar axis
-    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
+        # Create polar axis
+        ax = fig.add_subplot(polar=True)
 
-    # Plot the radar chart
-    ax.plot(angles, values, linewidth=2, linestyle="solid", color="#3498db")
-    ax.fill(angles, values, alpha=0.25, color="#3498db")
+        # Plot the radar chart
+        ax.plot(angles, closed_values, linewidth=2, linestyle="solid", color="#3498db")
+        ax.fill(angles, closed_values, alpha=0.25, color="#3498db")
 
-    # Set the angle labels
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories[:-1])
+        # Set the angle labels
+        ax.set_xticks(angles[:-1])
+        ax.set_xticklabels(closed_categories[:-1])
 
-    # Set y-axis limits and labels
-    ax.set_ylim(0, 10)
-    ax.set_yticks([2, 4, 6, 8, 10])
-    ax.set_yticklabels(["2", "4", "6", "8", "10"])
+        # Set y-axis limits and labels
+        ax.set_ylim(0, 10)
+        ax.set_yticks([2, 4, 6, 8, 10])
+        ax.set_yticklabels(["2", "4", "6", "8", "10"])
 
-    # Add title
-    plt.title("Evaluation Metrics Radar Chart", size=15, y=1.1)
+        # Add title
+        ax.set_title("Evaluation Metrics Radar Chart", size=15, y=1.1)
+
+    image = get_render_cache().get_or_render(
+        "radar_chart",
+        dict(zip(categories, values)),
+        draw,
+        figsize=(8, 8),
+        tight_layout=False,
+    )
 
     # Display in Streamlit
-    st.pyplot(fig)
+    st.image(image, use_container_width=True)
 
 
 def create_step_breakdown_chart(
     steps: int, word_count: int, keyword_count: int
 ) -> None:
     """Create a horizontal bar chart for reasoning steps breakdown."""
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(10, 5))
-
     # Prepare data
     metrics = {
         "Reasoning Steps": steps,
@@ -142,35 +149,40 @@ def create_step_breakdown_chart(
         "Words per Step": word_count / max(1, steps),
     }
 
-    # Create horizontal bar chart
-    bars = ax.barh(
-        list(metrics.keys()),
-        list(metrics.values()),
-        color=["#3498db", "#2ecc71", "#f39c12"],
-    )
+    def draw(fig: Figure) -> None:
+        ax = fig.subplots()
 
-    # Add values to end of bars
-    for bar in bars:
-        width = bar.get_width()
-        ax.text(
-            width + 0.5,
-            bar.get_y() + bar.get_height() / 2,
-            f"{width:.1f}",
-            ha="left",
-            va="center",
+        # Create horizontal bar chart
+        bars = ax.barh(
+            list(metrics.keys()),
+            list(metrics.values()),
+            color=["#3498db", "#2ecc71", "#f39c12"],
         )
 
-    # Set labels and title
-    ax.set_xlabel("Count")
-    ax.set_title("Response Breakdown")
+        # Add values to end of bars
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(
+                width + 0.5,
+                bar.get_y() + bar.get_height() / 2,
+                f"{width:.1f}",
+                ha="left",
+                va="center",
+            )
+
+        # Set labels and title
+        ax.set_xlabel("Count")
+        ax.set_title("Response Breakdown")
 
-    # Add a grid
-    ax.grid(True, linestyle="--", alpha=0.7)
+        # Add a grid
+        ax.grid(True, linestyle="--", alpha=0.7)
 
-    plt.tight_layout()
+    image = get_render_cache().get_or_render(
+        "step_breakdown_chart", metrics, draw, figsize=(10, 5)
+    )
 
     # Display in Streamlit
-    st.pyplot(fig)
+    st.image(image, use_container_width=True)
 
 
 def get_color_scale(score: float) -> str:
@@ -270,40 +282,43 @@ def format_prompt_for_display(prompt: str) -> str:
 
 def create_word_count_indicators_chart(word_count: int, indicators: int) -> None:
     """Create a simple chart showing word count and reasoning indicators."""
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(8, 4))
-
     # Prepare data
     metrics = {"Word Count": word_count, "Reasoning Indicators": indicators}
 
-    # Normalize word count for better visualization
-    metrics["Word Count"] = metrics["Word Count"] / 100
+    def draw(fig: Figure) -> None:
+        ax = fig.subplots()
 
-    # Create bar chart
-    bars = ax.bar(
-        list(metrics.keys()), list(metrics.values()), color=["#3498db", "#e74c3c"]
-    )
+        # Normalize word count for better visualization
+        values = dict(metrics)
+        values["Word Count"] = values["Word Count"] / 100
 
-    # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        value_text = f"{height}"
-        if bar.get_x() < 1:  # Word count bar
-            value_text = f"{height * 100} words"
-        ax.annotate(
-            value_text,
-            xy=(bar.get_x() + bar.get_width() / 2, height),
-            xytext=(0, 3),
-            textcoords="offset points",
-            ha="center",
-            va="bottom",
+        # Create bar chart
+        bars = ax.bar(
+            list(values.keys()), list(values.values()), color=["#3498db", "#e74c3c"]
         )
 
-    # Set labels and title
-    ax.set_ylabel("Count")
-    ax.set_title("Response Metrics")
+        # Add value labels
+        for bar in bars:
+            height = bar.get_height()
+            value_text = f"{height}"
+            if bar.get_x() < 1:  # Word count bar
+                value_text = f"{height * 100} words"
+            ax.annotate(
+                value_text,
+                xy=(bar.get_x() + bar.get_width() / 2, height),
+                xytext=(0, 3),
+                textcoords="offset points",
+                ha="center",
+                va="bottom",
+            )
+
+        # Set labels and title
+        ax.set_ylabel("Count")
+        ax.set_title("Response Metrics")
 
-    plt.tight_layout()
+    image = get_render_cache().get_or_render(
+        "word_count_indicators_chart", metrics, draw, figsize=(8, 4)
+    )
 
     # Display in Streamlit
-    st.pyplot(fig)
+    st.image(image, use_container_width=True)
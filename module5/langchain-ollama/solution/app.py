@@ -5,11 +5,12 @@ This module provides the main application interface for the RAG system,
 including interactive CLI and demo functionality.
 """
 
+import csv
 import os
 import sys
 import time
 import warnings
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # --- Suppress specific warnings ---
@@ -25,6 +26,7 @@ load_dotenv()
 
 # Import our custom modules
 from rag.enhanced_rag import EnhancedRAG
+from rag.ingest_pipeline import IngestSource
 from processors.document_processor import DocumentProcessor
 from models.embeddings_fixed import SentenceTransformerEmbeddings
 from langchain_community.vectorstores import FAISS
@@ -33,6 +35,28 @@ from langchain.chains import RetrievalQA
 from models.ollama_integration_fixed import OllamaLLM
 
 
+def sample_sources() -> List[IngestSource]:
+    """
+    Build the list of sample sources: the bundled PDFs and the WikiBooks in metadata.csv.
+
+    Returns:
+        A list of IngestSource objects.
+    """
+    sources = [
+        IngestSource("pdf", "data/books/BAGuidebook2.pdf"),
+        IngestSource("pdf", "data/books/Find_Employment.pdf"),
+        IngestSource("pdf", "data/books/Managing_Groups_and_Teams.pdf"),
+    ]
+
+    with open("data/metadata.csv", "r") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row["URL"] and "wikibooks.org" in row["URL"] and not row["PDF_URL"]:
+                sources.append(IngestSource("wikibook", row["URL"]))
+
+    return sources
+
+
 def run_demo(api_url: Optional[str] = None):
     """
     Run a demonstration of the EnhancedRAG system with example queries.
@@ -52,27 +76,8 @@ def run_demo(api_url: Optional[str] = None):
     # Add sample documents from the product_docs directory
     print("\nAdding product documentation...")
 
-    # Add documents from the data directory
-    rag.add_pdf("data/books/BAGuidebook2.pdf")
-    rag.add_pdf("data/books/Find_Employment.pdf")
-    rag.add_pdf("data/books/Managing_Groups_and_Teams.pdf")
-    
-    # Load WikiBooks from metadata.csv
-    print("Loading WikiBooks from metadata.csv...")
-    import csv
-    with open("data/metadata.csv", "r") as f:
-        reader = csv.DictReader(f)
-        wikibook_count = 0
-        for row in reader:
-            if row["URL"] and "wikibooks.org" in row["URL"] and not row["PDF_URL"]:
-                wikibook_count += 1
-                print(f"Loading WikiBook {wikibook_count}: {row['Title']} from {row['URL']}")
-                try:
-                    result = rag.add_wikibook(row["URL"])
-                    print(f"Successfully loaded WikiBook: {result}")
-                except Exception as e:
-                    print(f"Error loading WikiBook {row['Title']}: {e}")
-        print(f"Loaded {wikibook_count} WikiBooks")
+    # Add the PDFs and WikiBooks as one pipelined ingest job
+    rag.ingest(sample_sources())
 
     # Test queries using the unified RAG system
     print("\nTesting queries using the RAG system...")
@@ -139,26 +144,9 @@ def interactive_mode(api_url: Optional[str] = None):
     # Add documents from the data directory
     print("  ↳ Adding documents from the data directory...")
 
-    rag.add_pdf("data/books/BAGuidebook2.pdf")
-    rag.add_pdf("data/books/Find_Employment.pdf")
-    rag.add_pdf("data/books/Managing_Groups_and_Teams.pdf")
-
-    # Load WikiBooks from metadata.csv
-    print("  ↳ Loading WikiBooks from metadata.csv...")
-    import csv
-    with open("data/metadata.csv", "r") as f:
-        reader = csv.DictReader(f)
-        wikibook_count = 0
-        for row in reader:
-            if row["URL"] and "wikibooks.org" in row["URL"] and not row["PDF_URL"]:
-                wikibook_count += 1
-                print(f"  ↳ Loading WikiBook {wikibook_count}: {row['Title']} from {row['URL']}")
-                try:
-                    result = rag.add_wikibook(row["URL"])
-                    print(f"  ↳ Successfully loaded WikiBook: {result}")
-                except Exception as e:
-                    print(f"  ↳ Error loading WikiBook {row['Title']}: {e}")
-        print(f"  ↳ Loaded {wikibook_count} WikiBooks")
+    # Load the PDFs and the WikiBooks listed in metadata.csv together
+    print("  ↳ Loading PDFs and WikiBooks from metadata.csv...")
+    rag.ingest(sample_sources())
 
     print("  ✓ All documents loaded successfully!")
     
@@ -173,6 +161,7 @@ def interactive_mode(api_url: Optional[str] = None):
             '• Any natural language query (e.g., "What are the best practices for team management?")'
         )
         # Removed compare, faiss, chroma, reload faiss, reload chroma, run demo
+        print("• /hybrid <query>  - Answer using FAISS fused with BM25 keyword search")
         print("• /reload vectordb - Rebuild both vector stores")
         print("• /help            - Show this help menu")
         print("• /exit            - Exit interactive mode")
@@ -199,6 +188,14 @@ def interactive_mode(api_url: Optional[str] = None):
 
         # Removed handlers for /run demo, /compare, /faiss, /chroma, /reload faiss, /reload chroma
 
+        elif user_input.lower().startswith("/hybrid "):
+            query_count += 1
+            question = user_input[len("/hybrid "):].strip()
+            print(f'\nProcessing hybrid query #{query_count}: "{question}"')
+            rag.query(question, vector_store="hybrid")
+            time.sleep(1) # Allow streaming to finish before showing help
+            show_help()
+
         # Use the reload commands built into EnhancedRAG
         elif user_input.lower() == "/reload vectordb":
             print(rag._handle_command("/reload vectordb"))
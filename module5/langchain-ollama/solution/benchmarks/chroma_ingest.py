@@ -0,0 +1,89 @@
+"""
+Chroma Small-Add Ingest Benchmark
+
+Measures ingest throughput when documents arrive in many small batches,
+comparing a write to Chroma on every add (the old behaviour) with the
+buffered writer in managers.chroma_writer. A fake embedding model is used so
+the numbers reflect store writes rather than model inference.
+
+Usage:
+    python -m benchmarks.chroma_ingest [adds] [docs_per_add]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+warnings.filterwarnings("ignore")
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from managers.vector_store_manager import VectorStoreManager
+
+
+def make_batches(adds: int, docs_per_add: int):
+    """Create the small document batches to ingest."""
+    return [
+        [
+            Document(
+                page_content=f"Entry {i}.{j} of the export covers topic {(i + j) % 23}.",
+                metadata={"source": "export.csv", "source_type": "csv", "chunk_id": f"{i}-{j}"},
+            )
+            for j in range(docs_per_add)
+        ]
+        for i in range(adds)
+    ]
+
+
+def ingest(batches, max_pending: int) -> float:
+    """Ingest the batches into a fresh store and return documents per second."""
+    with tempfile.TemporaryDirectory() as persist_directory:
+        manager = VectorStoreManager(
+            DeterministicFakeEmbedding(size=384),
+            persist_directory=os.path.join(persist_directory, "chroma"),
+        )
+        # Embed up front so only indexing is timed
+        for batch in batches:
+            manager.embed_documents(batch)
+
+        manager.initialize_stores(batches[0])
+        manager.chroma_writer.max_pending = max_pending
+        manager.flush()
+
+        start = time.perf_counter()
+        for batch in batches[1:]:
+            manager.add_documents(batch)
+        manager.flush()
+        elapsed = time.perf_counter() - start
+
+        count = manager.chroma_store._collection.count()
+        manager.close()
+
+    expected = sum(len(batch) for batch in batches)
+    assert count == expected, f"expected {expected} records in Chroma, found {count}"
+    return (expected - len(batches[0])) / elapsed
+
+
+def main(adds: int = 300, docs_per_add: int = 4):
+    batches = make_batches(adds, docs_per_add)
+
+    unbuffered = ingest(batches, max_pending=1)
+    buffered = ingest(batches, max_pending=1000)
+
+    print("=" * 60)
+    print(f"CHROMA INGEST ({adds} adds x {docs_per_add} documents)")
+    print("=" * 60)
+    print(f"• Write on every add: {unbuffered:,.0f} docs/s")
+    print(f"• Buffered writes:    {buffered:,.0f} docs/s")
+    print(f"• Speedup:            {buffered / unbuffered:.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    )
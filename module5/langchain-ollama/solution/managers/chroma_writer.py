@@ -0,0 +1,187 @@
+"""
+Buffered Writer for the Persistent Chroma Store
+
+Every write to Chroma is its own SQLite transaction plus an HNSW index update,
+so ingesting many small batches spends most of its time committing. This
+module buffers adds in memory and writes them to Chroma in large batches,
+flushing when the buffer is full, when the oldest pending record is older
+than a time limit, before reads, and on shutdown.
+
+Buffered records are first appended to a write-ahead log, so records that
+were accepted but not yet flushed are replayed into Chroma after a crash.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_community.vectorstores import Chroma
+
+# Chroma's SQLite backend limits how many records a single add() may contain
+CHROMA_MAX_BATCH_SIZE = 5000
+
+
+class BufferedChromaWriter:
+    """
+    Write-behind buffer in front of a Chroma collection.
+
+    Records are upserted by ID, so replaying the log after a crash never
+    creates duplicates.
+    """
+
+    def __init__(
+        self,
+        chroma_store: Chroma,
+        wal_path: str,
+        max_pending: int = 1000,
+        max_delay: float = 2.0,
+    ):
+        """
+        Initialize the writer and replay any records left in the log.
+
+        Args:
+            chroma_store: The Chroma store to write to.
+            wal_path: Path of the write-ahead log file.
+            max_pending: Flush once this many records are buffered.
+            max_delay: Flush once the oldest buffered record is this many seconds old.
+        """
+        self.chroma_store = chroma_store
+        self.wal_path = wal_path
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+
+        self._pending: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self.flush_count = 0
+
+        self._recover()
+
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _recover(self) -> None:
+        """Write records from an interrupted session to Chroma."""
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                # A torn final line was never acknowledged, so it is skipped
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self._pending.append(json.loads(line))
+                except ValueError:
+                    break
+        if self._pending:
+            print(f"Recovering {len(self._pending)} buffered Chroma records...")
+        self.flush()
+
+    def add(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: List[np.ndarray],
+    ) -> None:
+        """
+        Buffer records for writing to Chroma.
+
+        The records are durable once this returns: they are in the log and
+        will reach Chroma on the next flush, or on replay after a crash.
+
+        Args:
+            ids: Record IDs.
+            texts: Document texts.
+            metadatas: Document metadata.
+            vectors: Precomputed embeddings.
+        """
+        records = [
+            {
+                "id": record_id,
+                "document": text,
+                "metadata": metadata,
+                "embedding": np.asarray(vector, dtype=np.float32).tolist(),
+            }
+            for record_id, text, metadata, vector in zip(ids, texts, metadatas, vectors)
+        ]
+        if not records:
+            return
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.wal_path) or ".", exist_ok=True)
+            with open(self.wal_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._pending.extend(records)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._pending) >= self.max_pending:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered records to Chroma and clear the log."""
+        with self._lock:
+            if self._pending:
+                collection = self.chroma_store._collection
+                for start in range(0, len(self._pending), CHROMA_MAX_BATCH_SIZE):
+                    batch = self._pending[start : start + CHROMA_MAX_BATCH_SIZE]
+                    collection.upsert(
+                        ids=[record["id"] for record in batch],
+                        embeddings=[record["embedding"] for record in batch],
+                        metadatas=[record["metadata"] for record in batch],
+                        documents=[record["document"] for record in batch],
+                    )
+                self._pending = []
+                self.flush_count += 1
+
+            self._oldest = None
+            # Only clear the log once its records are safely in Chroma
+            if os.path.exists(self.wal_path):
+                os.truncate(self.wal_path, 0)
+
+    def _flush_periodically(self) -> None:
+        """Background loop enforcing the max_delay flush threshold."""
+        while not self._stop.wait(min(self.max_delay, 0.5)):
+            with self._lock:
+                due = (
+                    self._oldest is not None
+                    and time.monotonic() - self._oldest >= self.max_delay
+                )
+                if due:
+                    try:
+                        self.flush()
+                    except Exception as e:
+                        # Records stay in the log and are retried next time
+                        print(f"Error flushing buffered Chroma records: {e}")
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records waiting to be flushed."""
+        return len(self._pending)
+
+    def close(self) -> None:
+        """Flush remaining records and stop the background thread."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        # Closed explicitly, so the exit hook must not touch the store again
+        atexit.unregister(self.close)
+        self._thread.join()
+        self.flush()
+
+    def discard(self) -> None:
+        """Stop the writer and drop buffered records (used when resetting the store)."""
+        self._stop.set()
+        atexit.unregister(self.close)
+        with self._lock:
+            self._pending = []
+            self._oldest = None
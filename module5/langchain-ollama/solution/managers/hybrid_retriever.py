@@ -0,0 +1,67 @@
+"""
+Hybrid Retriever for the RAG System
+
+This module combines dense (FAISS) and sparse (BM25) retrieval, merging the
+two ranked lists with reciprocal-rank fusion (RRF).
+"""
+
+from typing import Dict, List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Document]], k: int, rrf_k: int = 60
+) -> List[Document]:
+    """
+    Merge ranked document lists with reciprocal-rank fusion.
+
+    Each document scores the sum of 1 / (rrf_k + rank) over the lists it
+    appears in, so documents ranked well by both retrievers rise to the top.
+
+    Args:
+        result_lists: Ranked lists of documents, best first.
+        k: The number of documents to return.
+        rrf_k: The RRF smoothing constant.
+
+    Returns:
+        The k best documents by fused score.
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = doc.metadata.get("chunk_id") or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(key, doc)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked[:k]]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever that fuses FAISS similarity search with BM25 keyword search.
+
+    The stores are read from the VectorStoreManager on every query, so the
+    retriever stays valid when the manager rebuilds or reloads them.
+    """
+
+    vector_store_manager: object
+    k: int = 4
+    fetch_k: int = 20
+    rrf_k: int = 60
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        manager = self.vector_store_manager
+        dense = (
+            manager.faiss_store.similarity_search(query, k=self.fetch_k)
+            if manager.faiss_store
+            else []
+        )
+        sparse = [doc for doc, _ in manager.sparse_index.search(query, k=self.fetch_k)]
+        return reciprocal_rank_fusion([dense, sparse], k=self.k, rrf_k=self.rrf_k)
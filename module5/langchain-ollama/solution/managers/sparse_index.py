@@ -0,0 +1,177 @@
+"""
+Sparse (BM25) Index for Hybrid Retrieval
+
+This module provides an in-process BM25 inverted index over document chunks.
+It complements dense vector search on queries that hinge on exact terms such
+as form numbers or policy codes, is updated incrementally as documents are
+added, and persists its documents to an append-only JSON-lines file.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Words, plus codes joined by "-", "_", "." or "/" (e.g. "w-2", "hr-104.3")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms.
+
+    Compound codes are kept whole and also split into their parts, so
+    "W-2" matches both "w-2" and "w".
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        A list of terms.
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        terms.append(token)
+        if not token.isalnum():
+            terms.extend(re.split(r"[-_./]", token))
+    return terms
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index.
+
+    Documents are identified by their "chunk_id" metadata (falling back to the
+    text itself), so adding a document that is already indexed is a no-op.
+    When a path is given, indexed documents are appended to a JSON-lines file
+    as they are added and re-indexed from it when the index is reopened.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index, loading previously persisted documents.
+
+        Args:
+            path: JSON-lines file used to persist the index, or None to keep it in memory.
+            k1: Term frequency saturation parameter.
+            b: Document length normalization parameter.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self.doc_lengths: List[int] = []
+        self.total_length = 0
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._keys: Dict[str, int] = {}
+
+        if path and os.path.exists(path):
+            self._index(self._read(path))
+
+    @staticmethod
+    def _read(path: str) -> List[Document]:
+        """Read persisted documents, dropping a torn final line."""
+        documents = []
+        valid_bytes = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid_bytes += len(line)
+                documents.append(
+                    Document(page_content=record["page_content"], metadata=record["metadata"])
+                )
+        # Truncate an interrupted write so later appends start on a fresh line
+        if valid_bytes < os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @staticmethod
+    def _document_key(doc: Document) -> str:
+        return doc.metadata.get("chunk_id") or doc.page_content
+
+    def add_documents(self, documents: List[Document]) -> int:
+        """
+        Add documents to the index and append them to the persisted file.
+
+        Args:
+            documents: The Document objects to index.
+
+        Returns:
+            The number of documents that were not already indexed.
+        """
+        added = self._index(documents)
+        if self.path and added:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for doc in self.documents[-added:]:
+                    f.write(
+                        json.dumps({"page_content": doc.page_content, "metadata": doc.metadata})
+                        + "\n"
+                    )
+        return added
+
+    def _index(self, documents: List[Document]) -> int:
+        """Add documents to the in-memory index; return how many were new."""
+        added = 0
+        for doc in documents:
+            key = self._document_key(doc)
+            if key in self._keys:
+                continue
+
+            position = len(self.documents)
+            terms = tokenize(doc.page_content)
+            for term, frequency in Counter(terms).items():
+                self.postings.setdefault(term, {})[position] = frequency
+
+            self._keys[key] = position
+            self.documents.append(doc)
+            self.doc_lengths.append(len(terms))
+            self.total_length += len(terms)
+            added += 1
+        return added
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Return the k best-scoring documents for a query.
+
+        Args:
+            query: The query string.
+            k: The number of documents to return.
+
+        Returns:
+            A list of (Document, score) tuples, best first.
+        """
+        if not self.documents:
+            return []
+
+        count = len(self.documents)
+        average_length = self.total_length / count or 1.0
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * self.doc_lengths[position] / average_length
+                scores[position] = scores.get(position, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                )
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.documents[position], score) for position, score in best]
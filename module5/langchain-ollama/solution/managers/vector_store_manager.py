@@ -8,9 +8,16 @@ for document storage and retrieval.
 import os
 import time
 import shutil
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from langchain_core.documents import Document
 from langchain_community.vectorstores import FAISS, Chroma
+from managers.chroma_writer import BufferedChromaWriter
+from managers.hybrid_retriever import HybridRetriever
+from managers.sparse_index import BM25Index
 
 
 class VectorStoreManager:
@@ -33,13 +40,119 @@ class VectorStoreManager:
         self.persist_directory = persist_directory
         self.faiss_store = None
         self.chroma_store = None
+        self.chroma_writer: Optional[BufferedChromaWriter] = None
 
-    def initialize_stores(self, documents: List[Document]) -> None:
+        # BM25 keyword index kept alongside the vector stores for hybrid
+        # retrieval, persisted next to the Chroma data
+        self.sparse_index_path = os.path.join(persist_directory, "bm25_index.jsonl")
+        self.sparse_index = BM25Index(self.sparse_index_path)
+
+        # Vectors computed so far, keyed by a hash of the chunk text. Both
+        # stores and the reload commands are populated from these so each
+        # chunk goes through the embedding model only once.
+        self._vector_cache: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _content_key(text: str) -> str:
+        """Return the cache key for a chunk of text."""
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(self, documents: List[Document]) -> List[np.ndarray]:
+        """
+        Embed documents once, reusing vectors already computed for the same text.
+
+        Args:
+            documents: A list of Document objects to embed.
+
+        Returns:
+            One float32 vector per document, in the same order.
+        """
+        keys = [self._content_key(doc.page_content) for doc in documents]
+
+        # Only texts that have never been embedded go through the model
+        missing: Dict[str, str] = {}
+        for key, doc in zip(keys, documents):
+            if key not in self._vector_cache and key not in missing:
+                missing[key] = doc.page_content
+
+        if missing:
+            # Use the model's NumPy fast path when it has one
+            embed = getattr(
+                self.embedding_model,
+                "embed_documents_array",
+                self.embedding_model.embed_documents,
+            )
+            vectors = embed(list(missing.values()))
+            for key, vector in zip(missing.keys(), vectors):
+                self._vector_cache[key] = np.asarray(vector, dtype=np.float32)
+
+        return [self._vector_cache[key] for key in keys]
+
+    @staticmethod
+    def _document_ids(documents: List[Document]) -> List[str]:
+        """Return store IDs for documents, reusing their chunk IDs when present."""
+        return [doc.metadata.get("chunk_id") or str(uuid.uuid4()) for doc in documents]
+
+    def _build_faiss(
+        self, documents: List[Document], vectors: List[np.ndarray]
+    ) -> FAISS:
+        """Create a FAISS store from precomputed vectors."""
+        return FAISS.from_embeddings(
+            text_embeddings=[
+                (doc.page_content, vector) for doc, vector in zip(documents, vectors)
+            ],
+            embedding=self.embedding_model,
+            metadatas=[doc.metadata for doc in documents],
+            ids=self._document_ids(documents),
+        )
+
+    def _build_chroma(
+        self, documents: List[Document], vectors: List[np.ndarray]
+    ) -> Chroma:
+        """Open the persistent Chroma store and queue precomputed vectors for it."""
+        chroma_store = Chroma(
+            embedding_function=self.embedding_model,
+            persist_directory=self.persist_directory,
+        )
+        # Writes go through a buffer so many small adds become a few large ones
+        self.chroma_writer = BufferedChromaWriter(
+            chroma_store, os.path.join(self.persist_directory, "chroma_wal.jsonl")
+        )
+        self._add_to_chroma(documents, vectors)
+        return chroma_store
+
+    def _add_to_chroma(
+        self, documents: List[Document], vectors: List[np.ndarray]
+    ) -> None:
+        """Queue documents with precomputed vectors for the Chroma store."""
+        # Records are upserted, so re-ingesting documents with stable IDs replaces them
+        self.chroma_writer.add(
+            ids=self._document_ids(documents),
+            texts=[doc.page_content for doc in documents],
+            metadatas=[doc.metadata for doc in documents],
+            vectors=vectors,
+        )
+
+    def flush(self) -> None:
+        """Write any buffered Chroma records so they are visible to searches."""
+        if self.chroma_writer:
+            self.chroma_writer.flush()
+
+    def close(self) -> None:
+        """Write any buffered Chroma records and stop the background writer."""
+        if self.chroma_writer:
+            self.chroma_writer.close()
+            self.chroma_writer = None
+
+    def initialize_stores(
+        self, documents: List[Document], vectors: Optional[List[np.ndarray]] = None
+    ) -> None:
         """
         Initialize both vector stores with the provided documents.
 
         Args:
             documents: A list of Document objects to index.
+            vectors: Precomputed vectors for the documents; embedded here if None.
 
         Raises:
             ValueError: If the documents list is empty.
@@ -47,51 +160,63 @@ class VectorStoreManager:
         if not documents:
             raise ValueError("Cannot initialize vector stores with empty document list")
 
+        # Embed once and share the vectors between both stores
+        if vectors is None:
+            vectors = self.embed_documents(documents)
+
         # Initialize FAISS (in-memory only)
-        self.faiss_store = FAISS.from_documents(documents, self.embedding_model)
+        self.faiss_store = self._build_faiss(documents, vectors)
 
-        # Initialize Chroma (persistent)
-        self.chroma_store = Chroma.from_documents(
-            documents, self.embedding_model, persist_directory=self.persist_directory
-        )
+        # Initialize Chroma (persistent, written in buffered batches)
+        if self.chroma_store is not None:
+            self._add_to_chroma(documents, vectors)
+        else:
+            self.chroma_store = self._build_chroma(documents, vectors)
 
-        # Persist Chroma to disk
-        self.chroma_store.persist()
+        # Index the same chunks for keyword search
+        self.sparse_index.add_documents(documents)
 
         print(f"Initialized vector stores with {len(documents)} documents")
 
-    def add_documents(self, documents: List[Document]) -> None:
+    def add_documents(
+        self, documents: List[Document], vectors: Optional[List[np.ndarray]] = None
+    ) -> None:
         """
         Add documents to both vector stores.
 
         Args:
             documents: A list of Document objects to add.
+            vectors: Precomputed vectors for the documents; embedded here if None.
         """
         if not documents:
             return
 
+        # Embed once and share the vectors between both stores
+        if vectors is None:
+            vectors = self.embed_documents(documents)
+
         # Add to FAISS
         if self.faiss_store:
-            self.faiss_store.add_documents(documents)
+            self.faiss_store.add_embeddings(
+                [(doc.page_content, vector) for doc, vector in zip(documents, vectors)],
+                metadatas=[doc.metadata for doc in documents],
+                ids=self._document_ids(documents),
+            )
         else:
-            self.faiss_store = FAISS.from_documents(documents, self.embedding_model)
+            self.faiss_store = self._build_faiss(documents, vectors)
 
-        # Add to Chroma
-        if self.chroma_store:
-            self.chroma_store.add_documents(documents)
+        # Add to Chroma (buffered; flushed by size, age, before reads and at exit)
+        if self.chroma_store is not None:
+            self._add_to_chroma(documents, vectors)
         else:
-            self.chroma_store = Chroma.from_documents(
-                documents,
-                self.embedding_model,
-                persist_directory=self.persist_directory,
-            )
+            self.chroma_store = self._build_chroma(documents, vectors)
 
-        # Persist Chroma to disk
-        self.chroma_store.persist()
+        # Add to the keyword index
+        self.sparse_index.add_documents(documents)
 
     def query_stores(self, query: str, top_k: int = 4) -> Dict[str, Any]:
         """
-        Query both vector stores and return the results with timing information.
+        Query both vector stores concurrently and return the results with timing information.
 
         Args:
             query: The query string.
@@ -100,35 +225,40 @@ class VectorStoreManager:
         Returns:
             A dictionary containing the results from both stores with timing information.
         """
-        results = {}
-
-        # Query FAISS
-        if self.faiss_store:
-            start_time = time.time()
-            faiss_docs = self.faiss_store.similarity_search(query, k=top_k)
-            faiss_time = time.time() - start_time
-
-            results["faiss"] = {"documents": faiss_docs, "retrieval_time": faiss_time}
+        # Make buffered Chroma writes visible before searching
+        self.flush()
+
+        stores = {
+            name: store
+            for name, store in (("faiss", self.faiss_store), ("chroma", self.chroma_store))
+            if store is not None
+        }
+
+        def search(store) -> Dict[str, Any]:
+            start_time = time.perf_counter()
+            documents = store.similarity_search(query, k=top_k)
+            return {
+                "documents": documents,
+                "retrieval_time": time.perf_counter() - start_time,
+            }
 
-        # Query Chroma
-        if self.chroma_store:
-            start_time = time.time()
-            chroma_docs = self.chroma_store.similarity_search(query, k=top_k)
-            chroma_time = time.time() - start_time
+        if len(stores) < 2:
+            return {name: search(store) for name, store in stores.items()}
 
-            results["chroma"] = {
-                "documents": chroma_docs,
-                "retrieval_time": chroma_time,
+        # Each search records its own timing while the other runs alongside it
+        with ThreadPoolExecutor(max_workers=len(stores)) as executor:
+            futures = {
+                name: executor.submit(search, store) for name, store in stores.items()
             }
-
-        return results
+            return {name: future.result() for name, future in futures.items()}
 
     def get_retriever(self, store_name: str):
         """
         Get a retriever for the specified vector store.
 
         Args:
-            store_name: The name of the vector store ("faiss" or "chroma").
+            store_name: The name of the vector store ("faiss", "chroma", or
+                "hybrid" for FAISS fused with BM25 keyword search).
 
         Returns:
             A retriever for the specified vector store.
@@ -144,10 +274,15 @@ class VectorStoreManager:
             return self.faiss_store.as_retriever(search_kwargs={"k": 4})
 
         elif store_name == "chroma":
-            if not self.chroma_store:
+            if self.chroma_store is None:
                 raise ValueError("Chroma vector store is not initialized")
             return self.chroma_store.as_retriever(search_kwargs={"k": 4})
 
+        elif store_name == "hybrid":
+            if not self.faiss_store:
+                raise ValueError("FAISS vector store is not initialized")
+            return HybridRetriever(vector_store_manager=self, k=4)
+
         else:
             raise ValueError(f"Unknown vector store: {store_name}")
 
@@ -158,6 +293,10 @@ class VectorStoreManager:
     def reset_chroma(self) -> None:
         """Reset the Chroma vector store and delete the persistence directory."""
         self.chroma_store = None
+        # Buffered records belong to the store being deleted
+        if self.chroma_writer:
+            self.chroma_writer.discard()
+            self.chroma_writer = None
 
         # Delete the Chroma persistence directory if it exists
         if os.path.exists(self.persist_directory):
@@ -166,3 +305,6 @@ class VectorStoreManager:
                 print(f"Deleted Chroma persistence directory: {self.persist_directory}")
             except Exception as e:
                 print(f"Error deleting Chroma persistence directory: {e}")
+
+        # The keyword index was persisted in the same directory
+        self.sparse_index = BM25Index(self.sparse_index_path)
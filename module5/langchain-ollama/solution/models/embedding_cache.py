@@ -0,0 +1,253 @@
+"""
+Content-Addressed Embedding Cache
+
+This module provides an on-disk cache of embedding vectors keyed by
+(model name, hash of the normalized text). Vectors are stored as a single
+append-only float32 matrix that is memory-mapped for reads, alongside an
+index file listing the text hash of each row. It also provides a small
+in-process LRU cache for query embeddings.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed store of embedding vectors for one model.
+
+    Rows are appended to ``vectors.f32`` before their hashes are appended to
+    ``index.txt``, so a crash part-way through a write leaves at most some
+    unindexed rows, which are truncated the next time the cache is opened.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dimension: int):
+        """
+        Open (or create) the cache for a model.
+
+        Args:
+            cache_dir: The root directory for embedding caches.
+            model_name: The name of the embedding model.
+            dimension: The embedding dimension of the model.
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.directory = os.path.join(
+            cache_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        )
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.txt")
+
+        self._row_bytes = dimension * np.dtype(np.float32).itemsize
+        self._index: Dict[str, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Read the hash index and map the vector matrix."""
+        hashes: List[str] = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="ascii", errors="replace") as f:
+                for line in f:
+                    # Stop at a torn line from an interrupted write; row
+                    # numbers after it could not be trusted
+                    if len(line) != 65 or not line.endswith("\n"):
+                        break
+                    hashes.append(line[:64])
+
+        vector_rows = (
+            os.path.getsize(self.vectors_path) // self._row_bytes
+            if os.path.exists(self.vectors_path)
+            else 0
+        )
+
+        # Drop index entries without a complete vector, and vectors without an
+        # index entry, so the two files line up again after an interrupted write
+        rows = min(len(hashes), vector_rows)
+        index_bytes = (
+            os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        )
+        if index_bytes != rows * 65:
+            # Also removes a torn last line, which the next append would
+            # otherwise run into
+            with open(self.index_path, "w", encoding="ascii", newline="\n") as f:
+                f.writelines(f"{h}\n" for h in hashes[:rows])
+        if os.path.exists(self.vectors_path):
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(rows * self._row_bytes)
+
+        self._index = {h: row for row, h in enumerate(hashes[:rows])}
+        self._remap(rows)
+
+    def _remap(self, rows: int) -> None:
+        """Memory-map the first ``rows`` vectors for reading."""
+        self._matrix = (
+            np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self.dimension),
+            )
+            if rows
+            else None
+        )
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """Return the content hash used as the cache key for normalized text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, keys: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up vectors for a list of keys.
+
+        Args:
+            keys: Content hashes, as returned by ``text_key``.
+
+        Returns:
+            A tuple of (position -> vector for hits, positions that missed).
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        with self._lock:
+            for position, key in enumerate(keys):
+                row = self._index.get(key)
+                if row is None:
+                    missing.append(position)
+                else:
+                    found[position] = self._matrix[row]
+        return found, missing
+
+    def add(self, keys: List[str], vectors: np.ndarray) -> None:
+        """
+        Append new vectors to the cache.
+
+        Args:
+            keys: Content hashes for each vector.
+            vectors: A (len(keys), dimension) array of embeddings.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            new_rows = []
+            batch_keys = set()
+            for key, vector in zip(keys, vectors):
+                if key not in self._index and key not in batch_keys:
+                    batch_keys.add(key)
+                    new_rows.append((key, vector))
+            if not new_rows:
+                return
+
+            start = len(self._index)
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.stack([vector for _, vector in new_rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.index_path, "a", encoding="ascii", newline="\n") as f:
+                f.writelines(f"{key}\n" for key, _ in new_rows)
+                f.flush()
+                os.fsync(f.fileno())
+
+            for offset, (key, _) in enumerate(new_rows):
+                self._index[key] = start + offset
+            self._remap(len(self._index))
+
+
+class QueryEmbeddingLRU:
+    """
+    Thread-safe, bounded LRU cache of query embeddings.
+
+    Concurrent lookups of the same missing query wait for a single
+    computation instead of each encoding the query themselves.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of query embeddings to keep.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Return the cached embedding for a key, computing it on a miss.
+
+        Args:
+            key: The normalized query text.
+            compute: Called with no arguments to embed the query on a miss.
+
+        Returns:
+            The (read-only) embedding vector.
+        """
+        while True:
+            with self._lock:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                pending = self._pending.get(key)
+                if pending is None:
+                    # This caller computes the value; others wait for it
+                    self.misses += 1
+                    pending = self._pending[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            vector = np.array(compute(), dtype=np.float32)
+            vector.flags.writeable = False
+            with self._lock:
+                self._entries[key] = vector
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return vector
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def clear(self) -> None:
+        """Remove all cached embeddings and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            A dict with the entry count, capacity, hits, misses and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
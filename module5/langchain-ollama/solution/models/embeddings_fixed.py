@@ -6,40 +6,178 @@ It implements the necessary interface for embedding documents and queries.
 """
 
 from typing import List, Optional
+import atexit
 import os
 import re
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from langchain_core.embeddings import Embeddings
+from models.embedding_cache import EmbeddingCache, QueryEmbeddingLRU
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
 
 
 class SentenceTransformerEmbeddings(Embeddings):
     """
     LangChain-compatible wrapper for sentence-transformers library.
+
+    Texts are encoded in tunable batches, sorted by length so each batch pads
+    to similar lengths, and normalized to unit length. Callers that can work
+    with NumPy arrays can use the ``*_array`` methods to skip the conversion
+    to Python lists.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        normalize: bool = True,
+        device: Optional[str] = None,
+        num_workers: Optional[int] = None,
+        query_cache_size: Optional[int] = None,
+    ):
         """
         Initialize the SentenceTransformer model.
 
         Args:
             model_name: The name of the Sentence Transformer model to use.
                         Defaults to "all-MiniLM-L6-v2".
+            cache_dir: Directory for the on-disk embedding cache, or "" to
+                       disable it. If None, uses the EMBEDDING_CACHE_DIR env
+                       variable or "embedding_cache".
+            batch_size: Number of texts encoded per forward pass. If None, uses
+                        the EMBEDDING_BATCH_SIZE env variable or 64.
+            normalize: Whether to scale embeddings to unit length.
+            device: Device to run the model on (e.g. "cpu", "cuda"). If None,
+                    uses the EMBEDDING_DEVICE env variable, or the library's choice.
+            num_workers: Number of worker processes for large batches on CPU.
+                         0 or 1 encodes in this process. If None, uses the
+                         EMBEDDING_WORKERS env variable or 0.
+            query_cache_size: Maximum number of query embeddings kept in memory.
+                              If None, uses the QUERY_EMBEDDING_CACHE_SIZE env
+                              variable or 1024.
+
+        Raises:
+            ValueError: If an integer env variable is not a number.
         """
+        # Settings are read when the model is created, not when this module is
+        # imported, so they follow the environment (e.g. after load_dotenv())
+        if cache_dir is None:
+            cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+        if batch_size is None:
+            batch_size = _env_int("EMBEDDING_BATCH_SIZE", 64)
+        device = device or os.getenv("EMBEDDING_DEVICE") or None
+        if num_workers is None:
+            num_workers = _env_int("EMBEDDING_WORKERS", 0)
+        if query_cache_size is None:
+            query_cache_size = _env_int("QUERY_EMBEDDING_CACHE_SIZE", 1024)
+
         print(f"Initializing SentenceTransformer embeddings with model: {model_name}")
         try:
             # Load the SentenceTransformer model
-            self.model = SentenceTransformer(model_name)
+            self.model = SentenceTransformer(model_name, device=device)
             self.model_name = model_name
+            self.batch_size = batch_size
+            self.normalize = normalize
+            self.num_workers = num_workers
+            self._pool = None
+            # Recent query embeddings, shared by every store using this model
+            self.query_cache = QueryEmbeddingLRU(query_cache_size)
             # Get embedding dimension from the model
             self.embedding_dimension = self.model.get_sentence_embedding_dimension()
             print(f"Successfully initialized SentenceTransformer model '{model_name}'")
             print(f"Embedding dimension: {self.embedding_dimension}")
+            # Previously computed document vectors, so reloads only embed new text.
+            # Normalized and raw vectors are cached separately.
+            self.cache = (
+                EmbeddingCache(
+                    cache_dir,
+                    f"{model_name}-normalized" if normalize else model_name,
+                    self.embedding_dimension,
+                )
+                if cache_dir
+                else None
+            )
         except Exception as e:
             print(f"Error initializing SentenceTransformer model '{model_name}': {e}")
             print("Please ensure the model is installed or accessible.")
             # Optionally, raise the error or handle it gracefully
             raise e
 
+    def _get_pool(self):
+        """Start the multi-process pool on first use, if enabled and on CPU."""
+        if self.num_workers <= 1 or self.model.device.type != "cpu":
+            return None
+        if self._pool is None:
+            print(f"Starting {self.num_workers} embedding worker processes...")
+            self._pool = self.model.start_multi_process_pool(
+                target_devices=["cpu"] * self.num_workers
+            )
+            atexit.register(self.close)
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the multi-process pool, if one was started."""
+        if self._pool is not None:
+            SentenceTransformer.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode cleaned texts into a float32 matrix.
+
+        Texts are sorted by length (longest first) before encoding so that
+        texts of similar length share a batch and little padding is wasted,
+        then the rows are put back in input order.
+
+        Args:
+            texts: Cleaned texts to encode.
+
+        Returns:
+            A (len(texts), embedding_dimension) float32 array.
+        """
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        sorted_texts = [texts[i] for i in order]
+
+        # Worker processes only pay off when each gets at least a full batch
+        pool = (
+            self._get_pool()
+            if len(texts) >= self.batch_size * max(self.num_workers, 2)
+            else None
+        )
+        if pool is not None:
+            vectors = self.model.encode_multi_process(
+                sorted_texts, pool, batch_size=self.batch_size
+            )
+            if self.normalize:
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors = vectors / np.maximum(norms, 1e-12)
+        else:
+            vectors = self.model.encode(
+                sorted_texts,
+                batch_size=self.batch_size,
+                show_progress_bar=len(texts) > self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=self.normalize,
+            )
+
+        embeddings = np.empty((len(texts), self.embedding_dimension), dtype=np.float32)
+        embeddings[order] = vectors
+        return embeddings
+
     def invoke(self, text: str) -> List[float]:
         """
         Embed a single query text using the loaded SentenceTransformer model.
@@ -54,6 +192,50 @@ class SentenceTransformerEmbeddings(Embeddings):
         """
         return self.embed_query(text)
 
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a list of documents as a NumPy array.
+
+        Args:
+            texts: A list of text strings (documents) to embed.
+
+        Returns:
+            A (len(texts), embedding_dimension) float32 array.
+        """
+        # Clean texts before embedding
+        cleaned_texts = [self._clean_text(text) for text in texts]
+
+        if self.cache is None:
+            print(f"Embedding {len(texts)} documents using '{self.model_name}'...")
+            embeddings = self.encode(cleaned_texts)
+            print("Document embedding complete.")
+            return embeddings
+
+        # Only encode texts whose normalized content is not in the cache yet
+        keys = [EmbeddingCache.text_key(text) for text in cleaned_texts]
+        found, missing = self.cache.lookup(keys)
+        embeddings = np.empty((len(texts), self.embedding_dimension), dtype=np.float32)
+        for position, vector in found.items():
+            embeddings[position] = vector
+
+        if missing:
+            unique_keys = list(dict.fromkeys(keys[position] for position in missing))
+            text_by_key = {keys[position]: cleaned_texts[position] for position in missing}
+            print(
+                f"Embedding {len(unique_keys)} of {len(texts)} documents using "
+                f"'{self.model_name}' ({len(found)} cached)..."
+            )
+            new_vectors = self.encode([text_by_key[key] for key in unique_keys])
+            self.cache.add(unique_keys, new_vectors)
+            row_by_key = {key: row for row, key in enumerate(unique_keys)}
+            for position in missing:
+                embeddings[position] = new_vectors[row_by_key[keys[position]]]
+            print("Document embedding complete.")
+        else:
+            print(f"Loaded {len(texts)} document embeddings from cache.")
+
+        return embeddings
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a list of documents using the loaded SentenceTransformer model.
@@ -64,12 +246,30 @@ class SentenceTransformerEmbeddings(Embeddings):
         Returns:
             A list of embedding vectors, where each vector is a list of floats.
         """
-        print(f"Embedding {len(texts)} documents using '{self.model_name}'...")
-        # Clean texts before embedding
-        cleaned_texts = [self._clean_text(text) for text in texts]
-        embeddings = self.model.encode(cleaned_texts, show_progress_bar=True)
-        print("Document embedding complete.")
-        return embeddings.tolist()
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """
+        Generate an embedding for a single query text as a NumPy array.
+
+        Repeated queries are served from an in-memory LRU cache keyed by the
+        cleaned query text.
+
+        Args:
+            text: The query text to embed.
+
+        Returns:
+            A read-only float32 vector of length embedding_dimension.
+        """
+        clean_text = self._clean_text(text)
+        return self.query_cache.get_or_compute(
+            clean_text,
+            lambda: self.model.encode(
+                clean_text,
+                convert_to_numpy=True,
+                normalize_embeddings=self.normalize,
+            ),
+        )
 
     def embed_query(self, text: str) -> List[float]:
         """
@@ -81,11 +281,7 @@ class SentenceTransformerEmbeddings(Embeddings):
         Returns:
             An embedding vector as a list of floats.
         """
-        clean_text = self._clean_text(text)
-        print(f"Embedding query: {clean_text[:50]}...")
-        embedding = self.model.encode(clean_text)
-        print("Query embedding complete.")
-        return embedding.tolist()
+        return self.embed_query_array(text).tolist()
 
     def _clean_text(self, text: str) -> str:
         """
@@ -5,17 +5,24 @@ This module provides functionality for loading and processing documents from var
 including PDFs, web pages, and CSV files. It handles document chunking and metadata management.
 """
 
+import csv
+import hashlib
 import os
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from langchain_core.documents import Document
 from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
     MarkdownTextSplitter,
 )
-from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader, CSVLoader
+from langchain_community.document_loaders import WebBaseLoader, CSVLoader
 from bs4 import BeautifulSoup
-import requests
+from urllib.parse import urlparse
+from processors.pdf_extractor import PDFPageExtractor, file_sha256
+from processors.wikibook_crawler import WikiBookCrawler
+
+# Number of CSV rows handed to chunking and embedding at a time
+CSV_BATCH_SIZE = 256
 
 
 class DocumentProcessor:
@@ -26,17 +33,31 @@ class DocumentProcessor:
     as well as processing them into chunks suitable for embedding and retrieval.
     """
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        http_cache_dir: Optional[str] = "http_cache",
+        pdf_cache_dir: Optional[str] = "pdf_cache",
+    ):
         """
         Initialize the document processor.
 
         Args:
             chunk_size: The size of text chunks for splitting documents. Defaults to 1000.
             chunk_overlap: The overlap between chunks. Defaults to 200.
+            http_cache_dir: Directory for cached WikiBook pages, or None to disable caching.
+            pdf_cache_dir: Directory for extracted PDF page text, or None to disable caching.
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
+        # Shared crawler (HTTP session, per-host limits, conditional GET cache)
+        self.crawler = WikiBookCrawler(cache_dir=http_cache_dir)
+
+        # Parallel PDF page extraction with a per-(file hash, page) text cache
+        self.pdf_extractor = PDFPageExtractor(cache_dir=pdf_cache_dir)
+
         # Initialize text splitters
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
@@ -46,6 +67,38 @@ class DocumentProcessor:
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
         )
 
+    def iter_pdf(self, file_path: str) -> Iterator[Document]:
+        """
+        Extract a PDF file page by page.
+
+        Pages are extracted in parallel worker processes and yielded in order,
+        so large PDFs can be processed without loading every page at once.
+
+        Args:
+            file_path: The path to the PDF file.
+
+        Yields:
+            One Document per page.
+        """
+        pages = self.pdf_extractor.iter_pages(file_path)
+        for page, total_pages, page_label, text, pdf_metadata in pages:
+            yield Document(
+                page_content=text,
+                metadata={
+                    # Document info as PyPDFLoader reports it (producer, title, ...)
+                    **pdf_metadata,
+                    # Add source information
+                    "source": os.path.basename(file_path),
+                    "source_type": "pdf",
+                    "file_path": file_path,
+                    "page": page,
+                    "page_label": page_label,
+                    "total_pages": total_pages,
+                    # Add a unique ID
+                    "doc_id": str(uuid.uuid4()),
+                },
+            )
+
     def load_pdf(self, file_path: str) -> List[Document]:
         """
         Load a PDF file and extract its content.
@@ -56,24 +109,7 @@ class DocumentProcessor:
         Returns:
             A list of Document objects, one per page.
         """
-        # Use PyPDFLoader to load the PDF file
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
-
-        # Add metadata to each document
-        for doc in documents:
-            if not doc.metadata:
-                doc.metadata = {}
-
-            # Add source information
-            doc.metadata["source"] = os.path.basename(file_path)
-            doc.metadata["source_type"] = "pdf"
-            doc.metadata["file_path"] = file_path
-
-            # Add a unique ID
-            doc.metadata["doc_id"] = str(uuid.uuid4())
-
-        return documents
+        return list(self.iter_pdf(file_path))
 
     def load_web_page(self, url: str) -> List[Document]:
         """
@@ -115,101 +151,117 @@ class DocumentProcessor:
             A list of Document objects, one per section.
         """
         try:
-            # Initialize variables
-            documents = []
-            visited_urls = set()
-            urls_to_visit = [url]
-            base_url = "https://en.wikibooks.org"
-            page_count = 0
-            
+            # Links are resolved against the host of the book itself
+            parsed_url = urlparse(url)
+            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
             # Extract the book name from the URL
             book_name = url.split("/")[-1]
-            
-            # Process pages until we've visited all URLs or reached the maximum
-            while urls_to_visit and page_count < max_pages:
-                current_url = urls_to_visit.pop(0)
-                
-                # Skip if we've already visited this URL
-                if current_url in visited_urls:
-                    continue
-                
-                # Mark as visited
-                visited_urls.add(current_url)
-                page_count += 1
-                
-                print(f"  -> Processing WikiBook page {page_count}/{max_pages}: {current_url}")
-                
+
+            def extract_links(page_url: str, html: str) -> List[str]:
+                """Find links to other pages in the same book."""
+                soup = BeautifulSoup(html, "html.parser")
+                content_div = soup.find("div", {"id": "mw-content-text"})
+                if not content_div:
+                    return []
+                links = []
+                for link in content_div.find_all("a", href=True):
+                    href = link["href"]
+                    # Check if it's a relative link within the same book
+                    if href.startswith(f"/wiki/{book_name}/") and ":" not in href:
+                        links.append(base_url + href)
+                    # Check if it's an absolute link within the same book (less common)
+                    elif href.startswith(f"{base_url}/wiki/{book_name}/") and ":" not in href[len(base_url):]:
+                        links.append(href)
+                return links
+
+            def report_error(page_url: str, error: Exception) -> None:
+                print(f"  -> Request error processing {page_url}: {error}")
+
+            # Fetch the main page and, concurrently, the pages it links to
+            pages, stats = self.crawler.crawl(
+                url,
+                max_pages=max_pages,
+                extract_links=extract_links,
+                max_depth=1,
+                on_error=report_error,
+            )
+
+            documents = []
+            for page_number, (current_url, html) in enumerate(pages, start=1):
+                print(f"  -> Processing WikiBook page {page_number}/{max_pages}: {current_url}")
                 try:
-                    # Fetch the page content
-                    response = requests.get(current_url, timeout=30) # Added timeout
-                    response.raise_for_status()
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    
-                    # Extract the title
-                    title_element = soup.find("h1", {"id": "firstHeading"})
-                    title = title_element.text.strip() if title_element else book_name.replace("_", " ") # Use book name as fallback title
-                    
-                    # Find the main content area
-                    content_div = soup.find("div", {"id": "mw-content-text"})
-                    if not content_div:
-                        print(f"  -> Could not find main content div for {current_url}")
-                        continue
-                    
-                    # Remove known non-content elements (e.g., navigation boxes, edit links)
-                    for element_type, attrs in [
-                        ("table", {"class": "navbox"}),
-                        ("div", {"class": "printfooter"}),
-                        ("div", {"id": "catlinks"}),
-                        ("span", {"class": "mw-editsection"}),
-                    ]:
-                        for element in content_div.find_all(element_type, attrs):
-                            element.decompose()
-                    
-                    # Extract all text from the main content area
-                    page_text = content_div.get_text(separator="\n", strip=True)
-                    
-                    if page_text:
-                        # Create one document per page
-                        doc = Document(
-                            page_content=page_text,
-                            metadata={
-                                "source": current_url,
-                                "source_type": "wikibook",
-                                "title": title,
-                                "doc_id": str(uuid.uuid4()),
-                            },
-                        )
+                    doc = self._parse_wikibook_page(current_url, html, book_name)
+                    if doc:
                         documents.append(doc)
-                    else:
-                        print(f"  -> No text content extracted from {current_url}")
-
-                    # Find links to other pages in the same book (only from the main page)
-                    if page_count == 1:
-                        for link in content_div.find_all("a", href=True):
-                            href = link["href"]
-                            # Check if it's a relative link within the same book
-                            if href.startswith(f"/wiki/{book_name}/") and ":" not in href:
-                                full_url = base_url + href
-                                if full_url not in visited_urls and full_url not in urls_to_visit:
-                                    urls_to_visit.append(full_url)
-                            # Check if it's an absolute link within the same book (less common)
-                            elif href.startswith(f"{base_url}/wiki/{book_name}/") and ":" not in href:
-                                if href not in visited_urls and href not in urls_to_visit:
-                                     urls_to_visit.append(href)
-
-                except requests.exceptions.RequestException as req_err:
-                    print(f"  -> Request error processing {current_url}: {req_err}")
                 except Exception as parse_err:
                     print(f"  -> Error parsing content from {current_url}: {parse_err}")
 
-            print(f"  -> Processed {page_count} pages from WikiBook '{book_name}', created {len(documents)} documents.")
+            print(
+                f"  -> Processed {len(pages)} pages from WikiBook '{book_name}', created {len(documents)} documents "
+                f"({stats['fetched']} fetched, {stats['not_modified']} from cache)."
+            )
             return documents
-        
+
         except Exception as e:
             print(f"Error initiating WikiBook processing for {url}: {e}")
             print("Falling back to standard web page loading")
             return self.load_web_page(url)
 
+    def _parse_wikibook_page(
+        self, current_url: str, html: str, book_name: str
+    ) -> Optional[Document]:
+        """
+        Extract the main content of a WikiBook page.
+
+        Args:
+            current_url: The URL of the page.
+            html: The page HTML.
+            book_name: The book name, used as a fallback title.
+
+        Returns:
+            A Document for the page, or None if no content was found.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Extract the title
+        title_element = soup.find("h1", {"id": "firstHeading"})
+        title = title_element.text.strip() if title_element else book_name.replace("_", " ") # Use book name as fallback title
+
+        # Find the main content area
+        content_div = soup.find("div", {"id": "mw-content-text"})
+        if not content_div:
+            print(f"  -> Could not find main content div for {current_url}")
+            return None
+
+        # Remove known non-content elements (e.g., navigation boxes, edit links)
+        for element_type, attrs in [
+            ("table", {"class": "navbox"}),
+            ("div", {"class": "printfooter"}),
+            ("div", {"id": "catlinks"}),
+            ("span", {"class": "mw-editsection"}),
+        ]:
+            for element in content_div.find_all(element_type, attrs):
+                element.decompose()
+
+        # Extract all text from the main content area
+        page_text = content_div.get_text(separator="\n", strip=True)
+
+        if not page_text:
+            print(f"  -> No text content extracted from {current_url}")
+            return None
+
+        # Create one document per page
+        return Document(
+            page_content=page_text,
+            metadata={
+                "source": current_url,
+                "source_type": "wikibook",
+                "title": title,
+                "doc_id": str(uuid.uuid4()),
+            },
+        )
+
     def load_csv(self, file_path: str, content_column: str) -> List[Document]:
         """
         Load data from a CSV file.
@@ -249,12 +301,94 @@ class DocumentProcessor:
 
         return documents
 
-    def process_documents(self, documents: List[Document]) -> List[Document]:
+    def iter_csv(
+        self, file_path: str, content_column: str, batch_size: int = CSV_BATCH_SIZE
+    ) -> Iterator[List[Document]]:
+        """
+        Stream a CSV file in fixed-size batches of row Documents.
+
+        Rows are read with the csv module, so parsing holds one batch of rows at
+        a time rather than the whole file. This only bounds the parse stage:
+        every chunk that gets indexed is still kept in memory by FAISS, the
+        BM25 index and the vector cache. Each row gets a deterministic ID built
+        from the file hash and row number, so ingesting the same file again
+        produces the same IDs.
+
+        Args:
+            file_path: The path to the CSV file.
+            content_column: The name of the column containing the content to use.
+            batch_size: The number of rows per batch.
+
+        Yields:
+            Lists of up to batch_size Document objects, one per non-empty row.
+
+        Raises:
+            ValueError: If the content column is not in the CSV header.
+        """
+        id_prefix = file_sha256(file_path)[:16]
+
+        # Each row still gets its own metadata dict; the file-level strings in
+        # it are created once and shared rather than copied per row
+        source = os.path.basename(file_path)
+        source_type = "csv"
+
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f, delimiter=",")
+            header = next(reader, [])
+            if content_column not in header:
+                raise ValueError(f"Column '{content_column}' not found in {file_path}")
+            content_index = header.index(content_column)
+
+            batch = []
+            for row_number, row in enumerate(reader):
+                if content_index >= len(row) or not row[content_index].strip():
+                    continue
+                batch.append(
+                    Document(
+                        page_content=row[content_index],
+                        metadata={
+                            "source": source,
+                            "source_type": source_type,
+                            "file_path": file_path,
+                            "row": row_number,
+                            "doc_id": f"{id_prefix}-{row_number}",
+                        },
+                    )
+                )
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+
+    @staticmethod
+    def chunk_id(chunk: Document) -> str:
+        """
+        Return a stable ID for a chunk.
+
+        The ID is a hash of the source location (file path or URL), the page
+        or row, and the chunk text, so the same chunk gets the same ID on
+        every run.
+
+        Args:
+            chunk: The chunk to identify.
+
+        Returns:
+            A SHA-1 hex digest.
+        """
+        metadata = chunk.metadata
+        location = metadata.get("file_path") or metadata.get("source", "")
+        position = metadata.get("page", metadata.get("row", ""))
+        key = f"{location}\0{position}\0{chunk.page_content}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def process_documents(self, documents: Iterable[Document]) -> List[Document]:
         """
         Split documents into chunks and ensure metadata is preserved.
 
         Args:
-            documents: A list of Document objects to process.
+            documents: Document objects to process; may be a lazy iterator.
 
         Returns:
             A list of processed Document chunks.
@@ -282,6 +416,12 @@ class DocumentProcessor:
                 if "doc_id" not in chunk.metadata:
                     chunk.metadata["doc_id"] = str(uuid.uuid4())
 
+                # Chunk IDs come from the chunk's location and text, not the
+                # random doc_id, so re-ingesting a source after a restart
+                # matches the chunks already in the persisted stores
+                if "chunk_id" not in chunk.metadata:
+                    chunk.metadata["chunk_id"] = self.chunk_id(chunk)
+
                 processed_docs.append(chunk)
 
         return processed_docs
@@ -0,0 +1,269 @@
+"""
+Parallel PDF Page Extraction
+
+This module extracts the text of PDF pages in a process pool and yields the
+pages in order as they become available, so large books never have to be
+held in memory as a whole. Extracted text is cached on disk per
+(file hash, page), so re-ingesting an unchanged PDF skips extraction.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _page_labels(reader: PdfReader) -> List[str]:
+    try:
+        return list(reader.page_labels)
+    except Exception:
+        return [str(page + 1) for page in range(len(reader.pages))]
+
+
+def _document_metadata(reader: PdfReader) -> Dict[str, Any]:
+    """
+    Return the PDF's document info the way PyPDFLoader reports it.
+
+    Keys lose their leading "/" and are lowercased, PDF dates become ISO 8601,
+    and producer, creator and creationdate default to "PyPDF", "PyPDF" and "".
+    """
+    raw = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+    try:
+        raw.update(reader.metadata or {})
+    except Exception:
+        pass
+
+    metadata: Dict[str, Any] = {}
+    for key, value in raw.items():
+        if type(value) not in (str, int):
+            value = str(value)
+        key = key.lstrip("/").lower()
+        if key in ("creationdate", "moddate"):
+            try:
+                value = datetime.strptime(
+                    value.replace("'", ""), "D:%Y%m%d%H%M%S%z"
+                ).isoformat("T")
+            except ValueError:
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        metadata[key] = value
+    return metadata
+
+
+def extract_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Extract the text of a range of pages.
+
+    Runs in a worker process, so it opens its own reader.
+
+    Args:
+        file_path: The path to the PDF file.
+        start: The first page (0-based) to extract.
+        stop: The page after the last one to extract.
+
+    Returns:
+        A list of (page, text) tuples.
+    """
+    reader = PdfReader(file_path)
+    return [
+        (page, reader.pages[page].extract_text(extraction_mode="plain").strip())
+        for page in range(start, stop)
+    ]
+
+
+class PageTextCache:
+    """
+    On-disk cache of extracted page text, keyed by file hash and page number.
+
+    Each PDF gets a directory named after its content hash, holding one text
+    file per page and a small JSON file with the page count, labels and
+    document metadata.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: The directory used to store extracted pages.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _directory(self, file_hash: str) -> str:
+        return os.path.join(self.cache_dir, file_hash)
+
+    def _page_path(self, file_hash: str, page: int) -> str:
+        return os.path.join(self._directory(file_hash), f"{page:05d}.txt")
+
+    @staticmethod
+    def _write(path: str, text: str) -> None:
+        # Write to a temporary file and rename so readers never see partial data
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(f"{path}.tmp", path)
+
+    def get_info(self, file_hash: str) -> Optional[Dict]:
+        """Return the cached page count, labels and metadata for a file, if known."""
+        try:
+            with open(os.path.join(self._directory(file_hash), "info.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_info(
+        self,
+        file_hash: str,
+        total_pages: int,
+        page_labels: List[str],
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Store the page count, labels and metadata for a file."""
+        os.makedirs(self._directory(file_hash), exist_ok=True)
+        self._write(
+            os.path.join(self._directory(file_hash), "info.json"),
+            json.dumps(
+                {"total_pages": total_pages, "page_labels": page_labels, "metadata": metadata}
+            ),
+        )
+
+    def has_page(self, file_hash: str, page: int) -> bool:
+        """Return whether the text of a page is cached."""
+        return os.path.exists(self._page_path(file_hash, page))
+
+    def get_page(self, file_hash: str, page: int) -> Optional[str]:
+        """Return the cached text of a page, or None if not cached."""
+        try:
+            with open(self._page_path(file_hash, page), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put_page(self, file_hash: str, page: int, text: str) -> None:
+        """Store the extracted text of a page."""
+        os.makedirs(self._directory(file_hash), exist_ok=True)
+        self._write(self._page_path(file_hash, page), text)
+
+
+class PDFPageExtractor:
+    """
+    Extracts PDF pages in parallel and yields them in page order.
+
+    Pages are handed to worker processes in small ranges. Only a bounded
+    number of ranges are in flight at once, so memory use stays flat no matter
+    how long the PDF is. Workers are started with "spawn", since forking a
+    process that has other threads running can deadlock the child.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 8,
+        cache_dir: Optional[str] = "pdf_cache",
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to the CPU count.
+            pages_per_task: Number of pages each worker extracts per task.
+            cache_dir: Directory for extracted page text, or None to disable caching.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.cache = PageTextCache(cache_dir) if cache_dir else None
+
+    def iter_pages(
+        self, file_path: str
+    ) -> Iterator[Tuple[int, int, str, str, Dict[str, Any]]]:
+        """
+        Yield the text of each page of a PDF in order.
+
+        Args:
+            file_path: The path to the PDF file.
+
+        Yields:
+            (page, total_pages, page_label, text, metadata) tuples, where metadata
+            is the document info shared by every page (producer, creator, title, ...).
+        """
+        file_hash = file_sha256(file_path) if self.cache else None
+        info = self.cache.get_info(file_hash) if self.cache else None
+
+        # Entries written before metadata was cached are refreshed
+        if info is None or "metadata" not in info:
+            reader = PdfReader(file_path)
+            total_pages = len(reader.pages)
+            labels = _page_labels(reader)
+            metadata = _document_metadata(reader)
+            if self.cache:
+                self.cache.put_info(file_hash, total_pages, labels, metadata)
+        else:
+            total_pages = info["total_pages"]
+            labels = info["page_labels"]
+            metadata = info["metadata"]
+
+        # Serve cached pages from disk and collect the rest into ranges to extract
+        ranges: List[Tuple[int, int]] = []
+        for page in range(total_pages):
+            if self.cache and self.cache.has_page(file_hash, page):
+                continue
+            if ranges and ranges[-1][1] == page and page - ranges[-1][0] < self.pages_per_task:
+                ranges[-1] = (ranges[-1][0], page + 1)
+            else:
+                ranges.append((page, page + 1))
+
+        if not ranges:
+            for page in range(total_pages):
+                yield (
+                    page, total_pages, labels[page], self.cache.get_page(file_hash, page), metadata
+                )
+            return
+
+        workers = min(self.max_workers, len(ranges))
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            # Submit ranges in order, keeping at most two per worker in flight
+            pending = deque()
+            next_range = 0
+
+            def fill() -> None:
+                nonlocal next_range
+                while next_range < len(ranges) and len(pending) < workers * 2:
+                    start, stop = ranges[next_range]
+                    pending.append(executor.submit(extract_pages, file_path, start, stop))
+                    next_range += 1
+
+            fill()
+            extracted: Dict[int, str] = {}
+            for page in range(total_pages):
+                if page not in extracted:
+                    text = self.cache.get_page(file_hash, page) if self.cache else None
+                    if text is not None:
+                        yield page, total_pages, labels[page], text, metadata
+                        continue
+
+                    # The next uncached page always starts the oldest pending range
+                    for extracted_page, extracted_text in pending.popleft().result():
+                        if self.cache:
+                            self.cache.put_page(file_hash, extracted_page, extracted_text)
+                        extracted[extracted_page] = extracted_text
+                    fill()
+
+                yield page, total_pages, labels[page], extracted.pop(page), metadata
@@ -0,0 +1,257 @@
+"""
+Concurrent WikiBook Crawler
+
+This module provides a small, polite crawler used to fetch the pages of a
+WikiBook. It keeps a FIFO frontier with set-based de-duplication, fetches
+pages on a thread pool through one shared HTTP session with a per-host
+concurrency limit, and revalidates pages against an on-disk HTTP cache using
+conditional GETs (ETag / Last-Modified).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses with their validators.
+
+    Each URL is stored as a body file plus a small JSON file holding its
+    ETag and Last-Modified headers, so later fetches can be revalidated with
+    a conditional GET instead of downloading the page again.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: The directory used to store cached responses.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Return the cached entry for a URL.
+
+        Args:
+            url: The URL to look up.
+
+        Returns:
+            A dict with "text", "etag" and "last_modified", or None if not cached.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                meta["text"] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, response: requests.Response) -> None:
+        """
+        Store a successful response and its validators.
+
+        Args:
+            url: The requested URL.
+            response: The response to cache.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # Without validators the entry could never be revalidated
+            return
+
+        meta_path, body_path = self._paths(url)
+        # Write to temporary files and rename so readers never see partial data
+        with open(f"{body_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(response.text)
+        with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": last_modified}, f)
+        os.replace(f"{body_path}.tmp", body_path)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+
+class WikiBookCrawler:
+    """
+    Breadth-first crawler with bounded, per-host concurrency.
+
+    Pages are returned in the order they were discovered, regardless of the
+    order in which their fetches complete.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host_limit: int = 2,
+        min_delay: float = 0.0,
+        timeout: int = 30,
+        cache_dir: Optional[str] = "http_cache",
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            max_workers: Total number of concurrent fetches.
+            per_host_limit: Maximum concurrent fetches to any single host.
+            min_delay: Minimum seconds between request starts to the same host.
+            timeout: Timeout in seconds for each request.
+            cache_dir: Directory for the HTTP cache, or None to disable it.
+            session: An optional requests.Session to share; one is created if None.
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.min_delay = min_delay
+        self.timeout = timeout
+        self.cache = HTTPCache(cache_dir) if cache_dir else None
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            user_agent = os.getenv("USER_AGENT")
+            if user_agent:
+                session.headers["User-Agent"] = user_agent
+        self.session = session
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_last_request: Dict[str, float] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _wait_for_turn(self, host: str) -> None:
+        """Space out request starts to the same host by at least min_delay."""
+        if self.min_delay <= 0:
+            return
+        with self._host_lock:
+            now = time.monotonic()
+            start_at = max(now, self._host_last_request.get(host, 0.0) + self.min_delay)
+            self._host_last_request[host] = start_at
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def fetch(self, url: str) -> str:
+        """
+        Fetch a page, revalidating against the HTTP cache when possible.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The page body as text.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        return self._fetch(url)[0]
+
+    def _fetch(self, url: str) -> Tuple[str, str]:
+        """Fetch a page and return (text, "fetched" or "not_modified")."""
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        host = urlparse(url).netloc
+        with self._host_slot(host):
+            self._wait_for_turn(host)
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached:
+            return cached["text"], "not_modified"
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.put(url, response)
+        return response.text, "fetched"
+
+    def crawl(
+        self,
+        start_url: str,
+        max_pages: int = 10,
+        extract_links: Optional[Callable[[str, str], List[str]]] = None,
+        max_depth: int = 1,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        """
+        Crawl pages breadth-first starting from a URL.
+
+        Args:
+            start_url: The first page to fetch.
+            max_pages: Maximum number of pages to fetch.
+            extract_links: Called with (url, html) and returns links to follow.
+            max_depth: Links are only followed from pages shallower than this.
+            on_error: Called with (url, exception) when a fetch fails.
+
+        Returns:
+            A tuple of (list of (url, html) in discovery order, fetch counts with
+            "fetched", "not_modified" and "errors" for this crawl).
+        """
+        # Local to this call, so concurrent crawls on one crawler don't mix counts
+        stats = {"fetched": 0, "not_modified": 0, "errors": 0}
+
+        frontier = deque([(start_url, 0)])
+        seen = {start_url}
+        order: Dict[str, int] = {}
+        pages: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+            while frontier or in_flight:
+                # Keep the pool busy without scheduling more than max_pages fetches
+                while frontier and len(order) < max_pages:
+                    url, depth = frontier.popleft()
+                    order[url] = len(order)
+                    in_flight[executor.submit(self._fetch, url)] = (url, depth)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = in_flight.pop(future)
+                    try:
+                        html, outcome = future.result()
+                    except Exception as e:
+                        stats["errors"] += 1
+                        if on_error:
+                            on_error(url, e)
+                        continue
+
+                    stats[outcome] += 1
+                    pages[url] = html
+                    if extract_links and depth < max_depth:
+                        for link in extract_links(url, html):
+                            if link not in seen:
+                                seen.add(link)
+                                frontier.append((link, depth + 1))
+
+        return sorted(pages.items(), key=lambda item: order[item[0]]), stats
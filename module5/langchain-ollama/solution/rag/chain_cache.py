@@ -0,0 +1,114 @@
+"""
+Retrieval Chain Cache for the RAG System
+
+This module keeps one retriever and one RetrievalQA chain per vector store so
+that answering a question only costs retrieval plus generation, rather than
+rebuilding the prompt, retriever and chain on every query.
+"""
+
+from typing import Any, Dict, Tuple
+from langchain_core.prompts import PromptTemplate
+from langchain.chains import RetrievalQA
+
+# Template with instructions for answering from the retrieved context
+QA_PROMPT_TEMPLATE = """
+        You are a helpful assistant that provides accurate information based on the given context.
+
+        Answer the question based ONLY on the following context. Be specific and detailed in your response.
+        If the context doesn't contain enough information to answer the question fully, extract whatever
+        relevant information you can find and acknowledge the limitations of the available information.
+
+        Context:
+        {context}
+
+        Question: {question}
+
+        Your answer should be comprehensive and directly address the question using information from the context.
+        """
+
+QA_PROMPT = PromptTemplate(
+    template=QA_PROMPT_TEMPLATE, input_variables=["context", "question"]
+)
+
+
+class QAChainCache:
+    """
+    Caches retrievers and RetrievalQA chains per vector store.
+
+    Entries remember the store object they were built from, so they are
+    rebuilt automatically when the manager replaces a store (e.g. on reload).
+    """
+
+    def __init__(self, llm, vector_store_manager, prompt: PromptTemplate = QA_PROMPT):
+        """
+        Initialize the chain cache.
+
+        Args:
+            llm: The language model used by the chains.
+            vector_store_manager: The VectorStoreManager providing retrievers.
+            prompt: The prompt used by the "stuff" documents chain.
+        """
+        self.llm = llm
+        self.vector_store_manager = vector_store_manager
+        self.prompt = prompt
+        self._entries: Dict[str, Tuple[Any, Any, RetrievalQA]] = {}
+
+    def _current_store(self, store_name: str):
+        """Return the store object currently held by the manager."""
+        return getattr(self.vector_store_manager, f"{store_name}_store", None)
+
+    def _get_entry(self, store_name: str) -> Tuple[Any, Any, RetrievalQA]:
+        """Return (store, retriever, chain) for a store, building it if stale."""
+        store_name = store_name.lower()
+        store = self._current_store(store_name)
+        entry = self._entries.get(store_name)
+
+        if entry is None or entry[0] is not store:
+            retriever = self.vector_store_manager.get_retriever(store_name)
+            chain = RetrievalQA.from_chain_type(
+                llm=self.llm,
+                chain_type="stuff",
+                retriever=retriever,
+                return_source_documents=True,
+                chain_type_kwargs={"prompt": self.prompt},
+            )
+            entry = (store, retriever, chain)
+            self._entries[store_name] = entry
+
+        return entry
+
+    def get_retriever(self, store_name: str):
+        """
+        Get the cached retriever for a vector store.
+
+        Args:
+            store_name: The name of the vector store ("faiss" or "chroma").
+
+        Returns:
+            A retriever for the specified vector store.
+        """
+        return self._get_entry(store_name)[1]
+
+    def get_chain(self, store_name: str) -> RetrievalQA:
+        """
+        Get the cached RetrievalQA chain for a vector store.
+
+        Args:
+            store_name: The name of the vector store ("faiss" or "chroma").
+
+        Returns:
+            A RetrievalQA chain that returns its source documents.
+        """
+        return self._get_entry(store_name)[2]
+
+    def invalidate(self, store_name: str = None) -> None:
+        """
+        Drop cached chains so they are rebuilt on next use.
+
+        Args:
+            store_name: The store to invalidate, or None for all stores.
+        """
+        if store_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(store_name.lower(), None)
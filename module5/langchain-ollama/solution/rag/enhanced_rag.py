@@ -9,9 +9,10 @@ This module provides a Retrieval-Augmented Generation (RAG) system that:
 5. Provides responses with source attribution and streaming
 """
 
+import threading
 import time
 import warnings
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 import os
 
 # Suppress deprecation warnings for a cleaner console UI
@@ -27,14 +28,17 @@ os.environ["USER_AGENT"] = (
 
 from langchain_core.documents import Document
 from langchain_core.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import RetrievalQA
 
 # Import our custom modules
 from processors.document_processor import DocumentProcessor
 from managers.vector_store_manager import VectorStoreManager
 from models.embeddings_fixed import SentenceTransformerEmbeddings
 from models.ollama_integration_fixed import OllamaLLM
+from rag.chain_cache import QAChainCache
+from rag.ingest_pipeline import IngestPipeline, IngestReport, IngestSource, SourceResult
+
+# Number of PDF pages handed to splitting and embedding at a time
+PDF_PAGES_PER_BATCH = 16
 
 
 class EnhancedRAG:
@@ -90,8 +94,14 @@ class EnhancedRAG:
             embedding_model=self.embedding_model, persist_directory=persist_directory
         )
 
-        # Track documents added to the system
+        # Retrievers and QA chains, built lazily once per vector store
+        self.qa_chains = QAChainCache(self.llm, self.vector_store_manager)
+
+        # Track documents added to the system. The ingest pipeline writes these
+        # from its index thread, so reads and writes go through the lock.
         self.documents = []
+        self._chunk_ids = set()
+        self._index_lock = threading.Lock()
 
         print("\n" + "=" * 60)
         print("ENHANCED RAG SYSTEM INITIALIZED")
@@ -103,26 +113,152 @@ class EnhancedRAG:
         print("* Special commands: /reload faiss, /reload chroma, /reload vectordb")
         print("=" * 60 + "\n")
 
-    def add_documents(self, documents: List[Document]) -> None:
+    def add_documents(self, documents: Iterable[Document]) -> None:
         """
         Add documents to the knowledge base.
 
         Args:
-            documents: A list of Document objects to add.
+            documents: Document objects to add; may be a lazy iterator.
+        """
+        processed_docs = self._split_new_chunks(documents)
+        if processed_docs:
+            self._index_chunks(processed_docs)
+
+    def _split_new_chunks(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        Split documents into chunks, dropping chunks that are already indexed.
+
+        Args:
+            documents: Document objects to split.
+
+        Returns:
+            The chunks that still need to be indexed.
         """
         # Process documents (split into chunks, preserve metadata)
         processed_docs = self.doc_processor.process_documents(documents)
 
-        # Add to tracking list
-        self.documents.extend(processed_docs)
+        # Skip chunks that are already indexed (e.g. re-ingesting the same CSV).
+        # IDs are only recorded by _index_chunks, once the stores hold the
+        # chunks, so a batch that fails to index can be ingested again.
+        new_docs = []
+        batch_ids = set()
+        with self._index_lock:
+            for doc in processed_docs:
+                chunk_id = doc.metadata.get("chunk_id")
+                if chunk_id not in self._chunk_ids and chunk_id not in batch_ids:
+                    batch_ids.add(chunk_id)
+                    new_docs.append(doc)
+        return new_docs
+
+    def _index_chunks(self, processed_docs: List[Document], vectors=None) -> int:
+        """
+        Add chunks to the vector stores.
+
+        Args:
+            processed_docs: The chunks to index.
+            vectors: Precomputed vectors for the chunks, or None to embed them here.
+
+        Returns:
+            The number of chunks added, excluding any already indexed.
+        """
+        with self._index_lock:
+            # Another batch may have indexed some of these chunks since they were split
+            keep = [
+                i
+                for i, doc in enumerate(processed_docs)
+                if doc.metadata.get("chunk_id") not in self._chunk_ids
+            ]
+            if len(keep) < len(processed_docs):
+                processed_docs = [processed_docs[i] for i in keep]
+                if vectors is not None:
+                    vectors = [vectors[i] for i in keep]
+            if not processed_docs:
+                return 0
+
+            # Add to vector stores
+            if not self.vector_store_manager.faiss_store:
+                # First time adding documents, initialize vector stores
+                self.vector_store_manager.initialize_stores(processed_docs, vectors)
+            else:
+                # Add to existing vector stores
+                self.vector_store_manager.add_documents(processed_docs, vectors)
+
+            # Add to tracking list only once the stores have the chunks
+            self.documents.extend(processed_docs)
+            self._chunk_ids.update(doc.metadata.get("chunk_id") for doc in processed_docs)
+            return len(processed_docs)
+
+    def _load_source(self, source: IngestSource) -> Iterator[List[Document]]:
+        """
+        Load a source as batches of Documents.
+
+        Args:
+            source: The source to load.
 
-        # Add to vector stores
-        if not self.vector_store_manager.faiss_store:
-            # First time adding documents, initialize vector stores
-            self.vector_store_manager.initialize_stores(processed_docs)
+        Yields:
+            Lists of Document objects.
+
+        Raises:
+            ValueError: If the source kind is unknown or a CSV has no content column.
+        """
+        kind = source.kind.lower()
+        if kind == "pdf":
+            # Pages stream in as they are extracted
+            batch = []
+            for page in self.doc_processor.iter_pdf(source.location):
+                batch.append(page)
+                if len(batch) >= PDF_PAGES_PER_BATCH:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        elif kind == "csv":
+            if not source.content_column:
+                raise ValueError(f"CSV source {source.location} needs a content_column")
+            yield from self.doc_processor.iter_csv(source.location, source.content_column)
+        elif kind == "web":
+            yield self.doc_processor.load_web_page(source.location)
+        elif kind == "wikibook":
+            yield self.doc_processor.load_wikibook(source.location)
         else:
-            # Add to existing vector stores
-            self.vector_store_manager.add_documents(processed_docs)
+            raise ValueError(f"Unknown source kind: {source.kind}")
+
+    def _ingest_pipeline(self, queue_size: int = 4) -> IngestPipeline:
+        """Create a load -> split -> embed -> index pipeline for this system."""
+        return IngestPipeline(
+            load=self._load_source,
+            split=self._split_new_chunks,
+            embed=self.vector_store_manager.embed_documents,
+            index=self._index_chunks,
+            queue_size=queue_size,
+        )
+
+    def ingest(self, sources: List[IngestSource], queue_size: int = 4) -> IngestReport:
+        """
+        Add many sources to the knowledge base as one pipelined job.
+
+        Loading, splitting, embedding and indexing run as concurrent stages
+        joined by bounded queues, so the next source loads while the previous
+        one is being embedded.
+
+        Args:
+            sources: The sources to add.
+            queue_size: Maximum number of batches waiting between two stages.
+
+        Returns:
+            An IngestReport with per-source results and per-stage statistics.
+        """
+        print(f"\nIngesting {len(sources)} sources...")
+        report = self._ingest_pipeline(queue_size).run(sources)
+        print(report.format())
+        return report
+
+    def _ingest_one(self, source: IngestSource) -> SourceResult:
+        """Ingest a single source, raising its load error if it failed."""
+        result = self._ingest_pipeline().run([source]).sources[0]
+        if result.error is not None:
+            raise result.error
+        return result
 
     def add_pdf(self, file_path: str) -> str:
         """
@@ -134,9 +270,8 @@ class EnhancedRAG:
         Returns:
             A message indicating the result.
         """
-        documents = self.doc_processor.load_pdf(file_path)
-        self.add_documents(documents)
-        return f"Added PDF: {file_path} with {len(documents)} pages"
+        result = self._ingest_one(IngestSource("pdf", file_path))
+        return f"Added PDF: {file_path} with {result.documents} pages"
 
     def add_web_page(self, url: str) -> str:
         """
@@ -148,8 +283,7 @@ class EnhancedRAG:
         Returns:
             A message indicating the result.
         """
-        documents = self.doc_processor.load_web_page(url)
-        self.add_documents(documents)
+        self._ingest_one(IngestSource("web", url))
         return f"Added web page: {url}"
 
     def add_wikibook(self, url: str) -> str:
@@ -162,9 +296,8 @@ class EnhancedRAG:
         Returns:
             A message indicating the result.
         """
-        documents = self.doc_processor.load_wikibook(url)
-        self.add_documents(documents)
-        return f"Added WikiBook: {url} with {len(documents)} sections"
+        result = self._ingest_one(IngestSource("wikibook", url))
+        return f"Added WikiBook: {url} with {result.documents} sections"
 
     def add_csv(self, file_path: str, content_column: str) -> str:
         """
@@ -177,9 +310,9 @@ class EnhancedRAG:
         Returns:
             A message indicating the result.
         """
-        documents = self.doc_processor.load_csv(file_path, content_column)
-        self.add_documents(documents)
-        return f"Added CSV: {file_path} with {len(documents)} entries"
+        # Rows stream in fixed-size batches so large exports are never fully loaded
+        result = self._ingest_one(IngestSource("csv", file_path, content_column))
+        return f"Added CSV: {file_path} with {result.documents} entries"
 
     def query(
         self,
@@ -192,7 +325,7 @@ class EnhancedRAG:
 
         Args:
             question: The question to ask.
-            vector_store: Which vector store to use ("faiss", "chroma", or "both").
+            vector_store: Which vector store to use ("faiss", "chroma", "hybrid", or "both").
             streaming: Whether to stream the response. If None, uses the instance default.
 
         Returns:
@@ -208,39 +341,12 @@ class EnhancedRAG:
         if vector_store.lower() == "both":
             return self.compare_vector_stores(question)
 
-        # Get the appropriate retriever
-        retriever = self.vector_store_manager.get_retriever(vector_store)
-
-        # Create a template with instructions for source attribution
-        prompt_template = """
-        You are a helpful assistant that provides accurate information based on the given context.
-        
-        Answer the question based ONLY on the following context. Be specific and detailed in your response.
-        If the context doesn't contain enough information to answer the question fully, extract whatever
-        relevant information you can find and acknowledge the limitations of the available information.
-        
-        Context:
-        {context}
-        
-        Question: {question}
-        
-        Your answer should be comprehensive and directly address the question using information from the context.
-        """
-
-        # Create a proper PromptTemplate
-        prompt = PromptTemplate(
-            template=prompt_template, input_variables=["context", "question"]
-        )
+        # Make buffered Chroma writes visible before retrieving
+        self.vector_store_manager.flush()
 
-        # Create a RetrievalQA chain - use the existing LLM instance
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,  # Use the existing LLM instance
-            chain_type="stuff",
-            retriever=retriever,
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": prompt},
-            callbacks=self.callbacks if use_streaming else None, 
-        )
+        # Retriever, prompt and chain are built once per vector store
+        retriever = self.qa_chains.get_retriever(vector_store)
+        prompt = self.qa_chains.prompt
 
         if use_streaming:
             # --- Manual Streaming Logic ---
@@ -277,6 +383,7 @@ class EnhancedRAG:
         else:
             # --- Original Non-Streaming Logic ---
             # Execute the chain
+            qa_chain = self.qa_chains.get_chain(vector_store)
             chain_response = qa_chain({"query": question})
             
             # Format response with sources for non-streaming case
@@ -409,21 +516,27 @@ Available commands:
         start_time = time.time()
         print("\nReloading all vector stores...")
 
-        # Reset both stores
-        print("  ↳ Resetting FAISS store...")
-        self.vector_store_manager.reset_faiss()
-        print("  ↳ Resetting Chroma store...")
-        self.vector_store_manager.reset_chroma()
-
-        # Reinitialize with existing documents
-        if self.documents:
-            print(f"  ↳ Re-indexing {len(self.documents)} documents...")
-            # This single call re-initializes both stores
-            self.vector_store_manager.initialize_stores(self.documents) 
+        # Hold the index lock so a running ingest cannot write to the old stores
+        with self._index_lock:
+            # Reset both stores
+            print("  ↳ Resetting FAISS store...")
+            self.vector_store_manager.reset_faiss()
+            print("  ↳ Resetting Chroma store...")
+            self.vector_store_manager.reset_chroma()
+            self.qa_chains.invalidate()
+
+            # Reinitialize with existing documents
+            documents = list(self.documents)
+            if documents:
+                print(f"  ↳ Re-indexing {len(documents)} documents...")
+                # This single call re-initializes both stores
+                self.vector_store_manager.initialize_stores(documents)
+
+        if documents:
             elapsed_time = time.time() - start_time
             return f"""
 ✅ ALL VECTOR STORES RELOAD COMPLETE
-• Documents indexed: {len(self.documents)}
+• Documents indexed: {len(documents)}
 • Processing time: {elapsed_time:.2f} seconds
 • Status: All vector stores ready for queries
 """
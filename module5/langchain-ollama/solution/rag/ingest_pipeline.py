@@ -0,0 +1,263 @@
+"""
+Staged Ingest Pipeline for the RAG System
+
+This module runs document ingestion as four stages connected by bounded
+queues: load -> split -> embed -> index. Each stage runs in its own thread, so
+loading the next source overlaps splitting and embedding the previous one,
+while the bounded queues keep memory use flat when one stage is slower than
+the others. Per-stage throughput and queue depth are recorded for reporting.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Marks the end of the stream on a stage's input queue
+_DONE = object()
+
+
+@dataclass
+class IngestSource:
+    """A source to ingest: a PDF, web page, WikiBook or CSV file."""
+
+    kind: str  # "pdf", "web", "wikibook" or "csv"
+    location: str  # File path or URL
+    content_column: Optional[str] = None  # Required for "csv"
+
+
+@dataclass
+class SourceResult:
+    """Outcome of loading one source."""
+
+    source: IngestSource
+    documents: int = 0
+    error: Optional[Exception] = None
+
+
+@dataclass
+class StageStats:
+    """Throughput and input-queue depth for one pipeline stage."""
+
+    name: str
+    batches: int = 0
+    items: int = 0
+    busy_time: float = 0.0
+    queue_depth_total: int = 0
+    queue_depth_max: int = 0
+
+    def record(self, items: int, busy_time: float, queue_depth: int) -> None:
+        """Record one processed batch."""
+        self.batches += 1
+        self.items += items
+        self.busy_time += busy_time
+        self.queue_depth_total += queue_depth
+        self.queue_depth_max = max(self.queue_depth_max, queue_depth)
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of busy time."""
+        return self.items / self.busy_time if self.busy_time else 0.0
+
+    @property
+    def average_queue_depth(self) -> float:
+        """Mean number of batches waiting when this stage picked up work."""
+        return self.queue_depth_total / self.batches if self.batches else 0.0
+
+
+@dataclass
+class IngestReport:
+    """Results of an ingest job."""
+
+    sources: List[SourceResult]
+    stages: Dict[str, StageStats]
+    chunks_indexed: int = 0
+    elapsed_time: float = 0.0
+
+    def format(self) -> str:
+        """Return a human-readable summary."""
+        loaded = sum(1 for result in self.sources if result.error is None)
+        lines = [
+            f"• Sources loaded: {loaded}/{len(self.sources)}",
+            f"• Chunks indexed: {self.chunks_indexed}",
+            f"• Elapsed time: {self.elapsed_time:.2f} seconds",
+        ]
+        for stats in self.stages.values():
+            lines.append(
+                f"• {stats.name:<6} {stats.items:>7} items  {stats.throughput:>9.1f} items/s  "
+                f"queue avg {stats.average_queue_depth:.1f} / max {stats.queue_depth_max}"
+            )
+        for result in self.sources:
+            if result.error is not None:
+                lines.append(f"• Failed {result.source.kind}: {result.source.location} ({result.error})")
+        return "\n".join(lines)
+
+
+class IngestPipeline:
+    """
+    Runs load -> split -> embed -> index over many sources concurrently.
+
+    The stage functions are supplied by the caller. Splitting, embedding and
+    indexing each run in a single thread, so the index function never runs
+    concurrently with itself.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[IngestSource], Iterator[List[Document]]],
+        split: Callable[[List[Document]], List[Document]],
+        embed: Callable[[List[Document]], List[Any]],
+        index: Callable[[List[Document], List[Any]], int],
+        queue_size: int = 4,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            load: Yields batches of Documents for a source.
+            split: Turns a batch of Documents into chunks to index.
+            embed: Returns one vector per chunk.
+            index: Adds chunks and their vectors to the stores, returning how
+                many it added (chunks already indexed are skipped).
+            queue_size: Maximum number of batches waiting between two stages.
+        """
+        self.load = load
+        self.split = split
+        self.embed = embed
+        self.index = index
+        self.queue_size = queue_size
+
+    def run(self, sources: Iterable[IngestSource]) -> IngestReport:
+        """
+        Ingest all sources and wait for the pipeline to drain.
+
+        A source that fails to load is recorded in the report and skipped.
+        A failure in any later stage stops the pipeline and is re-raised.
+
+        Args:
+            sources: The sources to ingest.
+
+        Returns:
+            An IngestReport with per-source and per-stage statistics.
+        """
+        start_time = time.perf_counter()
+        results = [SourceResult(source) for source in sources]
+        stages = {name: StageStats(name) for name in ("load", "split", "embed", "index")}
+        split_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        embed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        index_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        failure: List[BaseException] = []
+        stop = threading.Event()
+        chunks_indexed = 0
+
+        def put(target: "queue.Queue", item) -> bool:
+            """Put an item, giving up if the pipeline is stopping."""
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: "queue.Queue"):
+            """Get the next item, or _DONE if the pipeline is stopping."""
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def run_stage(
+            stats: StageStats,
+            source: "queue.Queue",
+            target: Optional["queue.Queue"],
+            work: Callable[[Any], Tuple[Any, int]],
+        ) -> None:
+            try:
+                while True:
+                    depth = source.qsize()
+                    item = get(source)
+                    if item is _DONE:
+                        break
+                    started = time.perf_counter()
+                    output, count = work(item)
+                    stats.record(count, time.perf_counter() - started, depth)
+                    if target is not None and output is not None and not put(target, output):
+                        break
+            except BaseException as e:
+                failure.append(e)
+                stop.set()
+            finally:
+                if target is not None:
+                    put(target, _DONE)
+
+        def split_work(documents: List[Document]):
+            chunks = self.split(documents)
+            return (chunks or None), len(documents)
+
+        def embed_work(chunks: List[Document]):
+            return (chunks, self.embed(chunks)), len(chunks)
+
+        def index_work(item):
+            nonlocal chunks_indexed
+            chunks, vectors = item
+            # Chunks another batch already indexed are not counted again
+            added = self.index(chunks, vectors)
+            chunks_indexed += added
+            return None, added
+
+        threads = [
+            threading.Thread(
+                target=run_stage, args=(stages["split"], split_queue, embed_queue, split_work)
+            ),
+            threading.Thread(
+                target=run_stage, args=(stages["embed"], embed_queue, index_queue, embed_work)
+            ),
+            threading.Thread(
+                target=run_stage, args=(stages["index"], index_queue, None, index_work)
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        # The load stage runs in this thread and feeds the others
+        try:
+            for result in results:
+                if stop.is_set():
+                    break
+                batches = None
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        if batches is None:
+                            batches = iter(self.load(result.source))
+                        batch = next(batches, None)
+                    except Exception as e:
+                        print(f"Error loading {result.source.kind} {result.source.location}: {e}")
+                        result.error = e
+                        break
+                    if batch is None:
+                        break
+                    stages["load"].record(len(batch), time.perf_counter() - started, 0)
+                    result.documents += len(batch)
+                    if batch and not put(split_queue, batch):
+                        break
+        finally:
+            put(split_queue, _DONE)
+            for thread in threads:
+                thread.join()
+
+        if failure:
+            raise failure[0]
+
+        return IngestReport(
+            sources=results,
+            stages=stages,
+            chunks_indexed=chunks_indexed,
+            elapsed_time=time.perf_counter() - start_time,
+        )
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from models.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCacheRecovery(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.dimension = 4
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _open(self):
+        return EmbeddingCache(self.cache_dir, "test-model", self.dimension)
+
+    def _vector(self, value):
+        return np.full((1, self.dimension), value, dtype=np.float32)
+
+    def test_torn_index_line_is_removed_before_next_add(self):
+        """A partial hash left by a crash must not merge with the next append"""
+        cache = self._open()
+        first = EmbeddingCache.text_key("first")
+        cache.add([first], self._vector(1.0))
+
+        # Simulate a crash after the vector was written but mid-way through
+        # its index line
+        torn = EmbeddingCache.text_key("torn")
+        with open(cache.vectors_path, "ab") as f:
+            f.write(self._vector(9.0).tobytes())
+        with open(cache.index_path, "a", encoding="ascii") as f:
+            f.write(torn[:20])
+
+        cache = self._open()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(os.path.getsize(cache.index_path), 65)
+
+        second = EmbeddingCache.text_key("second")
+        cache.add([second], self._vector(2.0))
+
+        cache = self._open()
+        found, missing = cache.lookup([first, second, torn])
+        self.assertEqual(missing, [2])
+        np.testing.assert_array_equal(found[0], self._vector(1.0)[0])
+        np.testing.assert_array_equal(found[1], self._vector(2.0)[0])
+
+    def test_unindexed_vectors_are_truncated(self):
+        """Vectors written without an index entry are dropped on reopen"""
+        cache = self._open()
+        key = EmbeddingCache.text_key("only")
+        cache.add([key], self._vector(1.0))
+        with open(cache.vectors_path, "ab") as f:
+            f.write(self._vector(5.0).tobytes())
+
+        cache = self._open()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(
+            os.path.getsize(cache.vectors_path), self.dimension * 4
+        )
+
+        other = EmbeddingCache.text_key("other")
+        cache.add([other], self._vector(3.0))
+        found, missing = self._open().lookup([key, other])
+        self.assertEqual(missing, [])
+        np.testing.assert_array_equal(found[1], self._vector(3.0)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from langchain_core.documents import Document
+
+from rag.ingest_pipeline import IngestPipeline, IngestSource
+
+
+def load(source):
+    """Two sources that share one page, as mirrored or overlapping sources do"""
+    yield [
+        Document(page_content="shared page", metadata={"chunk_id": "shared"}),
+        Document(page_content=source.location, metadata={"chunk_id": source.location}),
+    ]
+
+
+class TestIngestPipelineCounts(unittest.TestCase):
+    def test_chunks_skipped_by_the_index_are_not_counted(self):
+        indexed = set()
+
+        def index(chunks, vectors):
+            # Like EnhancedRAG._index_chunks: drop chunks an earlier batch indexed
+            new = [doc for doc in chunks if doc.metadata["chunk_id"] not in indexed]
+            indexed.update(doc.metadata["chunk_id"] for doc in new)
+            return len(new)
+
+        pipeline = IngestPipeline(
+            load=load,
+            split=lambda documents: documents,
+            embed=lambda chunks: [[0.0] for _ in chunks],
+            index=index,
+        )
+        report = pipeline.run([IngestSource("web", "a"), IngestSource("web", "b")])
+
+        self.assertEqual(report.chunks_indexed, 3)
+        self.assertEqual(report.stages["index"].items, 3)
+        self.assertEqual(report.stages["embed"].items, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
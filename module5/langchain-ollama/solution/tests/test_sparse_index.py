@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+from langchain_core.documents import Document
+
+from managers.hybrid_retriever import reciprocal_rank_fusion
+from managers.sparse_index import BM25Index
+from processors.document_processor import DocumentProcessor
+
+
+def load_page():
+    """A freshly loaded page, with a new random doc_id like the real loaders"""
+    return Document(
+        page_content="Form W-2 reports wages. " * 20 + "Policy HR-104.3 covers leave. " * 20,
+        metadata={
+            "source": "https://example.com/handbook",
+            "source_type": "web",
+            "doc_id": str(uuid.uuid4()),
+        },
+    )
+
+
+class TestSparseIndexAcrossRestarts(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "bm25_index.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _ingest(self):
+        """Process the page as a new run would and add it to the reopened index"""
+        processor = DocumentProcessor(chunk_size=200, chunk_overlap=0)
+        chunks = processor.process_documents([load_page()])
+        index = BM25Index(self.path)
+        index.add_documents(chunks)
+        return chunks, index
+
+    def test_reingesting_a_source_does_not_duplicate_the_index(self):
+        first_chunks, first_index = self._ingest()
+        second_chunks, second_index = self._ingest()
+
+        self.assertEqual(
+            [chunk.metadata["chunk_id"] for chunk in first_chunks],
+            [chunk.metadata["chunk_id"] for chunk in second_chunks],
+        )
+        self.assertEqual(len(second_index), len(first_index))
+        self.assertEqual(len(BM25Index(self.path)), len(first_chunks))
+
+    def test_persisted_hits_fuse_with_dense_results(self):
+        self._ingest()
+        dense, index = self._ingest()
+
+        sparse = [doc for doc, _ in index.search("hr-104.3", k=len(dense))]
+        fused = reciprocal_rank_fusion([dense, sparse], k=len(dense) * 2)
+
+        self.assertEqual(len(fused), len(dense))
+
+
+if __name__ == "__main__":
+    unittest.main()
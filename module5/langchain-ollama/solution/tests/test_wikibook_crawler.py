@@ -0,0 +1,140 @@
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+from processors.wikibook_crawler import WikiBookCrawler
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+# path -> (body, validators sent with it)
+PAGES = {
+    "/book": (
+        '<a href="/book/etag">etag</a> <a href="/book/dated">dated</a>',
+        {"ETag": '"book-v1"'},
+    ),
+    "/book/etag": ("page with an etag", {"ETag": '"etag-v1"'}),
+    "/book/dated": ("page with a date", {"Last-Modified": LAST_MODIFIED}),
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves PAGES and answers conditional GETs with 304 when validators match"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+
+        body, validators = PAGES[self.path]
+        etag = validators.get("ETag")
+        last_modified = validators.get("Last-Modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in validators.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def extract_links(url, html):
+    return [urljoin(url, href) for href in re.findall(r'href="([^"]+)"', html)]
+
+
+class TestWikiBookCrawlerHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def _crawl(self):
+        crawler = WikiBookCrawler(max_workers=4, cache_dir=self.cache_dir)
+        return crawler.crawl(
+            f"{self.base_url}/book", max_pages=10, extract_links=extract_links
+        )
+
+    def _headers_for(self, path):
+        return [headers for p, headers in self.server.requests if p == path]
+
+    def test_first_crawl_fetches_every_page(self):
+        pages, stats = self._crawl()
+
+        self.assertEqual(
+            [url for url, _ in pages],
+            [f"{self.base_url}{path}" for path in ("/book", "/book/etag", "/book/dated")],
+        )
+        self.assertEqual(stats, {"fetched": 3, "not_modified": 0, "errors": 0})
+
+    def test_recrawl_revalidates_with_etag_and_last_modified(self):
+        first_pages, _ = self._crawl()
+        self.server.requests.clear()
+
+        pages, stats = self._crawl()
+
+        self.assertEqual(pages, first_pages)
+        self.assertEqual(stats, {"fetched": 0, "not_modified": 3, "errors": 0})
+        etag_headers = self._headers_for("/book/etag")[0]
+        self.assertEqual(etag_headers.get("If-None-Match"), '"etag-v1"')
+        dated_headers = self._headers_for("/book/dated")[0]
+        self.assertEqual(dated_headers.get("If-Modified-Since"), LAST_MODIFIED)
+        self.assertNotIn("If-None-Match", dated_headers)
+
+    def test_errors_are_counted_and_fetch_revalidates(self):
+        crawler = WikiBookCrawler(cache_dir=self.cache_dir)
+        _, stats = crawler.crawl(f"{self.base_url}/missing")
+        self.assertEqual(stats, {"fetched": 0, "not_modified": 0, "errors": 1})
+
+        crawler.fetch(f"{self.base_url}/book")
+        self.server.requests.clear()
+        self.assertEqual(crawler.fetch(f"{self.base_url}/book"), PAGES["/book"][0])
+        self.assertEqual(
+            self._headers_for("/book")[0].get("If-None-Match"), '"book-v1"'
+        )
+
+    def test_concurrent_crawls_keep_separate_stats(self):
+        crawler = WikiBookCrawler(max_workers=4, cache_dir=self.cache_dir)
+        crawler.fetch(f"{self.base_url}/book/etag")
+
+        results = {}
+
+        def run(name, path):
+            results[name] = crawler.crawl(f"{self.base_url}{path}")[1]
+
+        threads = [
+            threading.Thread(target=run, args=("cached", "/book/etag")),
+            threading.Thread(target=run, args=("fresh", "/book/dated")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results["cached"], {"fetched": 0, "not_modified": 1, "errors": 0})
+        self.assertEqual(results["fresh"], {"fetched": 1, "not_modified": 0, "errors": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
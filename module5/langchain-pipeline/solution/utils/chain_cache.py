@@ -0,0 +1,75 @@
+"""
+Retrieval Chain Cache Module
+
+This module keeps one retriever and one RetrievalQA chain per vector store so
+that answering a question only costs retrieval plus generation, rather than
+rebuilding the prompt, retriever and chain on every query.
+"""
+
+from typing import Any, Dict, Tuple
+from langchain_core.prompts import PromptTemplate
+from langchain.chains import RetrievalQA
+
+# Template with instructions for answering from the retrieved context
+QA_PROMPT_TEMPLATE = """
+        Answer the question based only on the following context. If you don't know the answer,
+        just say that you don't know, don't try to make up an answer.
+
+        Context:
+        {context}
+
+        Question: {question}
+        """
+
+QA_PROMPT = PromptTemplate(
+    template=QA_PROMPT_TEMPLATE, input_variables=["context", "question"]
+)
+
+
+class QAChainCache:
+    """Caches retrievers and RetrievalQA chains per vector store.
+
+    Entries remember the store object they were built from, so they are
+    rebuilt automatically when a store is replaced (e.g. on reload).
+    """
+
+    def __init__(self, llm, vector_store_manager, prompt: PromptTemplate = QA_PROMPT):
+        self.llm = llm
+        self.vector_store_manager = vector_store_manager
+        self.prompt = prompt
+        self._entries: Dict[str, Tuple[Any, Any, RetrievalQA]] = {}
+
+    def _get_entry(self, store_name: str) -> Tuple[Any, Any, RetrievalQA]:
+        """Return (store, retriever, chain) for a store, building it if stale."""
+        store_name = store_name.lower()
+        store = getattr(self.vector_store_manager, f"{store_name}_store", None)
+        entry = self._entries.get(store_name)
+
+        if entry is None or entry[0] is not store:
+            retriever = self.vector_store_manager.get_retriever(store_name)
+            chain = RetrievalQA.from_chain_type(
+                llm=self.llm,
+                chain_type="stuff",
+                retriever=retriever,
+                return_source_documents=True,
+                chain_type_kwargs={"prompt": self.prompt},
+            )
+            entry = (store, retriever, chain)
+            self._entries[store_name] = entry
+
+        return entry
+
+    def get_retriever(self, store_name: str = "faiss"):
+        """Get the cached retriever for a vector store."""
+        return self._get_entry(store_name)[1]
+
+    def get_chain(self, store_name: str = "faiss") -> RetrievalQA:
+        """Get the cached RetrievalQA chain for a vector store."""
+        return self._get_entry(store_name)[2]
+
+    def invalidate(self, store_name: str = None):
+        """Drop cached chains for one store, or all stores, so they are rebuilt."""
+        if store_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(store_name.lower(), None)
@@ -10,11 +10,18 @@ and get retrievers for use in the RAG pipeline.
 """
 
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import numpy as np
 from typing import List, Dict, Any
 from langchain_core.documents import Document
 from langchain_community.vectorstores import FAISS, Chroma
 from utils.langchain_integration import EnhancedHuggingFaceEmbeddings
 
+# Chroma's SQLite backend limits how many records a single add() may contain
+CHROMA_MAX_BATCH_SIZE = 5000
+
 
 class VectorStoreManager:
     """Manages multiple vector stores for document retrieval."""
@@ -25,18 +32,81 @@ class VectorStoreManager:
         self.chroma_store = None
         self.persist_directory = "chroma_db"
 
+        # Vectors computed so far, keyed by a hash of the chunk text, so each
+        # chunk is embedded once for both stores and for the reload commands
+        self._vector_cache: Dict[str, np.ndarray] = {}
+
+    def embed_documents(self, documents: List[Document]) -> List[np.ndarray]:
+        """Embed documents once, reusing vectors already computed for the same text."""
+        keys = [
+            hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+            for doc in documents
+        ]
+
+        # Only texts that have never been embedded go through the model
+        missing: Dict[str, str] = {}
+        for key, doc in zip(keys, documents):
+            if key not in self._vector_cache and key not in missing:
+                missing[key] = doc.page_content
+
+        if missing:
+            vectors = self.embedding_model.embed_documents(list(missing.values()))
+            for key, vector in zip(missing.keys(), vectors):
+                self._vector_cache[key] = np.asarray(vector, dtype=np.float32)
+
+        return [self._vector_cache[key] for key in keys]
+
+    def build_faiss(self, documents: List[Document], vectors=None) -> FAISS:
+        """Create a FAISS store, embedding only documents without cached vectors."""
+        if vectors is None:
+            vectors = self.embed_documents(documents)
+        return FAISS.from_embeddings(
+            text_embeddings=[
+                (doc.page_content, vector) for doc, vector in zip(documents, vectors)
+            ],
+            embedding=self.embedding_model,
+            metadatas=[doc.metadata for doc in documents],
+        )
+
+    def build_chroma(self, documents: List[Document], vectors=None) -> Chroma:
+        """Create a persistent Chroma store, embedding only documents without cached vectors."""
+        if vectors is None:
+            vectors = self.embed_documents(documents)
+        chroma_store = Chroma(
+            embedding_function=self.embedding_model,
+            persist_directory=self.persist_directory,
+        )
+        self._add_to_chroma(chroma_store, documents, vectors)
+        return chroma_store
+
+    @staticmethod
+    def _add_to_chroma(chroma_store: Chroma, documents: List[Document], vectors):
+        """Add documents with precomputed vectors to a Chroma store."""
+        for start in range(0, len(documents), CHROMA_MAX_BATCH_SIZE):
+            batch = documents[start : start + CHROMA_MAX_BATCH_SIZE]
+            chroma_store._collection.add(
+                ids=[str(uuid.uuid4()) for _ in batch],
+                embeddings=[
+                    vector.tolist()
+                    for vector in vectors[start : start + CHROMA_MAX_BATCH_SIZE]
+                ],
+                metadatas=[doc.metadata for doc in batch],
+                documents=[doc.page_content for doc in batch],
+            )
+
     def initialize_stores(self, documents: List[Document]):
         """Initialize both vector stores with the same documents."""
         if not documents:
             raise ValueError("Cannot initialize vector stores with empty document list")
 
+        # Embed once and share the vectors between both stores
+        vectors = self.embed_documents(documents)
+
         # Initialize FAISS (in-memory)
-        self.faiss_store = FAISS.from_documents(documents, self.embedding_model)
+        self.faiss_store = self.build_faiss(documents, vectors)
 
         # Initialize Chroma (persistent)
-        self.chroma_store = Chroma.from_documents(
-            documents, self.embedding_model, persist_directory=self.persist_directory
-        )
+        self.chroma_store = self.build_chroma(documents, vectors)
         self.chroma_store.persist()
 
         print(f"Initialized vector stores with {len(documents)} documents")
@@ -46,44 +116,50 @@ class VectorStoreManager:
         if not documents:
             return
 
+        # Embed once and share the vectors between both stores
+        vectors = self.embed_documents(documents)
+
         # Add to FAISS
         if self.faiss_store is not None:
-            self.faiss_store.add_documents(documents)
+            self.faiss_store.add_embeddings(
+                [(doc.page_content, vector) for doc, vector in zip(documents, vectors)],
+                metadatas=[doc.metadata for doc in documents],
+            )
         else:
-            self.faiss_store = FAISS.from_documents(documents, self.embedding_model)
+            self.faiss_store = self.build_faiss(documents, vectors)
 
         # Add to Chroma
         if self.chroma_store is not None:
-            self.chroma_store.add_documents(documents)
+            self._add_to_chroma(self.chroma_store, documents, vectors)
         else:
-            self.chroma_store = Chroma.from_documents(
-                documents,
-                self.embedding_model,
-                persist_directory=self.persist_directory,
-            )
+            self.chroma_store = self.build_chroma(documents, vectors)
             self.chroma_store.persist()
 
     def query_stores(self, query: str, top_k: int = 4) -> Dict[str, Any]:
-        """Query both vector stores and return results."""
-        results = {}
-
-        # Query FAISS
-        if self.faiss_store is not None:
-            faiss_start = time.time()
-            results["faiss"] = {
-                "documents": self.faiss_store.similarity_search(query, k=top_k),
-                "retrieval_time": time.time() - faiss_start,
+        """Query both vector stores concurrently and return results."""
+        stores = {
+            name: store
+            for name, store in (("faiss", self.faiss_store), ("chroma", self.chroma_store))
+            if store is not None
+        }
+
+        def search(store):
+            start = time.perf_counter()
+            documents = store.similarity_search(query, k=top_k)
+            return {
+                "documents": documents,
+                "retrieval_time": time.perf_counter() - start,
             }
 
-        # Query Chroma
-        if self.chroma_store is not None:
-            chroma_start = time.time()
-            results["chroma"] = {
-                "documents": self.chroma_store.similarity_search(query, k=top_k),
-                "retrieval_time": time.time() - chroma_start,
-            }
+        if len(stores) < 2:
+            return {name: search(store) for name, store in stores.items()}
 
-        return results
+        # Each search records its own timing while the other runs alongside it
+        with ThreadPoolExecutor(max_workers=len(stores)) as executor:
+            futures = {
+                name: executor.submit(search, store) for name, store in stores.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
 
     def get_retriever(self, store_name: str = "faiss"):
         """Get a retriever for the specified vector store."""
@@ -1,6 +1,7 @@
 # Main entry point for the High Availability RAG Simulation
 
 # Configure logging (needs to be done before other imports that might log)
+import argparse
 import logging
 
 logging.basicConfig(
@@ -8,8 +9,83 @@ logging.basicConfig(
 )
 
 # Import the test runner function from the new package structure
-from ha_rag_simulation.test_runner import test_high_availability_rag
+from ha_rag_simulation.core.metrics import MetricsRegistry, start_metrics_server
+from ha_rag_simulation.test_runner import compare_throughput, test_high_availability_rag
+from ha_rag_simulation.load_test import (
+    LoadTestConfig,
+    default_schedule,
+    load_schedule,
+    run_load_test,
+)
 
 if __name__ == "__main__":
-    # Execute the interactive test simulation
-    test_high_availability_rag()
+    parser = argparse.ArgumentParser(description="High Availability RAG Simulation")
+    parser.add_argument(
+        "--throughput",
+        type=int,
+        metavar="N",
+        help="Compare thread-pool and asyncio throughput over N queries instead of the interactive test",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running",
+    )
+    load_test = parser.add_argument_group("load test")
+    load_test.add_argument(
+        "--load-test", action="store_true", help="Run an open-loop load test instead"
+    )
+    load_test.add_argument("--rate", type=float, default=50.0, help="Mean arrivals per second")
+    load_test.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals")
+    load_test.add_argument("--concurrency", type=int, default=500, help="Maximum queries in flight")
+    load_test.add_argument(
+        "--schedule",
+        help="JSON file of failure events (default: a generator outage and an embedder brownout)",
+    )
+    load_test.add_argument("--failure-threshold", type=float, help="Override the breakers' failure_threshold")
+    load_test.add_argument("--min-samples", type=int, help="Override the breakers' min_samples")
+    load_test.add_argument("--recovery-timeout", type=float, help="Override the breakers' recovery_timeout")
+    load_test.add_argument(
+        "--primary-failure-rate",
+        type=float,
+        default=0.0,
+        help="Failure rate of the primary tiers outside schedule events (default: 0, healthy)",
+    )
+    load_test.add_argument("--seed", type=int, help="Seed for the arrival process")
+    load_test.add_argument(
+        "--output", help="Write <OUTPUT>.json and <OUTPUT>_timeline.csv with the results"
+    )
+    args = parser.parse_args()
+
+    # The system created below reports into the registry being served
+    metrics_registry = None
+    if args.metrics_port is not None:
+        metrics_registry = MetricsRegistry()
+        start_metrics_server(args.metrics_port, registry=metrics_registry)
+
+    if args.load_test:
+        run_load_test(
+            LoadTestConfig(
+                rate=args.rate,
+                duration=args.duration,
+                concurrency=args.concurrency,
+                schedule=(
+                    load_schedule(args.schedule)
+                    if args.schedule
+                    else default_schedule(args.duration)
+                ),
+                failure_threshold=args.failure_threshold,
+                min_samples=args.min_samples,
+                recovery_timeout=args.recovery_timeout,
+                primary_failure_rate=args.primary_failure_rate,
+                seed=args.seed,
+            ),
+            output_prefix=args.output,
+            metrics_registry=metrics_registry,
+        )
+    elif args.throughput:
+        compare_throughput(num_queries=args.throughput, metrics_registry=metrics_registry)
+    else:
+        # Execute the interactive test simulation
+        test_high_availability_rag(metrics_registry=metrics_registry)
@@ -1,91 +1,224 @@
 import time
+import asyncio
+import hashlib
 import logging
 import random
+import threading
 import numpy as np
-from typing import List
-from ..core.interfaces import Embedder  # Go up one level to core
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from ..core.interfaces import Embedder, AsyncEmbedder  # Go up one level to core
+from .vector_index import normalize
 
 logger = logging.getLogger("HighAvailabilityRAG.Components.Embedders")
 
 
-class PrimaryEmbedder(Embedder):
+class PrimaryEmbedder(Embedder, AsyncEmbedder):
     """Primary embedding service (simulated)"""
 
     def __init__(self, failure_rate: float = 0.1):
         self.failure_rate = failure_rate
+        self.latency_factor = 1.0  # Raised to simulate a brownout
 
-    def embed(self, text: str) -> List[float]:
+    def _check_failure(self):
         # Simulate potential failures
         if random.random() < self.failure_rate:
             logger.warning("Primary embedder failed")
             raise Exception("Primary embedding service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time
-        time.sleep(random.uniform(0.05, 0.2))
+        return random.uniform(0.05, 0.2) * self.latency_factor
 
+    def _build_embedding(self, text: str) -> List[float]:
         # Generate realistic embedding (normalized vector)
-        embedding = np.random.normal(0, 1, self.dimension).tolist()
-        norm = sum(x**2 for x in embedding) ** 0.5
-        embedding = [x / norm for x in embedding]
+        embedding = normalize(np.random.standard_normal(self.dimension)).tolist()
 
         logger.info(f"Primary embedder: Generated embedding for '{text[:20]}...'")
         return embedding
 
+    def embed(self, text: str) -> List[float]:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._build_embedding(text)
+
+    async def embed_async(self, text: str) -> List[float]:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._build_embedding(text)
+
     @property
     def dimension(self) -> int:
         return 1536
 
 
-class SecondaryEmbedder(Embedder):
+class SecondaryEmbedder(Embedder, AsyncEmbedder):
     """Secondary embedding service (simulated with lower quality but higher reliability)"""
 
     def __init__(self, failure_rate: float = 0.05):
         self.failure_rate = failure_rate
+        self.latency_factor = 1.0  # Raised to simulate a brownout
 
-    def embed(self, text: str) -> List[float]:
+    def _check_failure(self):
         # Simulate potential failures (but fewer than primary)
         if random.random() < self.failure_rate:
             logger.warning("Secondary embedder failed")
             raise Exception("Secondary embedding service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time (slightly slower)
-        time.sleep(random.uniform(0.1, 0.3))
+        return random.uniform(0.1, 0.3) * self.latency_factor
 
+    def _build_embedding(self, text: str) -> List[float]:
         # Generate realistic embedding (normalized vector) with lower dimension
-        embedding = np.random.normal(0, 1, self.dimension).tolist()
-        norm = sum(x**2 for x in embedding) ** 0.5
-        embedding = [x / norm for x in embedding]
+        embedding = normalize(np.random.standard_normal(self.dimension)).tolist()
 
         logger.info(f"Secondary embedder: Generated embedding for '{text[:20]}...'")
         return embedding
 
+    def embed(self, text: str) -> List[float]:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._build_embedding(text)
+
+    async def embed_async(self, text: str) -> List[float]:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._build_embedding(text)
+
     @property
     def dimension(self) -> int:
         return 768  # Lower dimension than primary
 
 
-class CachedEmbedder(Embedder):
-    """Cached embedding service that returns pre-computed embeddings"""
-
-    def __init__(self):
-        # Simple simulation of a cache with random embeddings
-        self.cache = {}
+class CachedEmbedder(Embedder, AsyncEmbedder):
+    """Bounded LRU embedding cache, keyed on a hash of the full text"""
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        dimension: int = 384,
+    ):
+        # With an embedder this is a read-through cache in front of it; without
+        # one it is the last fallback and makes up stable vectors on a miss
+        self.embedder = embedder
+        self.max_bytes = max_bytes
+        self._dimension = embedder.dimension if embedder is not None else dimension
+        self.cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self.cache.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def _store(self, key: bytes, vector: np.ndarray):
+        entry_bytes = vector.nbytes + len(key)
+        if entry_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.cache:
+                return
+            self.cache[key] = vector
+            self.current_bytes += entry_bytes
+            # Evict least recently used entries until back under the memory cap
+            while self.current_bytes > self.max_bytes:
+                old_key, old_vector = self.cache.popitem(last=False)
+                self.current_bytes -= old_vector.nbytes + len(old_key)
+                self.evictions += 1
+
+    def _synthesize(self, key: bytes) -> np.ndarray:
+        # Generate a stable "cached" embedding from the text hash
+        rng = np.random.default_rng(int.from_bytes(key[:8], "little"))
+        return normalize(rng.standard_normal(self._dimension, dtype=np.float32))
+
+    def _to_vector(self, embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        return vector
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for a text, or None on a miss"""
+        vector = self._lookup(self._key(text))
+        return None if vector is None else vector.tolist()
+
+    def put(self, text: str, embedding: List[float]):
+        """Cache an embedding computed elsewhere"""
+        self._store(self._key(text), self._to_vector(embedding))
 
     def embed(self, text: str) -> List[float]:
-        # Use first 10 chars as cache key (simplified)
-        key = text[:10]
-
-        # Return from cache or create new cached embedding
-        if key not in self.cache:
-            # Generate a stable "cached" embedding
-            random.seed(hash(key))
-            embedding = [random.uniform(-1, 1) for _ in range(self.dimension)]
-            norm = sum(x**2 for x in embedding) ** 0.5
-            self.cache[key] = [x / norm for x in embedding]
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            if self.embedder is not None:
+                vector = self._to_vector(self.embedder.embed(text))
+            else:
+                vector = self._to_vector(self._synthesize(key))
+            self._store(key, vector)
 
         logger.info(f"Cached embedder: Retrieved embedding for '{text[:20]}...'")
-        return self.cache[key]
+        return vector.tolist()
+
+    async def embed_async(self, text: str) -> List[float]:
+        if not isinstance(self.embedder, AsyncEmbedder):
+            # In-memory lookup (or a blocking wrapped embedder), nothing to wait on
+            return self.embed(text)
+
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = self._to_vector(await self.embedder.embed_async(text))
+            self._store(key, vector)
+        return vector.tolist()
+
+    def warm(self, path: str, max_workers: int = 8) -> int:
+        """Pre-load embeddings for a file of popular queries, one per line"""
+        with open(path, "r", encoding="utf-8") as f:
+            queries = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+        def warm_one(query: str) -> bool:
+            try:
+                self.embed(query)
+                return True
+            except Exception as e:
+                logger.warning(f"Could not pre-warm '{query[:20]}...': {str(e)}")
+                return False
+
+        # The wrapped embedder may be a slow remote service, so warm in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            warmed = sum(executor.map(warm_one, queries))
+        logger.info(f"Cached embedder: Pre-warmed {warmed} of {len(queries)} queries")
+        return warmed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.cache),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
 
     @property
     def dimension(self) -> int:
-        return 384  # Even lower dimension for cached embeddings
+        return self._dimension
@@ -1,29 +1,33 @@
 import time
+import asyncio
 import logging
 import random
 from typing import List, Dict, Any, Optional
-from ..core.interfaces import Generator  # Go up one level to core
+from ..core.interfaces import Generator, AsyncGenerator  # Go up one level to core
 
 logger = logging.getLogger("HighAvailabilityRAG.Components.Generators")
 
 
-class PrimaryGenerator(Generator):
+class PrimaryGenerator(Generator, AsyncGenerator):
     """Primary LLM generator with high quality"""
 
     def __init__(self, failure_rate: float = 0.1):
         self.failure_rate = failure_rate
+        self.latency_factor = 1.0  # Raised to simulate a brownout
 
-    def generate(
-        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
-    ) -> str:
+    def _check_failure(self):
         # Simulate potential failures
         if random.random() < self.failure_rate:
             logger.warning("Primary generator failed")
             raise Exception("Primary generation service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time
-        time.sleep(random.uniform(0.2, 0.5))
+        return random.uniform(0.2, 0.5) * self.latency_factor
 
+    def _compose(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
         # Use context if available
         if context and len(context) > 0:
             context_str = ", ".join([doc["text"] for doc in context])
@@ -37,24 +41,41 @@ class PrimaryGenerator(Generator):
         logger.info(f"Primary generator: Generated response for '{prompt[:20]}...'")
         return response
 
+    def generate(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._compose(prompt, context)
+
+    async def generate_async(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._compose(prompt, context)
 
-class FallbackGenerator(Generator):
+
+class FallbackGenerator(Generator, AsyncGenerator):
     """Smaller LLM generator with reduced quality"""
 
     def __init__(self, failure_rate: float = 0.05):
         self.failure_rate = failure_rate
+        self.latency_factor = 1.0  # Raised to simulate a brownout
 
-    def generate(
-        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
-    ) -> str:
+    def _check_failure(self):
         # Simulate potential failures
         if random.random() < self.failure_rate:
             logger.warning("Fallback generator failed")
             raise Exception("Fallback generation service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time (faster than primary)
-        time.sleep(random.uniform(0.1, 0.25))
+        return random.uniform(0.1, 0.25) * self.latency_factor
 
+    def _compose(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
         # Generate a simpler response
         if context and len(context) > 0:
             response = f"Based on {len(context)} documents, here's a basic answer to '{prompt[:30]}...'"
@@ -64,8 +85,22 @@ class FallbackGenerator(Generator):
         logger.info(f"Fallback generator: Generated response for '{prompt[:20]}...'")
         return response
 
+    def generate(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._compose(prompt, context)
 
-class TemplateGenerator(Generator):
+    async def generate_async(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._compose(prompt, context)
+
+
+class TemplateGenerator(Generator, AsyncGenerator):
     """Template-based generator as last resort"""
 
     def generate(
@@ -78,3 +113,8 @@ class TemplateGenerator(Generator):
             f"Your query was about '{prompt[:50]}...'. Please try again later or "
             "rephrase your question to something more general."
         )
+
+    async def generate_async(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        return self.generate(prompt, context)
@@ -1,80 +1,101 @@
 import time
+import asyncio
 import logging
 import random
-from typing import List, Dict, Any
-from ..core.interfaces import Retriever  # Go up one level to core
+from typing import List, Dict, Any, Optional
+from ..core.interfaces import Retriever, AsyncRetriever  # Go up one level to core
+from .vector_index import VectorIndex
 
 logger = logging.getLogger("HighAvailabilityRAG.Components.Retrievers")
 
 
-class PrimaryRetriever(Retriever):
+class PrimaryRetriever(Retriever, AsyncRetriever):
     """Primary retrieval service with high-quality results"""
 
-    def __init__(self, failure_rate: float = 0.1):
+    def __init__(self, failure_rate: float = 0.1, index: Optional[VectorIndex] = None):
         self.failure_rate = failure_rate
-        # Simulate a document store
-        self.documents = [
-            {
-                "id": i,
-                "text": f"Document {i} with detailed information",
-                "metadata": {"quality": "high"},
-            }
-            for i in range(20)
-        ]
+        self.latency_factor = 1.0  # Raised to simulate a brownout
+        # Simulate a document store unless a real index is supplied
+        self.index = index or VectorIndex.simulated(20, 1536, quality="high")
 
-    def retrieve(
-        self, query_embedding: List[float], top_k: int = 3
-    ) -> List[Dict[str, Any]]:
+    def _check_failure(self):
         # Simulate potential failures
         if random.random() < self.failure_rate:
             logger.warning("Primary retriever failed")
             raise Exception("Primary retrieval service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time
-        time.sleep(random.uniform(0.1, 0.3))
+        return random.uniform(0.1, 0.3) * self.latency_factor
 
-        # Return random documents (in real system would use embedding similarity)
-        results = random.sample(self.documents, min(top_k, len(self.documents)))
+    def _select(
+        self, query_embedding: List[float], top_k: int
+    ) -> List[Dict[str, Any]]:
+        # Full-size index, most similar documents first
+        results = self.index.search(query_embedding, top_k)
 
         logger.info(f"Primary retriever: Retrieved {len(results)} documents")
         return results
 
+    def retrieve(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._select(query_embedding, top_k)
 
-class ReducedRetriever(Retriever):
+    async def retrieve_async(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._select(query_embedding, top_k)
+
+
+class ReducedRetriever(Retriever, AsyncRetriever):
     """Reduced retrieval service with fewer results"""
 
-    def __init__(self, failure_rate: float = 0.05):
+    def __init__(self, failure_rate: float = 0.05, index: Optional[VectorIndex] = None):
         self.failure_rate = failure_rate
-        # Simulate a document store
-        self.documents = [
-            {
-                "id": i,
-                "text": f"Document {i} with basic information",
-                "metadata": {"quality": "medium"},
-            }
-            for i in range(10)
-        ]
+        self.latency_factor = 1.0  # Raised to simulate a brownout
+        # Typically a smaller or quantized copy of the primary index
+        self.index = index or VectorIndex.simulated(10, 1536, quality="medium")
 
-    def retrieve(
-        self, query_embedding: List[float], top_k: int = 3
-    ) -> List[Dict[str, Any]]:
+    def _check_failure(self):
         # Simulate potential failures
         if random.random() < self.failure_rate:
             logger.warning("Reduced retriever failed")
             raise Exception("Reduced retrieval service unavailable")
 
+    def _latency(self) -> float:
         # Simulate processing time
-        time.sleep(random.uniform(0.05, 0.15))
+        return random.uniform(0.05, 0.15) * self.latency_factor
 
+    def _select(
+        self, query_embedding: List[float], top_k: int
+    ) -> List[Dict[str, Any]]:
         # Return fewer documents
-        max_docs = min(top_k, min(2, len(self.documents)))
-        results = random.sample(self.documents, max_docs)
+        results = self.index.search(query_embedding, min(top_k, 2))
 
         logger.info(f"Reduced retriever: Retrieved {len(results)} documents")
         return results
 
+    def retrieve(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        self._check_failure()
+        time.sleep(self._latency())
+        return self._select(query_embedding, top_k)
+
+    async def retrieve_async(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        self._check_failure()
+        await asyncio.sleep(self._latency())
+        return self._select(query_embedding, top_k)
+
 
-class NoRetriever(Retriever):
+class NoRetriever(Retriever, AsyncRetriever):
     """Fallback that returns no documents"""
 
     def retrieve(
@@ -82,3 +103,8 @@ class NoRetriever(Retriever):
     ) -> List[Dict[str, Any]]:
         logger.info("NoRetriever: No documents retrieved")
         return []
+
+    async def retrieve_async(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        return self.retrieve(query_embedding, top_k)
@@ -0,0 +1,219 @@
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence
+
+logger = logging.getLogger("HighAvailabilityRAG.Components.VectorIndex")
+
+# Rows of a quantized index converted to float32 at a time during search
+QUANTIZED_BLOCK_ROWS = 4096
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize a vector or each row of a matrix (float32, zero rows left as zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+class VectorIndex:
+    """In-memory cosine-similarity index over a matrix of normalized document embeddings"""
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        documents: List[Dict[str, Any]],
+        scales: Optional[np.ndarray] = None,
+    ):
+        if len(embeddings) != len(documents):
+            raise ValueError("Need exactly one embedding per document")
+        # float32 rows, or int8 rows with a per-row scale when quantized
+        self.embeddings = embeddings
+        self.documents = documents
+        self.scales = scales
+
+    @classmethod
+    def from_embeddings(
+        cls, embeddings: Sequence[Sequence[float]], documents: List[Dict[str, Any]]
+    ) -> "VectorIndex":
+        """Build an index, normalizing the embeddings"""
+        return cls(normalize(embeddings), documents)
+
+    @classmethod
+    def simulated(
+        cls,
+        num_documents: int,
+        dimension: int,
+        quality: str = "high",
+        seed: int = 0,
+    ) -> "VectorIndex":
+        """Build an index of random documents (stands in for a real corpus)"""
+        rng = np.random.default_rng(seed)
+        embeddings = rng.standard_normal((num_documents, dimension), dtype=np.float32)
+        documents = [
+            {
+                "id": i,
+                "text": f"Document {i} with detailed information",
+                "metadata": {"quality": quality},
+            }
+            for i in range(num_documents)
+        ]
+        return cls.from_embeddings(embeddings, documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def dimension(self) -> int:
+        return self.embeddings.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        scale_bytes = self.scales.nbytes if self.scales is not None else 0
+        return self.embeddings.nbytes + scale_bytes
+
+    def subset(self, max_documents: int) -> "VectorIndex":
+        """Copy of the first max_documents rows; a cheaper index for degraded tiers"""
+        return VectorIndex(
+            self.embeddings[:max_documents].copy(),
+            self.documents[:max_documents],
+            None if self.scales is None else self.scales[:max_documents].copy(),
+        )
+
+    def quantize(self) -> "VectorIndex":
+        """int8 copy with a per-row scale, using a quarter of the memory"""
+        if self.scales is not None:
+            return self
+        scales = np.abs(self.embeddings).max(axis=1) / 127.0
+        scales = np.maximum(scales, np.finfo(np.float32).tiny).astype(np.float32)
+        codes = np.round(self.embeddings / scales[:, None]).astype(np.int8)
+        return VectorIndex(codes, self.documents, scales)
+
+    def _quantized_scores(self, query: np.ndarray) -> np.ndarray:
+        """Score int8 rows a block at a time, so the float32 copy numpy makes stays small"""
+        scores = np.empty(len(self.embeddings), dtype=np.float32)
+        for start in range(0, len(self.embeddings), QUANTIZED_BLOCK_ROWS):
+            stop = start + QUANTIZED_BLOCK_ROWS
+            scores[start:stop] = self.embeddings[start:stop] @ query
+        scores *= self.scales
+        return scores
+
+    def search(self, query_embedding: Sequence[float], top_k: int = 3) -> List[Dict[str, Any]]:
+        """Return the top_k most similar documents, best first, with their scores"""
+        query = normalize(query_embedding)
+        if query.shape != (self.dimension,):
+            raise ValueError(
+                f"Query has dimension {query.shape[-1]}, index expects {self.dimension}"
+            )
+        if not self.documents or top_k <= 0:
+            return []
+
+        if self.scales is None:
+            scores = self.embeddings @ query
+        else:
+            scores = self._quantized_scores(query)
+
+        # argpartition finds the top_k in linear time; only those get sorted
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [{**self.documents[i], "score": float(scores[i])} for i in top]
+
+
+def fit_projection(
+    source: np.ndarray, target: np.ndarray, ridge: float = 1e-3
+) -> np.ndarray:
+    """Ridge least-squares linear map from one embedding space to another, fitted on paired rows"""
+    source = np.asarray(source, dtype=np.float32)
+    target = np.asarray(target, dtype=np.float32)
+    # Normal equations: a d x d solve instead of a full SVD of the corpus
+    gram = source.T @ source + ridge * np.eye(source.shape[1], dtype=np.float32)
+    return np.linalg.solve(gram, source.T @ target).astype(np.float32)
+
+
+class MultiDimensionIndex:
+    """Routes each query to an index matching its dimension, so any embedder tier can be searched"""
+
+    MODES = ("per_dimension", "projection")
+
+    def __init__(
+        self,
+        indexes: Dict[int, VectorIndex],
+        projections: Optional[Dict[int, np.ndarray]] = None,
+        shared_dimension: Optional[int] = None,
+    ):
+        # indexes: one per embedding space; projections: query maps into the
+        # shared_dimension index for spaces without their own index
+        self.indexes = indexes
+        self.projections = projections or {}
+        self.shared_dimension = shared_dimension
+
+    @classmethod
+    def build(
+        cls,
+        base: VectorIndex,
+        dimensions: Sequence[int],
+        mode: str = "per_dimension",
+        seed: int = 0,
+    ) -> "MultiDimensionIndex":
+        """
+        Prepare the base index for queries from embedders of other dimensions (done offline).
+
+        In "per_dimension" mode the corpus gets its own matrix in every
+        embedding space. In "projection" mode only the base matrix is kept,
+        plus a fitted map per dimension that projects queries into it.
+        """
+        if mode not in cls.MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {cls.MODES}")
+
+        rng = np.random.default_rng(seed)
+        indexes = {base.dimension: base}
+        projections = {}
+        for dimension in sorted(set(dimensions) - {base.dimension}):
+            # Stand-in for embedding the corpus with the other model: a fixed
+            # random linear map of the base space
+            model_map = rng.standard_normal((base.dimension, dimension), dtype=np.float32)
+            document_vectors = normalize(base.embeddings @ model_map)
+            if mode == "per_dimension":
+                indexes[dimension] = VectorIndex(document_vectors, base.documents)
+            else:
+                projections[dimension] = fit_projection(document_vectors, base.embeddings)
+            logger.info(f"Prepared {mode} retrieval for {dimension}-dim queries")
+
+        return cls(indexes, projections, shared_dimension=base.dimension)
+
+    def __len__(self) -> int:
+        return len(self.indexes[self.shared_dimension])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(index.nbytes for index in self.indexes.values()) + sum(
+            projection.nbytes for projection in self.projections.values()
+        )
+
+    def subset(self, max_documents: int) -> "MultiDimensionIndex":
+        """Smaller copy of every per-dimension index"""
+        return MultiDimensionIndex(
+            {d: index.subset(max_documents) for d, index in self.indexes.items()},
+            self.projections,
+            self.shared_dimension,
+        )
+
+    def quantize(self) -> "MultiDimensionIndex":
+        """int8 copy of every per-dimension index"""
+        return MultiDimensionIndex(
+            {d: index.quantize() for d, index in self.indexes.items()},
+            self.projections,
+            self.shared_dimension,
+        )
+
+    def search(self, query_embedding: Sequence[float], top_k: int = 3) -> List[Dict[str, Any]]:
+        """Search the index for the query's dimension, projecting the query if needed"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        dimension = query.shape[-1]
+        if dimension in self.indexes:
+            return self.indexes[dimension].search(query, top_k)
+        if dimension in self.projections:
+            return self.indexes[self.shared_dimension].search(
+                query @ self.projections[dimension], top_k
+            )
+        raise ValueError(f"No index or projection for {dimension}-dim queries")
@@ -1,10 +1,34 @@
 import time
+import asyncio
 import logging
+import threading
+from collections import deque
+from typing import Optional
 from .enums import ComponentType, CircuitState  # Relative import
 from .status import ComponentStatus  # Relative import
+from .metrics import REGISTRY, MetricsRegistry  # Relative import
 
 logger = logging.getLogger("HighAvailabilityRAG.CircuitBreaker")  # More specific logger
 
+# Exported as a number so dashboards can graph and alert on it
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CallToken:
+    """
+    Permission for one call, returned by CircuitBreaker.allow_request().
+
+    The outcome of the call is reported with its token. Outcomes whose token
+    was issued before the last state change are ignored, so a slow call
+    admitted while CLOSED cannot close or reopen a HALF_OPEN circuit.
+    """
+
+    __slots__ = ("generation", "probe")
+
+    def __init__(self, generation: int, probe: bool):
+        self.generation = generation
+        self.probe = probe
+
 
 class CircuitBreaker:
     """Implements the circuit breaker pattern to prevent cascading failures"""
@@ -15,70 +39,192 @@ class CircuitBreaker:
         failure_threshold: float = 0.5,
         min_samples: int = 5,
         recovery_timeout: int = 30,
+        window_seconds: float = 60.0,
+        half_open_max_probes: int = 1,
+        registry: Optional[MetricsRegistry] = None,
     ):
         self.component_type = component_type
-        self.status = ComponentStatus(component_type)
+        self.status = ComponentStatus(component_type, window_seconds=window_seconds)
         self.state = CircuitState.CLOSED
         self.failure_threshold = failure_threshold
         self.min_samples = min_samples
         self.recovery_timeout = recovery_timeout
+        self.half_open_max_probes = half_open_max_probes
         self.last_state_change_time = time.time()
+        # Recent (timestamp, state) changes, for timelines and debugging
+        self.state_history = deque([(self.last_state_change_time, self.state)], maxlen=1000)
 
-    def execute(self, component_func, fallback_func, *args, **kwargs):
-        """Execute a function with fallback if the circuit is open"""
-        total_calls = self.status.failures + self.status.successes
+        # Guards state transitions; calls to the component run outside it
+        self._lock = threading.Lock()
+        self._probes_in_flight = 0
+        # Bumped on every state change; tokens from older generations are stale
+        self._generation = 0
+
+        registry = registry or REGISTRY
+        self._state_gauge = registry.gauge(
+            "ha_rag_circuit_state",
+            "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+            ("component",),
+        ).labels(component_type.value)
+        self._transitions = registry.counter(
+            "ha_rag_circuit_transitions_total",
+            "Circuit breaker state changes, by the state entered",
+            ("component", "state"),
+        )
+        self._state_gauge.set(STATE_VALUES[self.state])
+
+    def _transition(self, state: CircuitState):
+        """Move to a new state (caller holds the lock)"""
+        self.state = state
+        self.last_state_change_time = time.time()
+        self.state_history.append((self.last_state_change_time, state))
+        self._state_gauge.set(STATE_VALUES[state])
+        self._transitions.labels(self.component_type.value, state.value).inc()
+        self._probes_in_flight = 0
+        self._generation += 1
+
+    def _is_current(self, token: CallToken) -> bool:
+        """Return whether a token was issued in the current state (caller holds the lock)"""
+        if token.generation == self._generation:
+            return True
+        logger.debug(
+            f"Ignoring outcome of a {self.component_type.value} call admitted before the last state change"
+        )
+        return False
 
-        # Check circuit state
-        if self.state == CircuitState.OPEN:
-            # Check if recovery timeout has elapsed
-            if time.time() - self.last_state_change_time > self.recovery_timeout:
+    def allow_request(self) -> Optional[CallToken]:
+        """
+        Return a token if the protected component may be called right now, else None.
+
+        Pass the token to record_success(), record_failure() or release_probe().
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return CallToken(self._generation, probe=False)
+
+            if self.state == CircuitState.OPEN:
+                # Check if recovery timeout has elapsed
+                if time.time() - self.last_state_change_time <= self.recovery_timeout:
+                    logger.warning(
+                        f"Circuit for {self.component_type.value} is OPEN, using fallback"
+                    )
+                    return None
                 logger.info(
                     f"Circuit for {self.component_type.value} transitioning to HALF_OPEN"
                 )
-                self.state = CircuitState.HALF_OPEN
-                self.last_state_change_time = time.time()
+                self._transition(CircuitState.HALF_OPEN)
                 self.status.reset_counters()
-            else:
+
+            # HALF_OPEN: only a limited number of probe calls at a time
+            if self._probes_in_flight >= self.half_open_max_probes:
                 logger.warning(
-                    f"Circuit for {self.component_type.value} is OPEN, using fallback"
+                    f"Circuit for {self.component_type.value} is HALF_OPEN with probes in flight, using fallback"
                 )
-                return fallback_func(*args, **kwargs)
+                return None
+            self._probes_in_flight += 1
+            return CallToken(self._generation, probe=True)
 
-        # Try the primary function with timing
-        try:
-            start_time = time.time()
-            result = component_func(*args, **kwargs)
-            end_time = time.time()
+    def release_probe(self, token: CallToken):
+        """Give back the probe slot of a call that ended without an outcome (e.g. cancelled)"""
+        with self._lock:
+            if token.probe and self._is_current(token) and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
 
-            # Record success
-            self.status.record_success((end_time - start_time) * 1000)  # convert to ms
+    def record_success(self, response_time_ms: float, token: CallToken):
+        """Record a successful call and close the circuit if it was a probe"""
+        with self._lock:
+            if not self._is_current(token):
+                return
+            self.status.record_success(response_time_ms)
 
             # If half open and successful, close the circuit
-            if self.state == CircuitState.HALF_OPEN:
+            if token.probe:
                 logger.info(
                     f"Circuit for {self.component_type.value} recovering, closing circuit"
                 )
-                self.state = CircuitState.CLOSED
-                self.last_state_change_time = time.time()
+                self._transition(CircuitState.CLOSED)
 
-            return result
+    def record_failure(self, error: Exception, token: CallToken):
+        """Record a failed call and open the circuit if the failure rate is too high"""
+        logger.warning(f"Component {self.component_type.value} failed: {str(error)}")
 
-        except Exception as e:
-            # Record failure
+        with self._lock:
+            if not self._is_current(token):
+                return
             self.status.record_failure()
-            logger.warning(f"Component {self.component_type.value} failed: {str(e)}")
 
-            # Check if we should open the circuit
+            if token.probe:
+                # A failed probe means the component has not recovered yet
+                logger.error(
+                    f"Circuit for {self.component_type.value} probe failed, reopening circuit"
+                )
+                self._transition(CircuitState.OPEN)
+                return
+
+            # Decide on the counts as they are now, including this failure
+            successes, failures = self.status.get_window_counts()
+            total_calls = successes + failures
+            failure_rate = failures / total_calls if total_calls else 0.0
             if (
-                total_calls >= self.min_samples
-                and self.status.get_failure_rate() >= self.failure_threshold
+                self.state == CircuitState.CLOSED
+                and total_calls >= self.min_samples
+                and failure_rate >= self.failure_threshold
             ):
-                if self.state == CircuitState.CLOSED:
-                    logger.error(
-                        f"Circuit for {self.component_type.value} opening due to high failure rate: {self.status.get_failure_rate():.2f}"
-                    )
-                    self.state = CircuitState.OPEN
-                    self.last_state_change_time = time.time()
+                logger.error(
+                    f"Circuit for {self.component_type.value} opening due to high failure rate: {failure_rate:.2f}"
+                )
+                self._transition(CircuitState.OPEN)
+
+    def execute(self, component_func, fallback_func, *args, **kwargs):
+        """Execute a function with fallback if the circuit is open"""
+        token = self.allow_request()
+        if token is None:
+            return fallback_func(*args, **kwargs)
 
+        # Try the primary function with timing
+        try:
+            start_time = time.time()
+            result = component_func(*args, **kwargs)
+            end_time = time.time()
+        except Exception as e:
+            self.record_failure(e, token)
             # Use fallback
             return fallback_func(*args, **kwargs)
+        except BaseException:
+            # Interrupted without an outcome; don't hold a probe slot
+            self.release_probe(token)
+            raise
+
+        self.record_success((end_time - start_time) * 1000, token)  # convert to ms
+        return result
+
+    async def execute_async(
+        self,
+        component_func,
+        fallback_func,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        """Await a coroutine function with fallback if the circuit is open or the call fails or times out"""
+        token = self.allow_request()
+        if token is None:
+            return await fallback_func(*args, **kwargs)
+
+        try:
+            start_time = time.time()
+            result = await asyncio.wait_for(component_func(*args, **kwargs), timeout)
+            end_time = time.time()
+        except asyncio.TimeoutError:
+            self.record_failure(TimeoutError(f"timed out after {timeout:.2f}s"), token)
+            return await fallback_func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e, token)
+            return await fallback_func(*args, **kwargs)
+        except BaseException:
+            # Cancelled or interrupted without an outcome; don't hold a probe slot
+            self.release_probe(token)
+            raise
+
+        self.record_success((end_time - start_time) * 1000, token)  # convert to ms
+        return result
@@ -0,0 +1,353 @@
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from .enums import ComponentType  # Relative import
+from .circuit_breaker import CallToken, CircuitBreaker  # Relative import
+from .status import ComponentStatus  # Relative import
+from .metrics import REGISTRY, MetricsRegistry  # Relative import
+
+logger = logging.getLogger("HighAvailabilityRAG.Hedging")
+
+
+class HedgedFallbackChain:
+    """
+    Runs a fallback chain, starting the next tier early when a tier is slow.
+
+    Each chain gets its own worker pool unless one is passed in, so a backlog
+    on one component cannot delay calls to another.
+    """
+
+    def __init__(
+        self,
+        component_type: ComponentType,
+        tiers: List[Any],
+        circuit_breaker: CircuitBreaker,
+        executor: Optional[Executor] = None,
+        hedge_percentile: float = 95.0,
+        min_samples: int = 10,
+        registry: Optional[MetricsRegistry] = None,
+        max_workers: int = 8,
+    ):
+        self.component_type = component_type
+        self.tiers = tiers
+        self.circuit_breaker = circuit_breaker
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"ha-rag-{component_type.value}",
+        )
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+
+        # The primary's latencies live in its circuit breaker; fallbacks get their own
+        self.tier_status = [circuit_breaker.status] + [
+            ComponentStatus(component_type) for _ in tiers[1:]
+        ]
+        self.hedges_launched = 0
+        self.hedges_won = 0
+        # Requests served by each tier; the extra last slot counts requests where every tier failed
+        self.tier_counts = [0] * (len(tiers) + 1)
+        self._stats_lock = threading.Lock()
+
+        # Series are bound once here so the hot path skips the label lookup
+        registry = registry or REGISTRY
+        component = component_type.value
+        tier_labels = [str(tier) for tier in range(len(tiers))]
+        calls = registry.counter(
+            "ha_rag_component_calls_total",
+            "Calls to each fallback tier, by outcome",
+            ("component", "tier", "outcome"),
+        )
+        self._call_counters = {
+            outcome: [calls.labels(component, tier, outcome) for tier in tier_labels]
+            for outcome in ("success", "failure", "timeout", "cancelled")
+        }
+        latency = registry.histogram(
+            "ha_rag_component_latency_seconds",
+            "Latency of successful calls to each fallback tier",
+            ("component", "tier"),
+        )
+        self._latency_histograms = [latency.labels(component, tier) for tier in tier_labels]
+        served = registry.counter(
+            "ha_rag_requests_served_total",
+            "Requests answered by each tier (tier=\"default\" when every tier failed)",
+            ("component", "tier"),
+        )
+        self._served_counters = [
+            served.labels(component, tier) for tier in tier_labels + ["default"]
+        ]
+        hedges = registry.counter(
+            "ha_rag_hedges_total",
+            "Hedged calls started, and those that answered first",
+            ("component", "result"),
+        )
+        self._hedges_launched_counter = hedges.labels(component, "launched")
+        self._hedges_won_counter = hedges.labels(component, "won")
+
+    def shutdown(self):
+        """Stop the chain's worker pool if the chain created it"""
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def get_hedge_delay(self, tier: int) -> Optional[float]:
+        """Seconds to wait on a tier before hedging, or None without enough samples"""
+        status = self.tier_status[tier]
+        if self.hedge_percentile is None or len(status.response_times) < self.min_samples:
+            return None
+        return status.get_percentile_response_time(self.hedge_percentile) / 1000
+
+    def _count_served(self, tier: int):
+        """Count a request answered by a tier (len(tiers) means the default)"""
+        with self._stats_lock:
+            self.tier_counts[tier] += 1
+        self._served_counters[tier].inc()
+
+    def _count_hedge(self, won: bool):
+        """Count a hedge that was launched, or one that answered first"""
+        with self._stats_lock:
+            if won:
+                self.hedges_won += 1
+            else:
+                self.hedges_launched += 1
+        (self._hedges_won_counter if won else self._hedges_launched_counter).inc()
+
+    def _record_failure(
+        self,
+        tier: int,
+        error: Exception,
+        token: Optional[CallToken],
+        outcome: str = "failure",
+    ):
+        """Record a failed call to one tier; token is the breaker's for tier 0"""
+        self._call_counters[outcome][tier].inc()
+        if tier == 0:
+            self.circuit_breaker.record_failure(error, token)
+        else:
+            self.tier_status[tier].record_failure()
+            logger.warning(
+                f"Fallback {self.component_type.value} {tier} failed: {str(error)}"
+            )
+
+    def _record_success(self, tier: int, start_time: float, token: Optional[CallToken]):
+        """Record a successful call to one tier; token is the breaker's for tier 0"""
+        response_time_ms = (time.time() - start_time) * 1000
+        self._call_counters["success"][tier].inc()
+        self._latency_histograms[tier].observe(response_time_ms / 1000)
+        if tier == 0:
+            self.circuit_breaker.record_success(response_time_ms, token)
+        else:
+            self.tier_status[tier].record_success(response_time_ms)
+
+    def _call_tier(
+        self,
+        tier: int,
+        call: Callable[[Any], Any],
+        started: Dict[int, float],
+        token: Optional[CallToken] = None,
+    ) -> Any:
+        """Call one tier, recording its latency or failure, and when it started in started"""
+        started[tier] = time.monotonic()
+        if tier > 0:
+            logger.info(f"Trying fallback {self.component_type.value} {tier}")
+        start_time = time.time()
+        try:
+            result = call(self.tiers[tier])
+        except Exception as e:
+            self._record_failure(tier, e, token)
+            raise
+        self._record_success(tier, start_time, token)
+        return result
+
+    async def _call_tier_async(
+        self,
+        tier: int,
+        call: Callable[[Any], Awaitable[Any]],
+        timeout: Optional[float],
+        token: Optional[CallToken] = None,
+    ) -> Any:
+        """Await one tier with a timeout, recording its latency or failure"""
+        if tier > 0:
+            logger.info(f"Trying fallback {self.component_type.value} {tier}")
+        start_time = time.time()
+        try:
+            result = await asyncio.wait_for(call(self.tiers[tier]), timeout)
+        except asyncio.CancelledError:
+            # Lost a hedge race. Keep the time it ran as a latency sample, or
+            # the percentile would drift down and hedge ever more often; a
+            # cancelled probe must not hold its slot
+            self.tier_status[tier].record_response_time((time.time() - start_time) * 1000)
+            self._call_counters["cancelled"][tier].inc()
+            if tier == 0:
+                self.circuit_breaker.release_probe(token)
+            raise
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"timed out after {timeout:.2f}s")
+            self._record_failure(tier, error, token, outcome="timeout")
+            raise error
+        except Exception as e:
+            self._record_failure(tier, e, token)
+            raise
+        self._record_success(tier, start_time, token)
+        return result
+
+    def execute(self, call: Callable[[Any], Any], default: Callable[[], Any]) -> Any:
+        """
+        Return the first successful result from the chain.
+
+        A tier is started when the previous one fails, or as a hedge when the
+        previous one has been running past its latency percentile. Time spent
+        waiting for a free worker does not count, so a busy pool does not set
+        off hedges. Once a tier succeeds, tiers that have not started are
+        cancelled and the results of those still running are discarded.
+        """
+        token = self.circuit_breaker.allow_request()
+        next_tier = 0 if token else 1
+        pending: Dict[Any, int] = {}
+        # When each tier's call began running, filled in by the worker
+        started: Dict[int, float] = {}
+        hedge_delay = None
+
+        def launch() -> Optional[float]:
+            nonlocal next_tier
+            tier = next_tier
+            next_tier += 1
+            pending[self.executor.submit(self._call_tier, tier, call, started, token)] = tier
+            delay = self.get_hedge_delay(tier)
+            if delay is None or next_tier >= len(self.tiers):
+                return None
+            return delay
+
+        while True:
+            if not pending:
+                if next_tier >= len(self.tiers):
+                    logger.error(f"All {self.component_type.value} services failed")
+                    self._count_served(len(self.tiers))
+                    return default()
+                hedge_delay = launch()
+                continue
+
+            timeout = None
+            if hedge_delay is not None:
+                began = started.get(next_tier - 1)
+                # Until the newest call starts, check back after one delay
+                timeout = (
+                    hedge_delay
+                    if began is None
+                    else max(0.0, began + hedge_delay - time.monotonic())
+                )
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                began = started.get(next_tier - 1)
+                if began is None or time.monotonic() - began < hedge_delay:
+                    # Still queued, or has not yet run for the full delay
+                    continue
+                # The newest tier is slower than usual, so race the next one against it
+                self._count_hedge(won=False)
+                logger.info(
+                    f"{self.component_type.value.capitalize()} tier {next_tier - 1} is slow, "
+                    f"hedging with tier {next_tier}"
+                )
+                hedge_delay = launch()
+                continue
+
+            newest_failed = False
+            for future in done:
+                tier = pending.pop(future)
+                if future.exception() is not None:
+                    newest_failed = newest_failed or tier == next_tier - 1
+                    continue
+                if pending and tier > min(pending.values()):
+                    self._count_hedge(won=True)
+                for loser, loser_tier in pending.items():
+                    if loser.cancel():
+                        self._call_counters["cancelled"][loser_tier].inc()
+                        if loser_tier == 0:
+                            self.circuit_breaker.release_probe(token)
+                self._count_served(tier)
+                return future.result()
+
+            # The newest tier failed, so move down the chain without waiting
+            # on any slower tier that is still running
+            if newest_failed:
+                hedge_delay = launch() if next_tier < len(self.tiers) else None
+
+    async def execute_async(
+        self,
+        call: Callable[[Any], Awaitable[Any]],
+        default: Callable[[], Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Coroutine version of execute().
+
+        Each tier is awaited with the given timeout, and a timeout counts as a
+        failure. Tiers that lose the race are cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        token = self.circuit_breaker.allow_request()
+        next_tier = 0 if token else 1
+        pending: Dict[asyncio.Task, int] = {}
+        deadline = None
+
+        def launch() -> Optional[float]:
+            nonlocal next_tier
+            tier = next_tier
+            next_tier += 1
+            task = asyncio.ensure_future(self._call_tier_async(tier, call, timeout, token))
+            # A loser can finish with an error while being cancelled; it was
+            # already recorded, so just mark it as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            pending[task] = tier
+            delay = self.get_hedge_delay(tier)
+            if delay is None or next_tier >= len(self.tiers):
+                return None
+            return loop.time() + delay
+
+        try:
+            while True:
+                if not pending:
+                    if next_tier >= len(self.tiers):
+                        logger.error(f"All {self.component_type.value} services failed")
+                        self._count_served(len(self.tiers))
+                        return default()
+                    deadline = launch()
+                    continue
+
+                wait_time = None if deadline is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait_time, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # The newest tier is slower than usual, so race the next one against it
+                    self._count_hedge(won=False)
+                    logger.info(
+                        f"{self.component_type.value.capitalize()} tier {next_tier - 1} is slow, "
+                        f"hedging with tier {next_tier}"
+                    )
+                    deadline = launch()
+                    continue
+
+                newest_failed = False
+                for task in done:
+                    tier = pending.pop(task)
+                    if task.exception() is not None:
+                        newest_failed = newest_failed or tier == next_tier - 1
+                        continue
+                    if pending and tier > min(pending.values()):
+                        self._count_hedge(won=True)
+                    self._count_served(tier)
+                    return task.result()
+
+                # The newest tier failed, so move down the chain without waiting
+                # on any slower tier that is still running
+                if newest_failed:
+                    deadline = launch() if next_tier < len(self.tiers) else None
+        finally:
+            # Cancel the losers, or everything if the caller was cancelled
+            for task in pending:
+                task.cancel()
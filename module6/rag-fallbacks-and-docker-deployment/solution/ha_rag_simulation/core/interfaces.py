@@ -37,3 +37,40 @@ class Generator(ABC):
     ) -> str:
         """Generate text based on prompt and optional context"""
         pass
+
+
+class AsyncEmbedder(ABC):
+    """Abstract base class for text embedding services with a coroutine API"""
+
+    @abstractmethod
+    async def embed_async(self, text: str) -> List[float]:
+        """Convert text to embedding vector without blocking the event loop"""
+        pass
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Return embedding dimension"""
+        pass
+
+
+class AsyncRetriever(ABC):
+    """Abstract base class for vector database retrieval with a coroutine API"""
+
+    @abstractmethod
+    async def retrieve_async(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Retrieve relevant documents without blocking the event loop"""
+        pass
+
+
+class AsyncGenerator(ABC):
+    """Abstract base class for text generation with a coroutine API"""
+
+    @abstractmethod
+    async def generate_async(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """Generate text without blocking the event loop"""
+        pass
@@ -1,44 +1,107 @@
 import time
+import threading
 from collections import deque
+from typing import Tuple
 from .enums import ComponentType  # Relative import
 
 
 class ComponentStatus:
-    """Tracks the health and performance of a component"""
+    """Tracks the health and performance of a component (safe to share between threads)"""
 
-    def __init__(self, component_type: ComponentType):
+    def __init__(
+        self,
+        component_type: ComponentType,
+        window_seconds: float = 60.0,
+        bucket_count: int = 12,
+    ):
         self.component_type = component_type
         self.response_times = deque(maxlen=100)  # Keep only recent times
-        self.failures = 0
+        self.failures = 0  # Lifetime totals
         self.successes = 0
         self.last_failure_time = None
         self.last_success_time = None
+        self._lock = threading.Lock()
+
+        # Sliding window of outcomes: a ring of time buckets, each tagged with
+        # the bucket number it currently holds so stale buckets can be reused
+        self.window_seconds = window_seconds
+        self.bucket_count = bucket_count
+        self._bucket_width = window_seconds / bucket_count
+        self._bucket_ids = [-1] * bucket_count
+        self._bucket_successes = [0] * bucket_count
+        self._bucket_failures = [0] * bucket_count
+
+    def _current_bucket(self, now: float) -> int:
+        """Return the ring slot for now, clearing it if it holds an old bucket"""
+        bucket_id = int(now / self._bucket_width)
+        slot = bucket_id % self.bucket_count
+        if self._bucket_ids[slot] != bucket_id:
+            self._bucket_ids[slot] = bucket_id
+            self._bucket_successes[slot] = 0
+            self._bucket_failures[slot] = 0
+        return slot
 
     def record_success(self, response_time_ms: float):
         """Record a successful operation"""
-        self.successes += 1
-        self.response_times.append(response_time_ms)
-        self.last_success_time = time.time()
+        now = time.time()
+        with self._lock:
+            self.successes += 1
+            self._bucket_successes[self._current_bucket(now)] += 1
+            self.response_times.append(response_time_ms)
+            self.last_success_time = now
+
+    def record_response_time(self, response_time_ms: float):
+        """Record how long a call ran without counting an outcome (e.g. a cancelled call)"""
+        with self._lock:
+            self.response_times.append(response_time_ms)
 
     def record_failure(self):
         """Record a failed operation"""
-        self.failures += 1
-        self.last_failure_time = time.time()
+        now = time.time()
+        with self._lock:
+            self.failures += 1
+            self._bucket_failures[self._current_bucket(now)] += 1
+            self.last_failure_time = now
+
+    def get_window_counts(self) -> Tuple[int, int]:
+        """Return (successes, failures) recorded within the sliding window"""
+        oldest_bucket = int(time.time() / self._bucket_width) - self.bucket_count + 1
+        successes = failures = 0
+        with self._lock:
+            for slot, bucket_id in enumerate(self._bucket_ids):
+                if bucket_id >= oldest_bucket:
+                    successes += self._bucket_successes[slot]
+                    failures += self._bucket_failures[slot]
+        return successes, failures
 
     def get_failure_rate(self) -> float:
-        """Calculate the current failure rate"""
-        total = self.failures + self.successes
+        """Calculate the failure rate within the sliding window"""
+        successes, failures = self.get_window_counts()
+        total = failures + successes
         if total == 0:
             return 0.0
-        return self.failures / total
+        return failures / total
 
     def get_avg_response_time(self) -> float:
         """Get the average response time over recent operations"""
-        if not self.response_times:
+        with self._lock:
+            response_times = list(self.response_times)
+        if not response_times:
             return 0.0
-        return sum(self.response_times) / len(self.response_times)
+        return sum(response_times) / len(response_times)
+
+    def get_percentile_response_time(self, percentile: float) -> float:
+        """Get a response time percentile (0-100) over recent operations"""
+        with self._lock:
+            ordered = sorted(self.response_times)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
 
     def reset_counters(self):
-        """Reset failure and success counters"""
-        self.failures = 0
-        self.successes = 0
+        """Reset the sliding window so the failure rate starts afresh"""
+        with self._lock:
+            self._bucket_ids = [-1] * self.bucket_count
+            self._bucket_successes = [0] * self.bucket_count
+            self._bucket_failures = [0] * self.bucket_count
@@ -0,0 +1,334 @@
+import csv
+import json
+import time
+import random
+import asyncio
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+from .core.enums import ComponentType
+from .core.metrics import MetricsRegistry
+from .system import HighAvailabilityRAG  # Relative import
+
+logger = logging.getLogger("HighAvailabilityRAG.LoadTest")
+
+LOAD_TEST_QUERIES = [
+    "How do RAG systems work?",
+    "What are the advantages of Docker containers?",
+    "Explain circuit breaker patterns",
+    "How to implement fallback strategies?",
+    "What is graceful degradation?",
+]
+
+
+@dataclass
+class ScheduleEvent:
+    """Changes one component's behaviour between two points in a load test"""
+
+    component: str  # "embedder", "retriever" or "generator"
+    tier: int  # Position in the fallback chain (0 = primary)
+    start: float  # Seconds from the start of the test
+    end: float
+    failure_rate: Optional[float] = None  # 1.0 for a full outage
+    latency_factor: Optional[float] = None  # Above 1.0 for a brownout
+
+
+def default_schedule(duration: float) -> List[ScheduleEvent]:
+    """A primary generator outage followed by a primary embedder brownout"""
+    return [
+        ScheduleEvent("generator", 0, duration * 0.2, duration * 0.4, failure_rate=1.0),
+        ScheduleEvent(
+            "embedder", 0, duration * 0.5, duration * 0.7,
+            failure_rate=0.5, latency_factor=4.0,
+        ),
+    ]
+
+
+def load_schedule(path: str) -> List[ScheduleEvent]:
+    """Read schedule events from a JSON list of objects with ScheduleEvent fields"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [ScheduleEvent(**event) for event in json.load(f)]
+
+
+class LatencyHistogram:
+    """HDR-style histogram: fixed relative precision over any range in constant memory"""
+
+    def __init__(self, significant_figures: int = 3):
+        # Enough linear sub-buckets per power of two to keep the relative error
+        # below 10^-significant_figures
+        self.sub_bucket_bits = (2 * 10**significant_figures - 1).bit_length()
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total = 0
+        self.max_value = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        return (shift << self.sub_bucket_bits) | (value >> shift)
+
+    def _value_at(self, index: int) -> int:
+        """Highest value that falls into a bucket"""
+        shift = index >> self.sub_bucket_bits
+        sub_bucket = index & ((1 << self.sub_bucket_bits) - 1)
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Record a non-negative integer value (e.g. microseconds)"""
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_count += 1
+        self.total += value
+        self.max_value = max(self.max_value, value)
+
+    def percentile(self, percentile: float) -> int:
+        """Value below which the given percentage (0-100) of recordings fall"""
+        if not self.total_count:
+            return 0
+        target = max(1, int(round(self.total_count * percentile / 100)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value_at(index), self.max_value)
+        return self.max_value
+
+    def mean(self) -> float:
+        return self.total / self.total_count if self.total_count else 0.0
+
+
+@dataclass
+class LoadTestConfig:
+    """Settings for one load-test run"""
+
+    rate: float = 50.0  # Mean arrivals per second (Poisson)
+    duration: float = 30.0  # Seconds of arrivals
+    concurrency: int = 500  # Maximum queries in flight; later arrivals queue
+    schedule: List[ScheduleEvent] = field(default_factory=list)
+    # Failure rate of every primary tier outside schedule events. The system is
+    # built with 30% for the interactive demo; at load-test rates that opens
+    # every breaker within a second, so by default the primaries start healthy
+    # and only the schedule degrades them. None keeps the system's rates.
+    primary_failure_rate: Optional[float] = 0.0
+    failure_threshold: Optional[float] = None  # Breaker overrides; None keeps defaults
+    min_samples: Optional[int] = None
+    recovery_timeout: Optional[float] = None
+    sample_interval: float = 0.5  # Seconds between timeline samples
+    seed: Optional[int] = None
+
+
+async def _apply_schedule(
+    rag: HighAvailabilityRAG, schedule: List[ScheduleEvent], started: float
+):
+    """Apply and revert schedule events at their start and end times"""
+    loop = asyncio.get_running_loop()
+    actions = []
+    for event in schedule:
+        component = rag.fallback_strategy.get_fallback_chain(
+            ComponentType(event.component)
+        )[event.tier]
+        changes = {
+            name: value
+            for name, value in (
+                ("failure_rate", event.failure_rate),
+                ("latency_factor", event.latency_factor),
+            )
+            if value is not None
+        }
+        original = {name: getattr(component, name, None) for name in changes}
+        actions.append((event.start, component, changes, event))
+        actions.append((event.end, component, original, None))
+
+    for at, component, values, event in sorted(actions, key=lambda action: action[0]):
+        await asyncio.sleep(max(0.0, started + at - loop.time()))
+        for name, value in values.items():
+            setattr(component, name, value)
+        if event is not None:
+            logger.warning(f"Schedule: {event.component} tier {event.tier} -> {values}")
+
+
+async def _run_load_test(
+    config: LoadTestConfig, metrics_registry: Optional[MetricsRegistry] = None
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    arrivals = random.Random(config.seed)
+    rag = HighAvailabilityRAG(metrics_registry=metrics_registry)
+    breakers = {
+        "embedder": rag.embedding_cb,
+        "retriever": rag.retrieval_cb,
+        "generator": rag.generation_cb,
+    }
+    chains = {
+        "embedder": rag.embedding_chain,
+        "retriever": rag.retrieval_chain,
+        "generator": rag.generation_chain,
+    }
+    for breaker in breakers.values():
+        if config.failure_threshold is not None:
+            breaker.failure_threshold = config.failure_threshold
+        if config.min_samples is not None:
+            breaker.min_samples = config.min_samples
+        if config.recovery_timeout is not None:
+            breaker.recovery_timeout = config.recovery_timeout
+    if config.primary_failure_rate is not None:
+        # Set before the schedule starts, so events revert to this baseline
+        for chain in chains.values():
+            chain.tiers[0].failure_rate = config.primary_failure_rate
+
+    histogram = LatencyHistogram()
+    interval_histogram = LatencyHistogram()
+    semaphore = asyncio.Semaphore(config.concurrency)
+    in_flight = 0
+    samples: List[Dict[str, Any]] = []
+    started = loop.time()
+    started_wall = time.time()
+
+    async def one_query(number: int, arrived: float):
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            async with semaphore:
+                # Distinct text per request so the embedding cache does not absorb the load
+                base_query = LOAD_TEST_QUERIES[number % len(LOAD_TEST_QUERIES)]
+                await rag.query_async(f"{base_query} (request {number})")
+        finally:
+            in_flight -= 1
+        # Measured from arrival, so time spent queued behind the limit counts
+        latency_us = int((loop.time() - arrived) * 1_000_000)
+        histogram.record(latency_us)
+        interval_histogram.record(latency_us)
+
+    def take_sample():
+        nonlocal interval_histogram
+        now = round(loop.time() - started, 3)
+        sample = {
+            "time": now,
+            "in_flight": in_flight,
+            "completed": interval_histogram.total_count,
+            "p50_ms": interval_histogram.percentile(50) / 1000,
+            "p99_ms": interval_histogram.percentile(99) / 1000,
+        }
+        for name, breaker in breakers.items():
+            state = breaker.state.value
+            sample[f"{name}_state"] = state
+            sample[f"{name}_failure_rate"] = round(breaker.status.get_failure_rate(), 4)
+        samples.append(sample)
+        interval_histogram = LatencyHistogram()
+
+    async def sampler():
+        while True:
+            await asyncio.sleep(config.sample_interval)
+            take_sample()
+
+    schedule_task = asyncio.ensure_future(_apply_schedule(rag, config.schedule, started))
+    sampler_task = asyncio.ensure_future(sampler())
+    tier_counts_before = {name: list(chain.tier_counts) for name, chain in chains.items()}
+
+    # Open loop: arrivals follow the schedule whether or not earlier queries finished
+    queries = []
+    next_arrival = started
+    while True:
+        next_arrival += arrivals.expovariate(config.rate)
+        if next_arrival - started >= config.duration:
+            break
+        await asyncio.sleep(max(0.0, next_arrival - loop.time()))
+        queries.append(asyncio.ensure_future(one_query(len(queries), next_arrival)))
+
+    await asyncio.gather(*queries)
+    elapsed = loop.time() - started
+    schedule_task.cancel()
+    sampler_task.cancel()
+    take_sample()
+    rag.shutdown()
+
+    # Every state change, not just the ones a sample happened to catch
+    transitions = {
+        name: [{"time": 0.0, "state": breaker.state_history[0][1].value}]
+        + [
+            {"time": round(at - started_wall, 3), "state": state.value}
+            for at, state in list(breaker.state_history)[1:]
+        ]
+        for name, breaker in breakers.items()
+    }
+
+    tier_mix = {}
+    for name, chain in chains.items():
+        # Prefix the tier index; two tiers can share a class (e.g. CachedEmbedder)
+        labels = [
+            f"{index}:{type(tier).__name__}" for index, tier in enumerate(chain.tiers)
+        ] + ["AllFailed"]
+        counts = [
+            after - before
+            for before, after in zip(tier_counts_before[name], chain.tier_counts)
+        ]
+        tier_mix[name] = dict(zip(labels, counts))
+
+    return {
+        "config": asdict(config),
+        "requests": histogram.total_count,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_qps": round(histogram.total_count / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(histogram.mean() / 1000, 3),
+            "p50": histogram.percentile(50) / 1000,
+            "p95": histogram.percentile(95) / 1000,
+            "p99": histogram.percentile(99) / 1000,
+            "p999": histogram.percentile(99.9) / 1000,
+            "max": histogram.max_value / 1000,
+        },
+        "tier_mix": tier_mix,
+        "breaker_transitions": transitions,
+        "samples": samples,
+    }
+
+
+def write_results(results: Dict[str, Any], output_prefix: str):
+    """Write the summary as JSON and the timeline samples as CSV"""
+    with open(f"{output_prefix}.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    if results["samples"]:
+        with open(f"{output_prefix}_timeline.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results["samples"][0]))
+            writer.writeheader()
+            writer.writerows(results["samples"])
+
+
+def run_load_test(
+    config: LoadTestConfig,
+    output_prefix: Optional[str] = None,
+    metrics_registry: Optional[MetricsRegistry] = None,
+) -> Dict[str, Any]:
+    """Run an open-loop load test against query_async and print an SLO summary"""
+    # Per-call logging would dominate the measurement
+    package_logger = logging.getLogger("HighAvailabilityRAG")
+    previous_level = package_logger.level
+    package_logger.setLevel(logging.ERROR)
+    try:
+        results = asyncio.run(_run_load_test(config, metrics_registry))
+    finally:
+        package_logger.setLevel(previous_level)
+
+    latency = results["latency_ms"]
+    print("\n" + "=" * 80)
+    print(
+        f"LOAD TEST: {results['requests']} requests at {config.rate:.0f}/s "
+        f"over {config.duration:.0f}s ({results['throughput_qps']:.1f} completed/s)"
+    )
+    print("=" * 80)
+    print(
+        f"  Latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+        f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}"
+    )
+    for component, mix in results["tier_mix"].items():
+        total = sum(mix.values()) or 1
+        shares = ", ".join(
+            f"{label} {count / total:.0%}" for label, count in mix.items() if count
+        )
+        print(f"  {component.upper()} tiers: {shares}")
+    for component, changes in results["breaker_transitions"].items():
+        timeline = " -> ".join(f"{c['state']}@{c['time']:.1f}s" for c in changes)
+        print(f"  {component.upper()} breaker: {timeline}")
+
+    if output_prefix:
+        write_results(results, output_prefix)
+        print(f"\n  Results written to {output_prefix}.json and {output_prefix}_timeline.csv")
+    return results
@@ -1,3 +1,4 @@
+import time
 import logging
 from typing import List, Dict, Any, Optional
 
@@ -5,10 +6,13 @@ from typing import List, Dict, Any, Optional
 from .core.enums import ComponentType
 from .core.circuit_breaker import CircuitBreaker
 from .core.strategy import FallbackStrategy
+from .core.hedging import HedgedFallbackChain
+from .core.metrics import MetricsRegistry
 
 # Import simulated component implementations
 from .components.embedders import PrimaryEmbedder, SecondaryEmbedder, CachedEmbedder
 from .components.retrievers import PrimaryRetriever, ReducedRetriever, NoRetriever
+from .components.vector_index import MultiDimensionIndex, VectorIndex
 from .components.generators import (
     PrimaryGenerator,
     FallbackGenerator,
@@ -21,17 +25,55 @@ logger = logging.getLogger("HighAvailabilityRAG.System")
 class HighAvailabilityRAG:
     """Main class orchestrating the RAG system with fallbacks and monitoring"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        hedge_percentile: Optional[float] = 95.0,
+        component_timeout: Optional[float] = 1.0,
+        cache_primary_embeddings: bool = True,
+        popular_queries_path: Optional[str] = None,
+        retrieval_index_mode: str = "per_dimension",
+        metrics_registry: Optional[MetricsRegistry] = None,
+    ):
+        # Counters, gauges and histograms exposed for Prometheus scrapes. Each
+        # instance gets its own registry unless one is passed in, so instances
+        # in the same process don't overwrite each other's series
+        self.metrics = metrics_registry or MetricsRegistry()
+        self._queries = self.metrics.counter(
+            "ha_rag_queries_total", "Queries processed, by outcome", ("outcome",)
+        )
+        self._query_latency = self.metrics.histogram(
+            "ha_rag_query_latency_seconds", "End-to-end query latency"
+        )
+
         # Initialize all components
+        primary_embedder = PrimaryEmbedder(failure_rate=0.3)  # High failure rate for testing
+
+        # Cache of the primary's embeddings, checked before the fallback chain:
+        # repeated queries skip the service, are answered even while its
+        # breaker is open, and don't add ~0ms samples to its latency stats
+        self.embedding_cache: Optional[CachedEmbedder] = None
+        if cache_primary_embeddings:
+            self.embedding_cache = CachedEmbedder(primary_embedder)
+            if popular_queries_path:
+                self.embedding_cache.warm(popular_queries_path)
+
         self.embedders = [
-            PrimaryEmbedder(failure_rate=0.3),  # High failure rate for testing
+            primary_embedder,
             SecondaryEmbedder(failure_rate=0.15),
             CachedEmbedder(),
         ]
 
+        # One document matrix, prepared for every embedder's dimension so
+        # retrieval still works when a fallback embedder answered; the
+        # reduced tier searches a smaller copy of it
+        self.document_index = MultiDimensionIndex.build(
+            VectorIndex.simulated(num_documents=5000, dimension=self.embedders[0].dimension),
+            dimensions=[embedder.dimension for embedder in self.embedders],
+            mode=retrieval_index_mode,
+        )
         self.retrievers = [
-            PrimaryRetriever(failure_rate=0.3),  # High failure rate for testing
-            ReducedRetriever(failure_rate=0.15),
+            PrimaryRetriever(failure_rate=0.3, index=self.document_index),  # High failure rate for testing
+            ReducedRetriever(failure_rate=0.15, index=self.document_index.subset(1000)),
             NoRetriever(),
         ]
 
@@ -54,6 +96,7 @@ class HighAvailabilityRAG:
             failure_threshold=0.4,
             min_samples=3,
             recovery_timeout=10,
+            registry=self.metrics,
         )
 
         self.retrieval_cb = CircuitBreaker(
@@ -61,6 +104,7 @@ class HighAvailabilityRAG:
             failure_threshold=0.4,
             min_samples=3,
             recovery_timeout=10,
+            registry=self.metrics,
         )
 
         self.generation_cb = CircuitBreaker(
@@ -68,110 +112,121 @@ class HighAvailabilityRAG:
             failure_threshold=0.4,
             min_samples=3,
             recovery_timeout=10,
+            registry=self.metrics,
+        )
+
+        # Per-call timeout for the async pipeline; a timed-out call counts as a failure
+        self.component_timeout = component_timeout
+
+        # Hedged fallback chains: when a tier runs past its hedge_percentile
+        # latency the next tier is started alongside it (None disables hedging).
+        # Each chain has its own worker pool.
+        self.embedding_chain = HedgedFallbackChain(
+            ComponentType.EMBEDDER,
+            self.fallback_strategy.get_fallback_chain(ComponentType.EMBEDDER),
+            self.embedding_cb,
+            hedge_percentile=hedge_percentile,
+            registry=self.metrics,
         )
+        self.retrieval_chain = HedgedFallbackChain(
+            ComponentType.RETRIEVER,
+            self.fallback_strategy.get_fallback_chain(ComponentType.RETRIEVER),
+            self.retrieval_cb,
+            hedge_percentile=hedge_percentile,
+            registry=self.metrics,
+        )
+        self.generation_chain = HedgedFallbackChain(
+            ComponentType.GENERATOR,
+            self.fallback_strategy.get_fallback_chain(ComponentType.GENERATOR),
+            self.generation_cb,
+            hedge_percentile=hedge_percentile,
+            registry=self.metrics,
+        )
+
+        self._cache_collector = None
+        if self.embedding_cache is not None:
+            cache_gauge = self.metrics.gauge(
+                "ha_rag_embedding_cache", "Primary embedding cache statistics", ("stat",)
+            )
+
+            def collect_cache_stats():
+                for stat, value in self.embedding_cache.get_stats().items():
+                    cache_gauge.labels(stat).set(value)
+
+            self._cache_collector = collect_cache_stats
+            self.metrics.add_collector(collect_cache_stats)
+
+    def shutdown(self):
+        """Stop the worker pools and detach this instance from its metrics registry"""
+        for chain in (self.embedding_chain, self.retrieval_chain, self.generation_chain):
+            chain.shutdown()
+        if self._cache_collector is not None:
+            self.metrics.remove_collector(self._cache_collector)
+            self._cache_collector = None
+
+    def _observe_query(self, start_time: float, outcome: str):
+        self._queries.labels(outcome).inc()
+        self._query_latency.observe(time.time() - start_time)
+
+    def _cache_primary_embedding(self, embedder, text: str, embedding: List[float]):
+        """Cache an embedding if the primary produced it"""
+        if self.embedding_cache is not None and embedder is self.embedders[0]:
+            self.embedding_cache.put(text, embedding)
+        return embedding
 
     def get_embedding(self, text: str) -> List[float]:
-        """Get embedding with fallbacks"""
+        """Get embedding from the cache, or with hedged fallbacks"""
         embedders = self.fallback_strategy.get_fallback_chain(ComponentType.EMBEDDER)
         if not embedders:
             raise ValueError("No embedding services configured")
 
-        # Try primary embedder with fallbacks
-        primary_embedder = embedders[0]
-
-        def try_fallback_embedder(text: str) -> List[float]:
-            # Find the next available embedder
-            for i, embedder in enumerate(embedders[1:], 1):
-                try:
-                    logger.info(f"Trying fallback embedder {i}")
-                    return embedder.embed(text)
-                except Exception as e:
-                    logger.warning(f"Fallback embedder {i} failed: {str(e)}")
-                    continue
-
-            # If all fallbacks fail, return a zero embedding
-            logger.error("All embedding services failed")
-            return [0.0] * embedders[0].dimension
-
-        return self.embedding_cb.execute(
-            component_func=primary_embedder.embed,
-            fallback_func=try_fallback_embedder,
-            text=text,
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(text)
+            if cached is not None:
+                return cached
+
+        # If all embedders fail, return a zero embedding
+        return self.embedding_chain.execute(
+            call=lambda embedder: self._cache_primary_embedding(
+                embedder, text, embedder.embed(text)
+            ),
+            default=lambda: [0.0] * embedders[0].dimension,
         )
 
     def get_relevant_documents(
         self, query_embedding: List[float], top_k: int = 3
     ) -> List[Dict[str, Any]]:
-        """Get relevant documents with fallbacks"""
+        """Get relevant documents with hedged fallbacks"""
         retrievers = self.fallback_strategy.get_fallback_chain(ComponentType.RETRIEVER)
         if not retrievers:
             return []
 
-        # Try primary retriever with fallbacks
-        primary_retriever = retrievers[0]
-
-        def try_fallback_retriever(
-            query_embedding: List[float], top_k: int
-        ) -> List[Dict[str, Any]]:
-            # Find the next available retriever
-            for i, retriever in enumerate(retrievers[1:], 1):
-                try:
-                    logger.info(f"Trying fallback retriever {i}")
-                    return retriever.retrieve(query_embedding, top_k)
-                except Exception as e:
-                    logger.warning(f"Fallback retriever {i} failed: {str(e)}")
-                    continue
-
-            # If all fallbacks fail, return empty list
-            logger.error("All retrieval services failed")
-            return []
-
-        return self.retrieval_cb.execute(
-            component_func=primary_retriever.retrieve,
-            fallback_func=try_fallback_retriever,
-            query_embedding=query_embedding,
-            top_k=top_k,
+        # If all retrievers fail, return empty list
+        return self.retrieval_chain.execute(
+            call=lambda retriever: retriever.retrieve(query_embedding, top_k),
+            default=lambda: [],
         )
 
     def generate_response(
         self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
     ) -> str:
-        """Generate a response with fallbacks"""
+        """Generate a response with hedged fallbacks"""
         generators = self.fallback_strategy.get_fallback_chain(ComponentType.GENERATOR)
         if not generators:
             return "No generation services available"
 
-        # Try primary generator with fallbacks
-        primary_generator = generators[0]
-
-        def try_fallback_generator(
-            prompt: str, context: Optional[List[Dict[str, Any]]]
-        ) -> str:
-            # Find the next available generator
-            for i, generator in enumerate(generators[1:], 1):
-                try:
-                    logger.info(f"Trying fallback generator {i}")
-                    return generator.generate(prompt, context)
-                except Exception as e:
-                    logger.warning(f"Fallback generator {i} failed: {str(e)}")
-                    continue
-
-            # If all fallbacks fail, return error message
-            logger.error("All generation services failed")
-            return (
+        # If all generators fail, return error message
+        return self.generation_chain.execute(
+            call=lambda generator: generator.generate(prompt, context),
+            default=lambda: (
                 "I'm currently unable to generate a response. Please try again later."
-            )
-
-        return self.generation_cb.execute(
-            component_func=primary_generator.generate,
-            fallback_func=try_fallback_generator,
-            prompt=prompt,
-            context=context,
+            ),
         )
 
     def query(self, user_query: str) -> str:
         """Process a user query with built-in resilience to component failures"""
         logger.info(f"Processing query: '{user_query}'")
+        start_time = time.time()
 
         try:
             # Step 1: Convert query to embedding
@@ -183,27 +238,108 @@ class HighAvailabilityRAG:
             # Step 3: Generate response
             response = self.generate_response(user_query, context=relevant_docs)
 
+            self._observe_query(start_time, "success")
+            return response
+        except Exception as e:
+            logger.error(f"Unhandled exception in query pipeline: {str(e)}")
+            self._observe_query(start_time, "error")
+            return "I encountered an unexpected error processing your query. Please try again."
+
+    async def get_embedding_async(self, text: str) -> List[float]:
+        """Get embedding from the cache, or with hedged fallbacks without blocking the event loop"""
+        embedders = self.fallback_strategy.get_fallback_chain(ComponentType.EMBEDDER)
+        if not embedders:
+            raise ValueError("No embedding services configured")
+
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(text)
+            if cached is not None:
+                return cached
+
+        async def call(embedder):
+            return self._cache_primary_embedding(embedder, text, await embedder.embed_async(text))
+
+        return await self.embedding_chain.execute_async(
+            call=call,
+            default=lambda: [0.0] * embedders[0].dimension,
+            timeout=self.component_timeout,
+        )
+
+    async def get_relevant_documents_async(
+        self, query_embedding: List[float], top_k: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Get relevant documents with hedged fallbacks without blocking the event loop"""
+        retrievers = self.fallback_strategy.get_fallback_chain(ComponentType.RETRIEVER)
+        if not retrievers:
+            return []
+
+        return await self.retrieval_chain.execute_async(
+            call=lambda retriever: retriever.retrieve_async(query_embedding, top_k),
+            default=lambda: [],
+            timeout=self.component_timeout,
+        )
+
+    async def generate_response_async(
+        self, prompt: str, context: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """Generate a response with hedged fallbacks without blocking the event loop"""
+        generators = self.fallback_strategy.get_fallback_chain(ComponentType.GENERATOR)
+        if not generators:
+            return "No generation services available"
+
+        return await self.generation_chain.execute_async(
+            call=lambda generator: generator.generate_async(prompt, context),
+            default=lambda: (
+                "I'm currently unable to generate a response. Please try again later."
+            ),
+            timeout=self.component_timeout,
+        )
+
+    async def query_async(self, user_query: str) -> str:
+        """Coroutine version of query(); many queries can be in flight on one event loop"""
+        logger.info(f"Processing query: '{user_query}'")
+        start_time = time.time()
+
+        try:
+            query_embedding = await self.get_embedding_async(user_query)
+            relevant_docs = await self.get_relevant_documents_async(
+                query_embedding, top_k=3
+            )
+            response = await self.generate_response_async(
+                user_query, context=relevant_docs
+            )
+            self._observe_query(start_time, "success")
             return response
         except Exception as e:
             logger.error(f"Unhandled exception in query pipeline: {str(e)}")
+            self._observe_query(start_time, "error")
             return "I encountered an unexpected error processing your query. Please try again."
 
     def get_system_health(self) -> Dict[str, Any]:
         """Get current health metrics for all components"""
-        return {
+        health = {
             "embedder": {
                 "state": self.embedding_cb.state.value,
                 "failure_rate": self.embedding_cb.status.get_failure_rate(),
                 "avg_response_time_ms": self.embedding_cb.status.get_avg_response_time(),
+                "hedges_launched": self.embedding_chain.hedges_launched,
+                "hedges_won": self.embedding_chain.hedges_won,
             },
             "retriever": {
                 "state": self.retrieval_cb.state.value,
                 "failure_rate": self.retrieval_cb.status.get_failure_rate(),
                 "avg_response_time_ms": self.retrieval_cb.status.get_avg_response_time(),
+                "hedges_launched": self.retrieval_chain.hedges_launched,
+                "hedges_won": self.retrieval_chain.hedges_won,
             },
             "generator": {
                 "state": self.generation_cb.state.value,
                 "failure_rate": self.generation_cb.status.get_failure_rate(),
                 "avg_response_time_ms": self.generation_cb.status.get_avg_response_time(),
+                "hedges_launched": self.generation_chain.hedges_launched,
+                "hedges_won": self.generation_chain.hedges_won,
             },
         }
+        if self.embedding_cache is not None:
+            health["embedder"]["cache_hit_rate"] = self.embedding_cache.get_stats()["hit_rate"]
+        return health
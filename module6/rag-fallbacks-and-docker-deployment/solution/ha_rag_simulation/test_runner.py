@@ -1,12 +1,17 @@
+import time
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from .core.metrics import MetricsRegistry
 from .system import HighAvailabilityRAG  # Relative import
 
 logger = logging.getLogger("HighAvailabilityRAG.TestRunner")
 
 
-def test_high_availability_rag():
+def test_high_availability_rag(metrics_registry: Optional[MetricsRegistry] = None):
     """Test the HighAvailabilityRAG with simulated failures interactively"""
-    rag = HighAvailabilityRAG()
+    rag = HighAvailabilityRAG(metrics_registry=metrics_registry)
     run_count = 0
 
     while True:  # Outer loop to allow re-running tests
@@ -112,3 +117,60 @@ def test_high_availability_rag():
     # --- End of outer while loop ---
 
     print("\nTesting finished!")
+
+
+def compare_throughput(
+    num_queries: int = 500,
+    thread_workers: int = 16,
+    metrics_registry: Optional[MetricsRegistry] = None,
+):
+    """
+    Compare query throughput of the thread-pool and asyncio pipelines
+
+    The two sides run one after the other, so a shared metrics_registry only
+    ever has one live instance writing to it.
+    """
+    queries = [f"Throughput test query {i}" for i in range(num_queries)]
+
+    # Per-call logging would dominate the measurement
+    package_logger = logging.getLogger("HighAvailabilityRAG")
+    previous_level = package_logger.level
+    package_logger.setLevel(logging.ERROR)
+    try:
+        # Each side builds its system before the clock starts, so only query
+        # execution is compared
+        rag = HighAvailabilityRAG(metrics_registry=metrics_registry)
+        try:
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=thread_workers) as executor:
+                list(executor.map(rag.query, queries))
+            threaded_time = time.perf_counter() - start_time
+        finally:
+            rag.shutdown()
+
+        async_rag = HighAvailabilityRAG(metrics_registry=metrics_registry)
+
+        async def run_all():
+            return await asyncio.gather(*(async_rag.query_async(q) for q in queries))
+
+        try:
+            start_time = time.perf_counter()
+            asyncio.run(run_all())
+            async_time = time.perf_counter() - start_time
+        finally:
+            async_rag.shutdown()
+    finally:
+        package_logger.setLevel(previous_level)
+
+    print("\n" + "=" * 80)
+    print(f"THROUGHPUT ({num_queries} queries)")
+    print("=" * 80)
+    print(
+        f"  Threads ({thread_workers} workers): {threaded_time:6.2f}s  "
+        f"{num_queries / threaded_time:8.1f} queries/s"
+    )
+    print(
+        f"  Asyncio (all in flight): {async_time:6.2f}s  "
+        f"{num_queries / async_time:8.1f} queries/s"
+    )
+    print(f"  Speedup: {threaded_time / async_time:.1f}x")
@@ -14,6 +14,7 @@ from langchain_tools import (
     SearchNewsTool,
     SummarizeArticleTool,
     CategorizeArticleTool,
+    _cache,
 )
 from langchain_chains import ArticleInput, multi_processing_chain
 from interactive_news import interactive_cli
@@ -112,6 +113,11 @@ def run_langchain_demo():
         print_middleware_action(
             f"Retrieved headlines from cache in {elapsed:.2f} seconds"
         )
+        stats = _cache.get_stats()
+        print_middleware_action(
+            f"Cache stats: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions, {stats['entries']} entries"
+        )
 
         # Test error handling
         print_header("Testing Error Handling")
@@ -1,83 +1,215 @@
 import time
 import json
-import hashlib
-from typing import Dict, Any, Optional
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class _CacheEntry:
+    """A cached value with its absolute expiry time and estimated size."""
+
+    __slots__ = ("data", "expires_at", "size")
+
+    def __init__(self, data: Any, expires_at: float, size: int):
+        self.data = data
+        self.expires_at = expires_at
+        self.size = size
+
+
+class _CacheShard:
+    """
+    One independently locked slice of the cache.
+
+    Entries are kept in LRU order, and a min-heap of (expires_at, key) lets
+    expired entries be removed without scanning the whole shard.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int]):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self.expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sequence = 0  # Tie-breaker so the heap never compares keys
+
+    def remove(self, key: Hashable) -> None:
+        """Remove an entry (caller holds the lock)."""
+        entry = self.entries.pop(key)
+        self.current_bytes -= entry.size
+
+    def purge_expired(self, now: float) -> int:
+        """
+        Remove entries whose expiry has passed (caller holds the lock).
+
+        Only heap items that are due are popped, so this costs O(expired log n).
+        Heap items for keys that were overwritten or evicted are skipped.
+        """
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self.remove(key)
+                removed += 1
+        self.expirations += removed
+        return removed
+
+    def push_expiry(self, key: Hashable, expires_at: float) -> None:
+        """Schedule an entry's expiry (caller holds the lock)."""
+        self._sequence += 1
+        heapq.heappush(self.expiry_heap, (expires_at, self._sequence, key))
+        # Overwrites and evictions leave stale heap items behind; rebuild
+        # once they outnumber the live entries
+        if len(self.expiry_heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [
+                (entry.expires_at, i, k)
+                for i, (k, entry) in enumerate(self.entries.items())
+            ]
+            heapq.heapify(self.expiry_heap)
+            self._sequence = len(self.expiry_heap)
+
+    def evict_to_fit(self) -> None:
+        """Evict least recently used entries until within bounds (caller holds the lock)."""
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            key, entry = self.entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.evictions += 1
+
+
 class Cache:
     """
-    A simple in-memory cache with time-based expiration.
+    A thread-safe in-memory cache with time-based expiration and an LRU size bound.
+
+    Keys are spread over independently locked shards, so concurrent tools
+    rarely wait on each other. The entry and byte bounds are split across the
+    shards and enforced per shard: the cache never holds more than
+    max_entries, but when keys hash unevenly a busy shard can evict before
+    the cache as a whole is full.
     """
-    
-    def __init__(self, expiry_time: int = 3600):
+
+    def __init__(
+        self,
+        expiry_time: int = 3600,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        num_shards: int = 16,
+    ):
         """
         Initialize the cache.
-        
+
         Args:
             expiry_time: Default cache entry lifetime in seconds
+            max_entries: Maximum number of entries before the least recently used are evicted
+            max_bytes: Maximum estimated size of the cached data in bytes (None for no limit)
+            num_shards: Number of independently locked shards (at most max_entries)
         """
-        self.cache_data: Dict[str, Dict[str, Any]] = {}
         self.default_expiry_time = expiry_time
-        logger.info(f"Cache initialized with {expiry_time}s expiry time")
-    
-    def _generate_key(self, url: str, params: Dict[str, Any]) -> str:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Every shard must be able to hold an entry, so small caches get fewer shards
+        num_shards = max(1, min(num_shards, max_entries))
+        # Each shard enforces its share of the bounds; the shares add up to the totals
+        self.shards = [
+            _CacheShard(
+                max_entries=self._share(max_entries, num_shards, i),
+                max_bytes=(
+                    None if max_bytes is None else max(1, self._share(max_bytes, num_shards, i))
+                ),
+            )
+            for i in range(num_shards)
+        ]
+        logger.info(
+            f"Cache initialized with {expiry_time}s expiry time, "
+            f"{max_entries} entries max across {num_shards} shards"
+        )
+
+    @staticmethod
+    def _share(total: int, parts: int, index: int) -> int:
+        """Split total into parts that differ by at most one and return part index."""
+        return total // parts + (1 if index < total % parts else 0)
+
+    def _generate_key(self, url: str, params: Dict[str, Any]) -> Hashable:
         """
         Generate a unique cache key based on URL and parameters.
-        
+
         Args:
             url: The API endpoint URL
             params: Query parameters
-            
+
         Returns:
-            A unique hash key
-        """
-        # Create a copy of params without the API key to avoid caching based on API key
-        cache_params = params.copy()
-        if 'apiKey' in cache_params:
-            del cache_params['apiKey']
-            
-        # Create a string representation of the URL and parameters
-        cache_data = f"{url}_{json.dumps(cache_params, sort_keys=True)}"
-        
-        # Generate a hash
-        return hashlib.md5(cache_data.encode()).hexdigest()
-    
+            A hashable key
+        """
+        # Leave out the API key to avoid caching based on API key
+        items = tuple(sorted((k, v) for k, v in params.items() if k != "apiKey"))
+        try:
+            hash(items)
+        except TypeError:
+            # Unhashable parameter values (lists, dicts) fall back to their JSON form
+            return (url, json.dumps(dict(items), sort_keys=True, default=str))
+        return (url, items)
+
+    def _shard_for(self, key: Hashable) -> _CacheShard:
+        return self.shards[hash(key) % len(self.shards)]
+
+    @staticmethod
+    def _estimate_size(data: Any) -> int:
+        """Approximate the memory held by a cached value from its JSON length."""
+        try:
+            return len(json.dumps(data, default=str))
+        except (TypeError, ValueError):
+            return 0
+
     def get(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Retrieve data from cache if it exists and is still valid.
-        
+
         Args:
             url: The API endpoint URL
             params: Query parameters
-            
+
         Returns:
             Cached data or None if not found or expired
         """
         key = self._generate_key(url, params)
-        cache_entry = self.cache_data.get(key)
-        
-        if not cache_entry:
-            logger.debug(f"Cache miss for key {key}")
-            return None
-            
-        # Check if the entry has expired
-        timestamp = cache_entry.get('timestamp', 0)
-        expiry_time = cache_entry.get('expiry_time', self.default_expiry_time)
-        
-        if time.time() - timestamp > expiry_time:
-            logger.debug(f"Cache entry expired for key {key}")
-            del self.cache_data[key]
-            return None
-            
-        logger.debug(f"Cache hit for key {key}")
-        return cache_entry.get('data')
-    
-    def set(self, url: str, params: Dict[str, Any], data: Dict[str, Any], expiry_time: Optional[int] = None) -> None:
+        shard = self._shard_for(key)
+        now = time.monotonic()
+
+        with shard.lock:
+            shard.purge_expired(now)
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                logger.debug(f"Cache miss for key {key}")
+                return None
+
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            logger.debug(f"Cache hit for key {key}")
+            return entry.data
+
+    def set(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        data: Dict[str, Any],
+        expiry_time: Optional[int] = None,
+    ) -> None:
         """
         Store data in the cache.
-        
+
         Args:
             url: The API endpoint URL
             params: Query parameters
@@ -85,38 +217,80 @@ class Cache:
             expiry_time: Optional custom expiration time
         """
         key = self._generate_key(url, params)
-        
+        shard = self._shard_for(key)
+
         if expiry_time is None:
             expiry_time = self.default_expiry_time
-            
-        self.cache_data[key] = {
-            'data': data,
-            'timestamp': time.time(),
-            'expiry_time': expiry_time
-        }
-        
+
+        size = self._estimate_size(data) if self.max_bytes is not None else 0
+        if shard.max_bytes is not None and size > shard.max_bytes:
+            logger.debug(f"Not caching {size} byte entry for key {key}: larger than shard limit")
+            return
+
+        now = time.monotonic()
+        expires_at = now + expiry_time
+
+        with shard.lock:
+            if key in shard.entries:
+                shard.remove(key)
+            shard.entries[key] = _CacheEntry(data, expires_at, size)
+            shard.current_bytes += size
+            shard.push_expiry(key, expires_at)
+            shard.purge_expired(now)
+            shard.evict_to_fit()
+
         logger.debug(f"Added entry to cache with key {key}")
-        
-        # Periodically clean up expired entries
-        if len(self.cache_data) % 10 == 0:  # Clean every 10 insertions
-            self.clear_expired()
-    
+
     def clear_expired(self) -> None:
         """
         Remove all expired entries from the cache.
         """
-        current_time = time.time()
-        expired_keys = []
-        
-        for key, entry in self.cache_data.items():
-            timestamp = entry.get('timestamp', 0)
-            expiry_time = entry.get('expiry_time', self.default_expiry_time)
-            
-            if current_time - timestamp > expiry_time:
-                expired_keys.append(key)
-                
-        for key in expired_keys:
-            del self.cache_data[key]
-            
-        if expired_keys:
-            logger.debug(f"Cleared {len(expired_keys)} expired cache entries")
\ No newline at end of file
+        now = time.monotonic()
+        removed = 0
+        for shard in self.shards:
+            with shard.lock:
+                removed += shard.purge_expired(now)
+
+        if removed:
+            logger.debug(f"Cleared {removed} expired cache entries")
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache (statistics are kept).
+        """
+        for shard in self.shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+                shard.current_bytes = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self.shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Entry and byte counts plus hits, misses, evictions and expirations
+        """
+        stats = {
+            "entries": 0,
+            "bytes": 0,
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        for shard in self.shards:
+            with shard.lock:
+                stats["entries"] += len(shard.entries)
+                stats["bytes"] += shard.current_bytes
+                stats["hits"] += shard.hits
+                stats["misses"] += shard.misses
+                stats["evictions"] += shard.evictions
+                stats["expirations"] += shard.expirations
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -12,6 +12,9 @@ VALID_CATEGORIES = [
 
 # Cache settings
 DEFAULT_CACHE_EXPIRY = 3600  # 1 hour in seconds
+CACHE_MAX_ENTRIES = 1024  # Least recently used entries are evicted beyond this
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Estimated size limit of cached responses
+HEADLINES_MAX_STALE_TIME = 6 * 3600  # Expired headlines on disk are served this long while refreshing
 
 # Rate limiting settings
 REQUESTS_PER_MINUTE = 60  # Default API limit
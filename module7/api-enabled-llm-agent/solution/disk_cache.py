@@ -0,0 +1,172 @@
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    A persistent response cache in SQLite, shared by every process that opens the same file.
+
+    The database runs in WAL mode so readers in one process are not blocked by a
+    writer in another. Expiry times are stored as wall-clock timestamps, so TTLs
+    carry over between runs.
+    """
+
+    def __init__(self, path: str, expiry_time: int = 3600, max_stale_time: int = 0):
+        """
+        Initialize the disk cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            expiry_time: Default cache entry lifetime in seconds
+            max_stale_time: Seconds past expiry that an entry is kept for stale reads
+        """
+        self.path = path
+        self.default_expiry_time = expiry_time
+        self.max_stale_time = max_stale_time
+        # sqlite3 connections cannot be shared between threads
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+        )
+        connection.commit()
+        logger.info(f"Disk cache initialized at {path} with {expiry_time}s expiry time")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL with synchronous=NORMAL only risks the latest writes on power loss
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def key(self, url: str, params: Dict[str, Any]) -> str:
+        """
+        Return the cache key for a request; it is stable across processes.
+
+        Args:
+            url: The API endpoint URL
+            params: Query parameters
+
+        Returns:
+            A SHA-256 hex digest of the URL and parameters (without the API key)
+        """
+        cache_params = {k: v for k, v in params.items() if k != "apiKey"}
+        cache_data = f"{url}_{json.dumps(cache_params, sort_keys=True, default=str)}"
+        return hashlib.sha256(cache_data.encode()).hexdigest()
+
+    def lookup(self, url: str, params: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Retrieve data and its expiry time, whether or not it has expired.
+
+        Args:
+            url: The API endpoint URL
+            params: Query parameters
+
+        Returns:
+            (data, expires_at) with expires_at as a Unix timestamp, or None if not stored
+        """
+        key = self.key(url, params)
+        row = (
+            self._connection()
+            .execute("SELECT data, expires_at FROM responses WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            logger.debug(f"Disk cache miss for key {key}")
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve data from the disk cache if it exists and is still valid.
+
+        Args:
+            url: The API endpoint URL
+            params: Query parameters
+
+        Returns:
+            Cached data or None if not found or expired
+        """
+        entry = self.lookup(url, params)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def set(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        data: Dict[str, Any],
+        expiry_time: Optional[int] = None,
+    ) -> None:
+        """
+        Store data in the disk cache, replacing any previous entry.
+
+        Args:
+            url: The API endpoint URL
+            params: Query parameters
+            data: The data to cache (must be JSON serializable)
+            expiry_time: Optional custom expiration time
+        """
+        if expiry_time is None:
+            expiry_time = self.default_expiry_time
+
+        key = self.key(url, params)
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, url, data, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, url, json.dumps(data), now, now + expiry_time),
+            )
+        logger.debug(f"Added entry to disk cache with key {key}")
+
+    def clear_expired(self) -> int:
+        """
+        Remove entries that are past their expiry and the stale window.
+
+        Returns:
+            Number of entries removed
+        """
+        connection = self._connection()
+        with connection:
+            removed = connection.execute(
+                "DELETE FROM responses WHERE expires_at < ?",
+                (time.time() - self.max_stale_time,),
+            ).rowcount
+
+        if removed:
+            logger.debug(f"Cleared {removed} expired disk cache entries")
+        return removed
+
+    def close(self) -> None:
+        """
+        Close this thread's database connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -5,6 +5,8 @@ Provides tools for interacting with the News API and processing articles.
 
 import logging
 import os
+import threading
+import time
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
@@ -14,6 +16,7 @@ import requests
 
 # Import middleware components
 from cache import Cache
+from disk_cache import DiskCache
 from rate_limiter import RateLimiter
 import config
 from ollama_client import OllamaClient
@@ -44,15 +47,34 @@ from langchain_utils import (
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 if not NEWS_API_KEY:
     raise ValueError("NEWS_API_KEY environment variable not set")
-NEWS_API_BASE_URL = config.NEWS_API_BASE_URL
+# Overridable so the tools can be pointed at a local stub of the News API
+NEWS_API_BASE_URL = os.getenv("NEWS_API_BASE_URL", config.NEWS_API_BASE_URL)
+# Optional SQLite file that keeps responses across restarts and processes
+NEWS_CACHE_PATH = os.getenv("NEWS_CACHE_PATH")
 
 # Shared articles storage
 _SHARED_ARTICLES = []
 
 
 # Initialize shared services
-_cache = Cache(expiry_time=config.DEFAULT_CACHE_EXPIRY)
+_cache = Cache(
+    expiry_time=config.DEFAULT_CACHE_EXPIRY,
+    max_entries=config.CACHE_MAX_ENTRIES,
+    max_bytes=config.CACHE_MAX_BYTES,
+)
 _rate_limiter = RateLimiter(config.REQUESTS_PER_MINUTE)
+_disk_cache = None
+if NEWS_CACHE_PATH:
+    _disk_cache = DiskCache(
+        NEWS_CACHE_PATH,
+        expiry_time=config.DEFAULT_CACHE_EXPIRY,
+        max_stale_time=config.HEADLINES_MAX_STALE_TIME,
+    )
+    _disk_cache.clear_expired()
+
+# Keys of stale entries being refreshed in the background
+_refreshing = set()
+_refreshing_lock = threading.Lock()
 
 
 class NewsAPIBaseTool(BaseTool):
@@ -80,7 +102,7 @@ class NewsAPIBaseTool(BaseTool):
         Returns:
             API response as dictionary
         """
-        global _cache, _rate_limiter
+        global _cache, _disk_cache
 
         # Ensure API key is in params
         if "apiKey" not in params:
@@ -92,6 +114,68 @@ class NewsAPIBaseTool(BaseTool):
             print_tool_action(f"Cache hit for {endpoint}")
             return cached_data
 
+        # Then the disk cache, which may hold a response from an earlier run
+        if _disk_cache is not None:
+            entry = _disk_cache.lookup(endpoint, params)
+            if entry is not None:
+                data, expires_at = entry
+                remaining = expires_at - time.time()
+                if remaining > 0:
+                    # Keep the original expiry rather than starting a new TTL
+                    _cache.set(endpoint, params, data, expiry_time=remaining)
+                    print_tool_action(f"Disk cache hit for {endpoint}")
+                    return data
+                if (
+                    endpoint.endswith("/top-headlines")
+                    and -remaining <= config.HEADLINES_MAX_STALE_TIME
+                ):
+                    # Slightly old headlines beat waiting on the API (or its quota)
+                    self._refresh_in_background(endpoint, params)
+                    print_tool_action(
+                        f"Serving stale headlines for {endpoint} while refreshing"
+                    )
+                    return data
+
+        return self._fetch(endpoint, params)
+
+    def _refresh_in_background(self, endpoint: str, params: Dict[str, Any]) -> None:
+        """
+        Re-fetch a stale response on a background thread, at most once per key.
+
+        Args:
+            endpoint: API endpoint
+            params: Request parameters
+        """
+        key = _disk_cache.key(endpoint, params)
+        with _refreshing_lock:
+            if key in _refreshing:
+                return
+            _refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch(endpoint, dict(params))
+            except ToolException as e:
+                logger.warning(f"Background refresh of {endpoint} failed: {e}")
+            finally:
+                with _refreshing_lock:
+                    _refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call the News API and store the response in every cache tier.
+
+        Args:
+            endpoint: API endpoint
+            params: Request parameters (including the API key)
+
+        Returns:
+            API response as dictionary
+        """
+        global _cache, _disk_cache, _rate_limiter
+
         # Apply rate limiting
         wait_time = _rate_limiter.wait_for_token()
         if wait_time > 0:
@@ -107,6 +191,8 @@ class NewsAPIBaseTool(BaseTool):
 
             # Cache the response
             _cache.set(endpoint, params, result)
+            if _disk_cache is not None:
+                _disk_cache.set(endpoint, params, result)
             print_tool_action(f"Request successful - caching results")
 
             return result
@@ -1,5 +1,6 @@
 import time
 import logging
+import threading
 from functools import wraps
 from typing import Dict, Any, Callable
 
@@ -8,6 +9,10 @@ logger = logging.getLogger(__name__)
 class RateLimiter:
     """
     Rate limiter implementation with token bucket algorithm.
+
+    Thread-safe: the bucket is updated under a lock, and a caller that has to
+    wait reserves its token first (the count goes negative), so callers
+    waiting at the same time are spaced out instead of sharing one token.
     """
     
     def __init__(self, requests_per_minute: int = 60):
@@ -20,11 +25,12 @@ class RateLimiter:
         self.requests_per_minute = requests_per_minute
         self.tokens = requests_per_minute
         self.last_refill_time = time.time()
+        self._lock = threading.Lock()
         logger.info(f"Rate limiter initialized with {requests_per_minute} requests per minute")
     
     def _refill_tokens(self) -> None:
         """
-        Refill tokens based on elapsed time.
+        Refill tokens based on elapsed time (caller holds the lock).
         """
         now = time.time()
         elapsed_time = now - self.last_refill_time
@@ -43,23 +49,24 @@ class RateLimiter:
         Returns:
             The amount of time waited
         """
-        self._refill_tokens()
-        
-        if self.tokens >= 1:
-            # We have enough tokens, consume one and return immediately
+        with self._lock:
+            self._refill_tokens()
+
+            if self.tokens >= 1:
+                # We have enough tokens, consume one and return immediately
+                self.tokens -= 1
+                return 0.0
+
+            # Calculate how long we need to wait to get a token, counting the
+            # tokens already reserved by other waiting callers
+            wait_time = (1 - self.tokens) / (self.requests_per_minute / 60.0)
+
+            # Reserve the token now; refills bring the count back up meanwhile
             self.tokens -= 1
-            return 0.0
-            
-        # Calculate how long we need to wait to get a token
-        wait_time = (1 - self.tokens) / (self.requests_per_minute / 60.0)
-        
-        # Sleep for the required time
+
+        # Sleep for the required time without blocking other callers
         time.sleep(wait_time)
-        
-        # After waiting, we should have a token
-        self.tokens = 0  # Reset to avoid floating point accumulation errors
-        self.last_refill_time = time.time()  # Reset the refill time
-        
+
         return wait_time
     
     def __call__(self, func: Callable) -> Callable:
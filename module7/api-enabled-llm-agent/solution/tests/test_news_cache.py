@@ -0,0 +1,118 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+os.environ.setdefault("NEWS_API_KEY", "test-key")
+os.environ.setdefault("OLLAMA_API_URL", "http://127.0.0.1:11434")
+
+import config  # noqa: E402
+import langchain_tools  # noqa: E402
+from cache import Cache  # noqa: E402
+from disk_cache import DiskCache  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+
+
+class NewsAPIStub(BaseHTTPRequestHandler):
+    """Answers every request with one headline that names the request count"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        article = {
+            "title": f"Fresh headline {len(self.server.requests)}",
+            "source": {"name": "Stub"},
+            "publishedAt": "2025-01-01T00:00:00Z",
+        }
+        body = json.dumps({"status": "ok", "articles": [article]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestNewsAPICacheTiers(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), NewsAPIStub)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v2"
+
+        self.directory = tempfile.mkdtemp()
+        self.disk_cache = DiskCache(
+            os.path.join(self.directory, "news.sqlite3"),
+            expiry_time=60,
+            max_stale_time=config.HEADLINES_MAX_STALE_TIME,
+        )
+        patcher = mock.patch.multiple(
+            langchain_tools,
+            NEWS_API_BASE_URL=self.base_url,
+            _cache=Cache(expiry_time=60),
+            _disk_cache=self.disk_cache,
+            _rate_limiter=RateLimiter(6000),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tool = langchain_tools.GetHeadlinesTool()
+
+        self.endpoint = f"{self.base_url}/top-headlines"
+        self.params = {"country": config.DEFAULT_COUNTRY, "category": "technology"}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.disk_cache.close()
+        shutil.rmtree(self.directory)
+
+    def _store_on_disk(self, title, expiry_time):
+        article = {"title": title, "source": {"name": "Disk"}, "publishedAt": "earlier"}
+        self.disk_cache.set(
+            self.endpoint, self.params, {"status": "ok", "articles": [article]}, expiry_time
+        )
+
+    def test_fresh_disk_entry_survives_a_restart(self):
+        first = self.tool.get_headlines("technology")
+        self.assertEqual(len(self.server.requests), 1)
+
+        # A new process starts with an empty memory cache
+        with mock.patch.object(langchain_tools, "_cache", Cache(expiry_time=60)):
+            second = self.tool.get_headlines("technology")
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_headlines_are_served_while_refreshing(self):
+        self._store_on_disk("Old headline", expiry_time=-60)
+
+        result = self.tool.get_headlines("technology")
+        self.assertIn("Old headline", result)
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            data, expires_at = self.disk_cache.lookup(self.endpoint, self.params)
+            if expires_at > time.time():
+                break
+            time.sleep(0.02)
+        self.assertEqual(data["articles"][0]["title"], "Fresh headline 1")
+        self.assertIn("Fresh headline 1", self.tool.get_headlines("technology"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_headlines_past_the_stale_window_are_refetched(self):
+        self._store_on_disk("Ancient headline", expiry_time=-(config.HEADLINES_MAX_STALE_TIME + 60))
+
+        result = self.tool.get_headlines("technology")
+
+        self.assertIn("Fresh headline 1", result)
+        self.assertEqual(len(self.server.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
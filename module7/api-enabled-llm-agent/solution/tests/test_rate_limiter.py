@@ -0,0 +1,36 @@
+import threading
+import time
+import unittest
+
+from rate_limiter import RateLimiter
+
+
+class TestRateLimiterConcurrency(unittest.TestCase):
+    def test_concurrent_waiters_each_get_their_own_token(self):
+        """Callers waiting at the same time are spaced out, not released together"""
+        limiter = RateLimiter(requests_per_minute=6000)  # 100 tokens per second
+        limiter.tokens = 0
+        barrier = threading.Barrier(20)
+
+        def take():
+            barrier.wait()
+            limiter.wait_for_token()
+
+        threads = [threading.Thread(target=take) for _ in range(20)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 tokens at 100 per second cannot be handed out in under 0.2 seconds
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_available_tokens_are_not_delayed(self):
+        limiter = RateLimiter(requests_per_minute=60)
+        waits = [limiter.wait_for_token() for _ in range(60)]
+        self.assertEqual(waits, [0.0] * 60)
+
+
+if __name__ == "__main__":
+    unittest.main()